@@ -0,0 +1,216 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# benchmark.py
+# Uso: python -m src.benchmark [--tamanhos 1 1000 100000] [--salvar base.json] [--comparar base.json]
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Executa sem janela (servidor/CI)
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from src.calculos import (CONFIG, atualizar_totais, calcular_fgts, calcular_irrf, cache_tributos,
+                          somar_descontos)
+from src.utils import formatar_cnpj, formatar_valor, formatar_valor_lista
+
+TAMANHOS_PADRAO = (1, 1000, 100000)
+TEMPO_MINIMO = 0.05  # Duração mínima de cada medição, em segundos
+SEMENTE = 20250210  # Folhas sintéticas fixas: mesma semente, mesmos dados em toda execução
+
+
+def gerar_folha(tamanho: int, semente: int = SEMENTE) -> List[Dict]:
+    """
+    Gera uma folha sintética reprodutível.
+    :param tamanho: Quantidade de funcionários.
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de funcionários com salário, dependentes, pensão, descontos e textos de entrada.
+    """
+    aleatorio = random.Random(semente)
+    folha = []
+    for _ in range(tamanho):
+        salario = round(aleatorio.uniform(1412.0, 25000.0), 2)
+        descontos = [f"{aleatorio.uniform(5, 800):.2f}".replace(".", ",") for _ in range(aleatorio.randint(0, 6))]
+        if aleatorio.random() < 0.1:
+            descontos.append(f"{aleatorio.randint(1, 10)}%")
+        folha.append({
+            "salario": salario,
+            "dependentes": aleatorio.randint(0, 4),
+            "pensao": round(aleatorio.choice([0.0, 0.0, 0.0, aleatorio.uniform(100, 1500)]), 2),
+            "descontos": descontos,
+            "total_descontos": round(aleatorio.uniform(0, 2000), 2),
+            "valor_texto": f"{salario:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+            "valor_digitado": f"{salario:.2f}",
+            "cnpj": "".join(str(aleatorio.randint(0, 9)) for _ in range(14)),
+        })
+    return folha
+
+
+def _casos() -> Dict[str, Callable[[Dict], object]]:
+    """Operação medida em cada função: uma chamada por funcionário da folha."""
+    return {
+        "calcular_irrf": lambda f: calcular_irrf(f["salario"], f["dependentes"], f["pensao"]),
+        "calcular_fgts": lambda f: calcular_fgts(f["salario"]),
+        "somar_descontos": lambda f: somar_descontos(f["descontos"]),
+        "atualizar_totais": lambda f: atualizar_totais(f["salario"], f["total_descontos"], 0.0),
+        "formatar_valor": lambda f: formatar_valor(f["valor_digitado"]),
+        "formatar_valor_lista": lambda f: formatar_valor_lista(f["valor_texto"]),
+        "formatar_cnpj": lambda f: formatar_cnpj(f["cnpj"]),
+    }
+
+
+def _executar(operacao: Callable[[Dict], object], folha: List[Dict], voltas: int = 1) -> float:
+    """Executa a operação sobre a folha inteira `voltas` vezes e retorna o tempo em segundos."""
+    total = 0.0
+    for _ in range(voltas):
+        cache_tributos.limpar()  # Toda passagem começa com o cache de INSS/IRRF vazio
+        inicio = time.perf_counter()
+        for funcionario in folha:
+            operacao(funcionario)
+        total += time.perf_counter() - inicio
+    return total
+
+
+def medir(operacao: Callable[[Dict], object], folha: List[Dict], repeticoes: int = 3) -> Dict:
+    """
+    Mede uma operação: melhor tempo entre as repetições e pico de memória alocada em uma passagem.
+    Folhas pequenas são percorridas várias vezes por medição, para que cada uma dure ao menos
+    TEMPO_MINIMO segundos e o resultado não dependa da resolução do relógio.
+    :return: Dicionário com operacoes, segundos, ops_por_segundo e pico_memoria_kb.
+    """
+    gc.collect()
+    _executar(operacao, folha)  # Aquecimento (imports tardios, tabelas fiscais, regex)
+    passagem = _executar(operacao, folha)
+    voltas = max(1, int(TEMPO_MINIMO / passagem)) if passagem > 0 else 1
+    melhor = min(_executar(operacao, folha, voltas) for _ in range(max(repeticoes, 1)))
+
+    # Memória medida à parte: o tracemalloc deixa a execução mais lenta
+    tracemalloc.start()
+    _executar(operacao, folha)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    operacoes = len(folha) * voltas
+    return {
+        "operacoes": operacoes,
+        "segundos": round(melhor, 6),
+        "ops_por_segundo": round(operacoes / melhor, 1),
+        "pico_memoria_kb": round(pico / 1024, 1),
+    }
+
+
+def executar_benchmarks(tamanhos=TAMANHOS_PADRAO, repeticoes: int = 3, funcoes=None) -> Dict:
+    """
+    Executa todos os benchmarks para cada tamanho de folha.
+    :param tamanhos: Quantidades de funcionários das folhas sintéticas.
+    :param repeticoes: Repetições por medição (vale o melhor tempo).
+    :param funcoes: Nomes das funções a medir (None mede todas).
+    :return: Relatório com ambiente e resultados[funcao][tamanho].
+    """
+    casos = _casos()
+    if funcoes:
+        desconhecidas = set(funcoes) - set(casos)
+        if desconhecidas:
+            raise ValueError(f"Funções sem benchmark: {', '.join(sorted(desconhecidas))}")
+        casos = {nome: casos[nome] for nome in funcoes}
+
+    resultados = {nome: {} for nome in casos}
+    for tamanho in tamanhos:
+        folha = gerar_folha(tamanho)
+        for nome, operacao in casos.items():
+            resultados[nome][str(tamanho)] = medir(operacao, folha, repeticoes)
+
+    return {
+        "versao": CONFIG["version"],
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semente": SEMENTE,
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def comparar_com_base(relatorio: Dict, base: Dict, tolerancia: float = 0.20) -> List[str]:
+    """
+    Compara um relatório com a linha de base salva.
+    :param relatorio: Resultado de `executar_benchmarks`.
+    :param base: Linha de base carregada do JSON.
+    :param tolerancia: Queda de desempenho (ou aumento de memória) aceita, em fração (0.20 = 20%).
+    :return: Lista de regressões encontradas (vazia se nenhuma).
+    """
+    regressoes = []
+    for nome, por_tamanho in relatorio["resultados"].items():
+        for tamanho, atual in por_tamanho.items():
+            anterior = base.get("resultados", {}).get(nome, {}).get(tamanho)
+            if not anterior:
+                continue
+            if atual["ops_por_segundo"] < anterior["ops_por_segundo"] * (1 - tolerancia):
+                regressoes.append(f"{nome} [{tamanho}]: {anterior['ops_por_segundo']:.0f} -> "
+                                  f"{atual['ops_por_segundo']:.0f} ops/s")
+            # Folgas de 64 KB evitam falsos alarmes em folhas pequenas
+            if atual["pico_memoria_kb"] > anterior["pico_memoria_kb"] * (1 + tolerancia) + 64:
+                regressoes.append(f"{nome} [{tamanho}]: memória {anterior['pico_memoria_kb']:.0f} -> "
+                                  f"{atual['pico_memoria_kb']:.0f} KB")
+    return regressoes
+
+
+def imprimir_relatorio(relatorio: Dict):
+    """Exibe os resultados em forma de tabela no terminal."""
+    print(f"Benchmark v{relatorio['versao']} - Python {relatorio['python']} - {relatorio['plataforma']}")
+    print(f"{'função':<22}{'funcionários':>14}{'ops/s':>16}{'segundos':>12}{'pico (KB)':>12}")
+    for nome, por_tamanho in relatorio["resultados"].items():
+        for tamanho, resultado in por_tamanho.items():
+            print(f"{nome:<22}{tamanho:>14}{resultado['ops_por_segundo']:>16,.0f}"
+                  f"{resultado['segundos']:>12.4f}{resultado['pico_memoria_kb']:>12.1f}")
+
+
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks dos cálculos e formatações do holerite.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Quantidades de funcionários das folhas sintéticas.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições por medição (vale o melhor tempo).")
+    parser.add_argument("--funcoes", nargs="+", help="Mede apenas as funções informadas.")
+    parser.add_argument("--salvar", metavar="JSON", help="Salva o resultado como linha de base.")
+    parser.add_argument("--comparar", metavar="JSON", help="Compara com uma linha de base salva.")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="Regressão aceita (fração, padrão 0.20).")
+    opcoes = parser.parse_args(argumentos)
+
+    relatorio = executar_benchmarks(opcoes.tamanhos, opcoes.repeticoes, opcoes.funcoes)
+    imprimir_relatorio(relatorio)
+
+    if opcoes.salvar:
+        with open(opcoes.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"✅ Linha de base salva em {opcoes.salvar}")
+
+    if opcoes.comparar:
+        with open(opcoes.comparar, "r", encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar_com_base(relatorio, base, opcoes.tolerancia)
+        if regressoes:
+            print("⚠️ Regressões encontradas:")
+            for regressao in regressoes:
+                print(f"  - {regressao}")
+            return 1
+        print("✅ Nenhuma regressão em relação à linha de base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
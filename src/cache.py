@@ -0,0 +1,75 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# cache.py
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado e seguro entre threads, com contadores de acertos e falhas.
+    Usado pelos cálculos de INSS/IRRF, pelos textos ajustados do holerite e pelas camadas de desenho.
+    """
+
+    def __init__(self, tamanho_maximo: int = 4096):
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o valor guardado (ou None) e atualiza os contadores."""
+        with self._trava:
+            valor = self._itens.get(chave)
+            if valor is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave, valor):
+        """Guarda um valor, descartando o menos usado se o limite for atingido."""
+        if self.tamanho_maximo <= 0:
+            return
+        with self._trava:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+
+    def configurar(self, tamanho_maximo: int):
+        """Altera o limite de itens (0 desativa o cache)."""
+        with self._trava:
+            self.tamanho_maximo = tamanho_maximo
+            while len(self._itens) > max(tamanho_maximo, 0):
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        """Descarta todos os resultados guardados e zera os contadores."""
+        with self._trava:
+            self._itens.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self) -> Dict[str, float]:
+        """Retorna acertos, falhas, tamanho atual e taxa de acerto."""
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "tamanho": len(self._itens),
+            "tamanho_maximo": self.tamanho_maximo,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0
+        }
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -7,94 +7,167 @@
 """
 
 # calculos.py
-from typing import List, Dict
+from typing import List, Dict, Tuple, Union
+from src.cache import CacheLRU
+from src.dinheiro import Dinheiro
+from src.tabelas import TabelaFiscal, obter_tabela, registro_tabelas
 
-def calcular_fgts(salario_base: float) -> Dict[str, float]:
+Valor = Union[Dinheiro, float, int]
+
+
+# Cache de INSS/IRRF: a chave é (salário em centavos, dependentes, pensão em centavos, versão da tabela),
+# pois muitos funcionários compartilham a mesma faixa salarial e a mesma situação familiar
+cache_tributos = CacheLRU()
+# Resultados calculados com tabelas antigas deixam de valer quando o registro é recarregado
+registro_tabelas.ao_recarregar(cache_tributos.limpar)
+
+
+def configurar_cache(tamanho_maximo: int):
+    """
+    Define o número máximo de combinações guardadas no cache de INSS/IRRF.
+    :param tamanho_maximo: Limite de itens (0 desativa o cache).
+    """
+    cache_tributos.configurar(tamanho_maximo)
+
+
+def estatisticas_cache() -> Dict[str, float]:
+    """Retorna os contadores do cache de INSS/IRRF."""
+    return cache_tributos.estatisticas()
+
+
+def _calcular_tributos(tabela: TabelaFiscal, salario: int, num_dependentes: int, pensao: int) -> Tuple[int, int, int]:
+    """
+    Calcula INSS, base do IRRF e IRRF em centavos, consultando o cache antes.
+    :param tabela: Tabela fiscal da competência.
+    :param salario: Salário base em centavos.
+    :param num_dependentes: Número de dependentes.
+    :param pensao: Pensão alimentícia em centavos.
+    :return: Tupla (inss, base_irrf, irrf) em centavos; base e IRRF ainda não limitados a zero.
+    """
+    chave = (salario, num_dependentes, pensao, tabela.versao)
+    resultado = cache_tributos.obter(chave)
+    if resultado is not None:
+        return resultado
+
+    inss = tabela.calcular_inss(salario)
+    base_irrf = salario - inss - num_dependentes * tabela.deducao_dependente - pensao
+    resultado = (inss, base_irrf, tabela.calcular_irrf(base_irrf))
+    cache_tributos.guardar(chave, resultado)
+    return resultado
+
+
+def calcular_fgts(salario_base: Valor, competencia=None) -> Dict[str, Dinheiro]:
     """
     Calcula a base e o valor do FGTS com base no salário base.
-    :param salario_base: Salário base do funcionário.
+    :param salario_base: Salário base do funcionário (Dinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
     :return: Dicionário com base e valor do FGTS.
     """
-    base_fgts = salario_base
-    valor_fgts = base_fgts * 0.08
+    base_fgts = Dinheiro.de_reais(salario_base)
+    valor_fgts = Dinheiro(obter_tabela(competencia).calcular_fgts(base_fgts.centavos))
     return {"base_fgts": base_fgts, "valor_fgts": valor_fgts}
 
-def calcular_irrf(salario_base: float, num_dependentes: int = 0, pensao_alimenticia: float = 0.0) -> Dict[str, float]:
+def calcular_inss(salario_base: Valor, competencia=None) -> Dinheiro:
+    """
+    Calcula a contribuição ao INSS pela tabela vigente na competência.
+    :param salario_base: Salário base do funcionário (Dinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Valor da contribuição ao INSS.
+    """
+    inss, _, _ = _calcular_tributos(obter_tabela(competencia), Dinheiro.de_reais(salario_base).centavos, 0, 0)
+    return Dinheiro(inss)
+
+def calcular_irrf(salario_base: Valor, num_dependentes: int = 0, pensao_alimenticia: Valor = 0.0,
+                  competencia=None) -> Dict[str, Dinheiro]:
     """
     Calcula a base e o valor do IRRF considerando o salário base e deduções.
-    :param salario_base: Salário base do funcionário.
+    Combinações repetidas são atendidas pelo cache (veja `estatisticas_cache`).
+    :param salario_base: Salário base do funcionário (Dinheiro ou reais).
     :param num_dependentes: Número de dependentes do funcionário.
-    :param pensao_alimenticia: Valor da pensão alimentícia.
+    :param pensao_alimenticia: Valor da pensão alimentícia (Dinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
     :return: Dicionário com base e valor do IRRF.
     """
-    # Tabela de alíquotas do INSS para 2025
-    faixas_inss = [
-        (1412.00, 0.075),
-        (2666.68, 0.09),
-        (4000.03, 0.12),
-        (7786.02, 0.14)
-    ]
-
-    # Cálculo da contribuição ao INSS
-    inss = 0.0
-    salario_restante = salario_base
-    for limite, aliquota in faixas_inss:
-        if salario_restante > 0:
-            faixa = min(salario_restante, limite)
-            inss += faixa * aliquota
-            salario_restante -= faixa
-
-    # Dedução por dependentes
-    deducao_dependentes = num_dependentes * 189.59
-
-    # Base de cálculo do IRRF
-    base_irrf = salario_base - inss - deducao_dependentes - pensao_alimenticia
-
-    # Tabela progressiva do IRRF para 2025
-    faixas_irrf = [
-        (2259.20, 0.0, 0.00),
-        (2826.65, 0.075, 169.44),
-        (3751.05, 0.15, 381.44),
-        (4664.68, 0.225, 662.77),
-        (float('inf'), 0.275, 896.00)
-    ]
-
-    # Cálculo do IRRF
-    irrf = 0.0
-    for limite, aliquota, deducao in faixas_irrf:
-        if base_irrf <= limite:
-            irrf = (base_irrf * aliquota) - deducao
-            break
+    # INSS, dedução por dependentes, base e tabela progressiva do IRRF
+    _, base_irrf, irrf = _calcular_tributos(
+        obter_tabela(competencia),
+        Dinheiro.de_reais(salario_base).centavos,
+        int(num_dependentes),
+        Dinheiro.de_reais(pensao_alimenticia).centavos
+    )
 
     return {
-        "base_irrf": max(base_irrf, 0.0),  # Garante que a base não seja negativa
-        "valor_irrf": max(irrf, 0.0)  # Garante que o IRRF não seja negativo
+        "base_irrf": Dinheiro(max(base_irrf, 0)),  # Garante que a base não seja negativa
+        "valor_irrf": Dinheiro(max(irrf, 0))  # Garante que o IRRF não seja negativo
     }
 
+def _liquido_centavos(tabela: TabelaFiscal, salario: int, num_dependentes: int, pensao: int) -> int:
+    """Salário líquido em centavos: salário - INSS - IRRF - pensão (mesma conta de `calcular_folha_lote`)."""
+    inss = tabela.calcular_inss(salario)
+    base_irrf = salario - inss - num_dependentes * tabela.deducao_dependente - pensao
+    return salario - inss - max(tabela.calcular_irrf(base_irrf), 0) - pensao
+
+
+def calcular_salario_bruto(liquido_desejado: Valor, num_dependentes: int = 0, pensao_alimenticia: Valor = 0.0,
+                           competencia=None) -> Dinheiro:
+    """
+    Calcula o salário bruto necessário para obter o líquido desejado, invertendo INSS + IRRF.
+    O líquido cresce com o salário (as alíquotas marginais somadas ficam abaixo de 100%), então
+    a busca é uma bisseção em centavos: retorna um salário cujo líquido atinge o valor pedido e
+    cujo centavo anterior fica abaixo dele. Nas bordas das faixas o arredondamento pode baixar o
+    líquido em um centavo, então não é garantido que seja o menor salário possível.
+    As consultas da bisseção usam a tabela diretamente, sem ocupar o cache de tributos.
+    :param liquido_desejado: Salário líquido desejado (Dinheiro ou reais).
+    :param num_dependentes: Número de dependentes do funcionário.
+    :param pensao_alimenticia: Valor da pensão alimentícia (Dinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Salário bruto.
+    """
+    tabela = obter_tabela(competencia)
+    alvo = Dinheiro.de_reais(liquido_desejado).centavos
+    num_dependentes = int(num_dependentes)
+    pensao = Dinheiro.de_reais(pensao_alimenticia).centavos
+    if alvo <= -pensao:
+        return Dinheiro()
+
+    # Invariante: liquido(inferior) < alvo <= liquido(superior)
+    inferior = alvo + pensao - 1  # o líquido nunca passa de salário - pensão
+    superior = max(2 * (alvo + pensao), 1)
+    while _liquido_centavos(tabela, superior, num_dependentes, pensao) < alvo:
+        inferior, superior = superior, 2 * superior
+
+    while superior - inferior > 1:
+        meio = (inferior + superior) // 2
+        if _liquido_centavos(tabela, meio, num_dependentes, pensao) >= alvo:
+            superior = meio
+        else:
+            inferior = meio
+    return Dinheiro(superior)
+
 CONFIG = {
     "version": "1.0.0",
     "author": "5261706861656c20536f6172657320646f732053616e746f73"
 }
 
-def somar_descontos(lista_descontos: List[str]) -> float:
+def somar_descontos(lista_descontos: List[str]) -> Dinheiro:
     """
     Soma os valores de descontos a partir de uma lista de strings contendo os valores.
-    :param lista_descontos: Lista de strings representando os descontos (Ex.: ["125.00", "5%"].
-    :return: Soma total dos descontos.
+    :param lista_descontos: Lista de strings representando os descontos (Ex.: ["125,00", "5%"].
+    :return: Soma exata dos descontos.
     """
-    total = 0.0
+    total = 0
     for desconto in lista_descontos:
         try:
             if "%" in desconto:
                 valor_percentual = float(desconto.strip('%')) / 100
                 continue
-            total += float(desconto.replace(',', '.'))
+            total += Dinheiro.de_texto(desconto).centavos
         except ValueError:
             pass
-    return total
+    return Dinheiro(total)
 
 
-def atualizar_totais(salario_base: float, descontos: float, irrf: float) -> Dict[str, float]:
+def atualizar_totais(salario_base: Valor, descontos: Valor, irrf: Valor) -> Dict[str, Dinheiro]:
     """
     Atualiza os valores de vencimentos, descontos e líquido.
     :param salario_base: Salário base do funcionário.
@@ -102,8 +175,8 @@ def atualizar_totais(salario_base: float, descontos: float, irrf: float) -> Dict
     :param irrf: Valor do IRRF calculado.
     :return: Dicionário com totais atualizados.
     """
-    total_vencimentos = salario_base
-    total_descontos = descontos #+ irrf
+    total_vencimentos = Dinheiro.de_reais(salario_base)
+    total_descontos = Dinheiro.de_reais(descontos) #+ irrf
     valor_liquido = total_vencimentos - total_descontos
 
     return {
@@ -0,0 +1,414 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# calculos_lote.py
+from typing import Dict, Tuple
+import numpy as np
+
+from src.dinheiro import VetorDinheiro, dividir_arredondando_vetor
+from src.tabelas import ESCALA_ALIQUOTA, TabelaFiscal, obter_tabela
+
+# Vetores NumPy de cada tabela fiscal, montados uma única vez por vigência
+_VETORES_TABELAS: Dict[int, Tuple[TabelaFiscal, Dict[str, np.ndarray]]] = {}
+
+
+def _vetores(tabela: TabelaFiscal) -> Dict[str, np.ndarray]:
+    """
+    Retorna (e guarda) as fronteiras e alíquotas inteiras da tabela em forma de vetor.
+    :param tabela: Tabela fiscal compilada.
+    :return: Dicionário com os vetores de INSS e IRRF.
+    """
+    guardado = _VETORES_TABELAS.get(id(tabela))
+    if guardado is not None and guardado[0] is tabela:
+        return guardado[1]
+
+    vetores = {
+        "inss_fronteiras": np.array(tabela.inss_fronteiras, dtype=np.int64),
+        "inss_aliquotas": np.array(tabela.inss_aliquotas + [0], dtype=np.int64),
+        "inss_acumulado": np.array(tabela.inss_acumulado, dtype=np.int64),
+        "irrf_limites": np.array(tabela.irrf_limites, dtype=np.int64),
+        "irrf_aliquotas": np.array(tabela.irrf_aliquotas, dtype=np.int64),
+        "irrf_deducoes": np.array(tabela.irrf_deducoes, dtype=np.int64),
+    }
+    _VETORES_TABELAS[id(tabela)] = (tabela, vetores)
+    return vetores
+
+
+def normalizar_coluna(valores, tamanho: int) -> np.ndarray:
+    """
+    Converte uma coluna opcional em vetor float64 do tamanho da folha.
+    :param valores: Sequência, vetor, escalar ou None.
+    :param tamanho: Quantidade de funcionários da folha.
+    :return: Vetor float64 com `tamanho` posições (zeros se a coluna não for informada).
+    """
+    if valores is None:
+        return np.zeros(tamanho, dtype=np.float64)
+    coluna = np.asarray(valores, dtype=np.float64)
+    if coluna.ndim == 0:
+        return np.full(tamanho, float(coluna), dtype=np.float64)
+    if coluna.shape != (tamanho,):
+        raise ValueError(f"Coluna com {coluna.shape[0]} posições, esperado {tamanho}.")
+    return coluna
+
+
+def normalizar_coluna_centavos(valores, tamanho: int) -> np.ndarray:
+    """
+    Converte uma coluna monetária opcional (VetorDinheiro ou reais) em centavos int64.
+    :param valores: VetorDinheiro, sequência/vetor em reais, escalar ou None.
+    :param tamanho: Quantidade de funcionários da folha.
+    :return: Vetor int64 em centavos.
+    """
+    if isinstance(valores, VetorDinheiro):
+        if valores.centavos.shape != (tamanho,):
+            raise ValueError(f"Coluna com {len(valores)} posições, esperado {tamanho}.")
+        return valores.centavos
+    return VetorDinheiro.de_reais(normalizar_coluna(valores, tamanho)).centavos
+
+
+def _inss_centavos(salarios: np.ndarray, tabela: TabelaFiscal) -> np.ndarray:
+    """INSS em centavos de cada salário (centavos int64), pela tabela compilada."""
+    vetores = _vetores(tabela)
+    fronteiras = vetores["inss_fronteiras"]
+
+    faixa = np.searchsorted(fronteiras, salarios, side="left") - 1
+    faixa = np.clip(faixa, 0, len(fronteiras) - 1)
+    acumulado = vetores["inss_acumulado"][faixa] + (salarios - fronteiras[faixa]) * vetores["inss_aliquotas"][faixa]
+    inss = dividir_arredondando_vetor(acumulado, ESCALA_ALIQUOTA)
+
+    inss = np.where(salarios > fronteiras[-1], tabela.inss_maximo, inss)
+    return np.where(salarios > 0, inss, 0)
+
+
+def _irrf_centavos(base_irrf: np.ndarray, tabela: TabelaFiscal) -> np.ndarray:
+    """IRRF em centavos de cada base (centavos int64), antes de limitar a zero."""
+    vetores = _vetores(tabela)
+    faixa = np.searchsorted(vetores["irrf_limites"], base_irrf, side="left")
+    return dividir_arredondando_vetor(base_irrf * vetores["irrf_aliquotas"][faixa], ESCALA_ALIQUOTA) - \
+        vetores["irrf_deducoes"][faixa]
+
+
+def calcular_inss_lote(salarios, competencia=None) -> VetorDinheiro:
+    """
+    Versão vetorizada de `calcular_inss`: a faixa de cada salário é localizada com
+    `searchsorted` nas fronteiras compiladas, com as mesmas contas inteiras da versão escalar.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Contribuição ao INSS de cada funcionário.
+    """
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    return VetorDinheiro(_inss_centavos(salarios, obter_tabela(competencia)))
+
+
+def calcular_fgts_lote(salarios, competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Versão vetorizada de `calcular_fgts`.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores de base e valor do FGTS.
+    """
+    base_fgts = VetorDinheiro.de_reais(salarios)
+    aliquota = obter_tabela(competencia).aliquota_fgts
+    valor_fgts = dividir_arredondando_vetor(base_fgts.centavos * aliquota, ESCALA_ALIQUOTA)
+    return {"base_fgts": base_fgts, "valor_fgts": VetorDinheiro(valor_fgts)}
+
+
+def calcular_irrf_lote(salarios, dependentes=None, pensoes=None, competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Versão vetorizada de `calcular_irrf`. A faixa de cada base é localizada com
+    `searchsorted` (primeiro limite maior ou igual à base), como na busca escalar.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param dependentes: Número de dependentes por funcionário.
+    :param pensoes: Pensão alimentícia por funcionário (VetorDinheiro ou reais).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores de INSS, base e valor do IRRF.
+    """
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    tamanho = salarios.shape[0]
+    dependentes = normalizar_coluna(dependentes, tamanho).astype(np.int64)
+    pensoes = normalizar_coluna_centavos(pensoes, tamanho)
+    tabela = obter_tabela(competencia)
+
+    inss = _inss_centavos(salarios, tabela)
+    base_irrf = salarios - inss - dependentes * tabela.deducao_dependente - pensoes
+    irrf = _irrf_centavos(base_irrf, tabela)
+
+    return {
+        "inss": VetorDinheiro(inss),
+        "base_irrf": VetorDinheiro(np.maximum(base_irrf, 0)),
+        "valor_irrf": VetorDinheiro(np.maximum(irrf, 0))
+    }
+
+
+def _tributos_centavos(bases: np.ndarray, dependentes: np.ndarray, pensoes: np.ndarray,
+                       tabela: TabelaFiscal) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """INSS, base do IRRF e IRRF (limitados a zero) em centavos, calculados sobre cada base."""
+    inss = _inss_centavos(bases, tabela)
+    base_irrf = bases - inss - dependentes * tabela.deducao_dependente - pensoes
+    irrf = np.maximum(_irrf_centavos(base_irrf, tabela), 0)
+    return inss, np.maximum(base_irrf, 0), irrf
+
+
+def _proporcional(salarios: np.ndarray, quantidades: np.ndarray, divisor: int) -> np.ndarray:
+    """Salário proporcional (avos/12 ou dias/30), arredondado ao centavo."""
+    return dividir_arredondando_vetor(salarios * quantidades, divisor)
+
+
+def _inteiros(valores, tamanho: int, minimo: int, maximo: int, nome: str) -> np.ndarray:
+    """Coluna inteira (avos, dias) validada no intervalo permitido."""
+    coluna = normalizar_coluna(valores, tamanho).astype(np.int64)
+    if coluna.size and (coluna.min() < minimo or coluna.max() > maximo):
+        raise ValueError(f"{nome} deve estar entre {minimo} e {maximo}.")
+    return coluna
+
+
+def calcular_decimo_terceiro_lote(salarios, avos=12, parcela: int = 2, dependentes=None, pensoes=None,
+                                  adiantamentos=None, competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Calcula o 13º salário da folha inteira em uma passagem vetorizada.
+    1ª parcela: metade do 13º proporcional, sem INSS/IRRF (só FGTS).
+    2ª parcela: INSS e IRRF (tributação exclusiva) sobre o 13º integral, FGTS sobre o restante
+    e desconto do adiantamento já pago.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param avos: Meses trabalhados no ano (1 a 12), por funcionário ou para todos.
+    :param parcela: 1 ou 2.
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param pensoes: Pensão alimentícia sobre o 13º, por funcionário (opcional).
+    :param adiantamentos: 1ª parcela já paga (opcional; se omitida, usa a 1ª parcela calculada).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores bruto, adiantamento, inss, base_irrf, valor_irrf, valor_fgts e liquido.
+    """
+    if parcela not in (1, 2):
+        raise ValueError("A parcela do 13º deve ser 1 ou 2.")
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    tamanho = salarios.shape[0]
+    tabela = obter_tabela(competencia)
+    integral = _proporcional(salarios, _inteiros(avos, tamanho, 0, 12, "Os avos"), 12)
+    primeira = dividir_arredondando_vetor(integral, 2)
+
+    if parcela == 1:
+        zeros = np.zeros(tamanho, dtype=np.int64)
+        return {
+            "bruto": VetorDinheiro(primeira),
+            "adiantamento": VetorDinheiro(zeros),
+            "inss": VetorDinheiro(zeros),
+            "base_irrf": VetorDinheiro(zeros),
+            "valor_irrf": VetorDinheiro(zeros),
+            "valor_fgts": VetorDinheiro(dividir_arredondando_vetor(primeira * tabela.aliquota_fgts, ESCALA_ALIQUOTA)),
+            "liquido": VetorDinheiro(primeira)
+        }
+
+    adiantamentos = primeira if adiantamentos is None else normalizar_coluna_centavos(adiantamentos, tamanho)
+    pensoes = normalizar_coluna_centavos(pensoes, tamanho)
+    dependentes = normalizar_coluna(dependentes, tamanho).astype(np.int64)
+    inss, base_irrf, irrf = _tributos_centavos(integral, dependentes, pensoes, tabela)
+    fgts = dividir_arredondando_vetor((integral - adiantamentos) * tabela.aliquota_fgts, ESCALA_ALIQUOTA)
+    return {
+        "bruto": VetorDinheiro(integral),
+        "adiantamento": VetorDinheiro(adiantamentos),
+        "inss": VetorDinheiro(inss),
+        "base_irrf": VetorDinheiro(base_irrf),
+        "valor_irrf": VetorDinheiro(irrf),
+        "valor_fgts": VetorDinheiro(fgts),
+        "liquido": VetorDinheiro(integral - adiantamentos - inss - irrf - pensoes)
+    }
+
+
+def calcular_ferias_lote(salarios, dias=30, dependentes=None, pensoes=None,
+                         competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Calcula as férias com o adicional de 1/3 da folha inteira em uma passagem vetorizada.
+    INSS, IRRF e FGTS incidem sobre férias + 1/3, calculados separadamente do mês.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param dias: Dias de férias gozados (1 a 30), por funcionário ou para todos.
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param pensoes: Pensão alimentícia sobre as férias, por funcionário (opcional).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores ferias, terco, bruto, inss, base_irrf, valor_irrf, valor_fgts e liquido.
+    """
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    tamanho = salarios.shape[0]
+    tabela = obter_tabela(competencia)
+    ferias = _proporcional(salarios, _inteiros(dias, tamanho, 0, 30, "Os dias de férias"), 30)
+    terco = dividir_arredondando_vetor(ferias, 3)
+    bruto = ferias + terco
+
+    pensoes = normalizar_coluna_centavos(pensoes, tamanho)
+    dependentes = normalizar_coluna(dependentes, tamanho).astype(np.int64)
+    inss, base_irrf, irrf = _tributos_centavos(bruto, dependentes, pensoes, tabela)
+    return {
+        "ferias": VetorDinheiro(ferias),
+        "terco": VetorDinheiro(terco),
+        "bruto": VetorDinheiro(bruto),
+        "inss": VetorDinheiro(inss),
+        "base_irrf": VetorDinheiro(base_irrf),
+        "valor_irrf": VetorDinheiro(irrf),
+        "valor_fgts": VetorDinheiro(dividir_arredondando_vetor(bruto * tabela.aliquota_fgts, ESCALA_ALIQUOTA)),
+        "liquido": VetorDinheiro(bruto - inss - irrf - pensoes)
+    }
+
+
+def calcular_rescisao_lote(salarios, dias_trabalhados, avos_decimo_terceiro, avos_ferias, ferias_vencidas=None,
+                           dias_aviso=None, saldos_fgts=None, multa_fgts: float = 0.40, dependentes=None,
+                           competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Calcula as verbas rescisórias da folha inteira em uma passagem vetorizada:
+    saldo de salário, aviso prévio indenizado, 13º proporcional, férias vencidas/proporcionais + 1/3
+    e multa do FGTS. Saldo de salário e aviso formam uma base de IRRF; o 13º tem INSS e IRRF próprios;
+    férias indenizadas não têm INSS nem IRRF; o aviso indenizado não tem INSS.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param dias_trabalhados: Dias trabalhados no mês do desligamento (0 a 30).
+    :param avos_decimo_terceiro: Avos de 13º no ano do desligamento (0 a 12).
+    :param avos_ferias: Avos de férias do período aquisitivo em curso (0 a 12).
+    :param ferias_vencidas: Períodos de férias vencidos e não gozados (opcional).
+    :param dias_aviso: Dias de aviso prévio indenizado (opcional).
+    :param saldos_fgts: Saldo do FGTS antes da rescisão, para a multa (opcional).
+    :param multa_fgts: Percentual da multa sobre o FGTS (0.40 sem justa causa, 0.20 por acordo, 0 nos demais).
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores saldo_salario, aviso_previo, decimo_terceiro, ferias, terco_ferias,
+             bruto, inss, valor_irrf, valor_fgts, multa_fgts e liquido.
+    """
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    tamanho = salarios.shape[0]
+    tabela = obter_tabela(competencia)
+    dependentes = normalizar_coluna(dependentes, tamanho).astype(np.int64)
+    sem_pensao = np.zeros(tamanho, dtype=np.int64)
+
+    saldo = _proporcional(salarios, _inteiros(dias_trabalhados, tamanho, 0, 30, "Os dias trabalhados"), 30)
+    aviso = _proporcional(salarios, _inteiros(dias_aviso, tamanho, 0, 90, "Os dias de aviso prévio"), 30)
+    decimo = _proporcional(salarios, _inteiros(avos_decimo_terceiro, tamanho, 0, 12, "Os avos de 13º"), 12)
+    ferias = (salarios * _inteiros(ferias_vencidas, tamanho, 0, 2, "Os períodos vencidos") +
+              _proporcional(salarios, _inteiros(avos_ferias, tamanho, 0, 12, "Os avos de férias"), 12))
+    terco = dividir_arredondando_vetor(ferias, 3)
+
+    # Saldo de salário: INSS e IRRF; o aviso indenizado entra só na base do IRRF
+    inss_saldo = _inss_centavos(saldo, tabela)
+    base_mes = saldo + aviso - inss_saldo - dependentes * tabela.deducao_dependente
+    irrf_mes = np.maximum(_irrf_centavos(base_mes, tabela), 0)
+    # 13º proporcional: tributação exclusiva
+    inss_decimo, _, irrf_decimo = _tributos_centavos(decimo, dependentes, sem_pensao, tabela)
+
+    base_fgts = saldo + aviso + decimo
+    fgts = dividir_arredondando_vetor(base_fgts * tabela.aliquota_fgts, ESCALA_ALIQUOTA)
+    multa = VetorDinheiro(normalizar_coluna_centavos(saldos_fgts, tamanho) + fgts).multiplicar(multa_fgts).centavos
+
+    bruto = saldo + aviso + decimo + ferias + terco
+    inss = inss_saldo + inss_decimo
+    irrf = irrf_mes + irrf_decimo
+    return {
+        "saldo_salario": VetorDinheiro(saldo),
+        "aviso_previo": VetorDinheiro(aviso),
+        "decimo_terceiro": VetorDinheiro(decimo),
+        "ferias": VetorDinheiro(ferias),
+        "terco_ferias": VetorDinheiro(terco),
+        "bruto": VetorDinheiro(bruto),
+        "inss": VetorDinheiro(inss),
+        "valor_irrf": VetorDinheiro(irrf),
+        "valor_fgts": VetorDinheiro(fgts),
+        "multa_fgts": VetorDinheiro(multa),
+        "liquido": VetorDinheiro(bruto - inss - irrf)
+    }
+
+
+def _liquido_centavos(salarios: np.ndarray, dependentes: np.ndarray, pensoes: np.ndarray,
+                      tabela: TabelaFiscal) -> np.ndarray:
+    """Líquido em centavos (salário - INSS - IRRF - pensão), como em `calcular_folha_lote`."""
+    inss = _inss_centavos(salarios, tabela)
+    base_irrf = salarios - inss - dependentes * tabela.deducao_dependente - pensoes
+    return salarios - inss - np.maximum(_irrf_centavos(base_irrf, tabela), 0) - pensoes
+
+
+def calcular_salario_bruto_lote(liquidos, dependentes=None, pensoes=None, competencia=None) -> VetorDinheiro:
+    """
+    Versão vetorizada de `calcular_salario_bruto`: bisseção simultânea para toda a folha.
+    Cada passo avalia o líquido de todos os funcionários ainda não resolvidos, de modo que
+    o custo é de ~log2(salário em centavos) passagens vetorizadas, independente do tamanho da folha.
+    :param liquidos: Salários líquidos desejados (VetorDinheiro ou reais).
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param pensoes: Pensão alimentícia por funcionário (opcional).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Salário bruto de cada funcionário cujo líquido atinge o valor desejado e cujo centavo
+             anterior fica abaixo dele (pelo arredondamento nas bordas das faixas, não necessariamente o menor).
+    """
+    alvos = VetorDinheiro.de_reais(liquidos).centavos
+    tamanho = alvos.shape[0]
+    dependentes = normalizar_coluna(dependentes, tamanho).astype(np.int64)
+    pensoes = normalizar_coluna_centavos(pensoes, tamanho)
+    tabela = obter_tabela(competencia)
+
+    # Invariante: liquido(inferior) < alvo <= liquido(superior)
+    resolvido = alvos <= -pensoes
+    inferior = np.where(resolvido, -1, alvos + pensoes - 1)
+    superior = np.where(resolvido, 0, np.maximum(2 * (alvos + pensoes), 1))
+    curto = _liquido_centavos(superior, dependentes, pensoes, tabela) < alvos
+    while curto.any():
+        inferior = np.where(curto, superior, inferior)
+        superior = np.where(curto, 2 * superior, superior)
+        curto = _liquido_centavos(superior, dependentes, pensoes, tabela) < alvos
+
+    pendentes = np.flatnonzero(superior - inferior > 1)
+    while pendentes.size:
+        meio = (inferior[pendentes] + superior[pendentes]) // 2
+        atinge = _liquido_centavos(meio, dependentes[pendentes], pensoes[pendentes], tabela) >= alvos[pendentes]
+        superior[pendentes] = np.where(atinge, meio, superior[pendentes])
+        inferior[pendentes] = np.where(atinge, inferior[pendentes], meio)
+        pendentes = pendentes[superior[pendentes] - inferior[pendentes] > 1]
+
+    return VetorDinheiro(superior)
+
+
+def colunas_lancamentos(livros) -> Dict[str, VetorDinheiro]:
+    """
+    Monta as colunas de vencimentos e descontos extras a partir dos livros de lançamentos
+    de cada funcionário, usando os totais já mantidos pelos livros (sem somar os itens).
+    :param livros: Sequência de `LivroLancamentos`, um por funcionário.
+    :return: Dicionário com os vetores vencimentos e descontos, prontos para `calcular_folha_lote`.
+    """
+    vencimentos = np.fromiter((livro.total_vencimentos.centavos for livro in livros), dtype=np.int64)
+    descontos = np.fromiter((livro.total_descontos.centavos for livro in livros), dtype=np.int64)
+    return {"vencimentos": VetorDinheiro(vencimentos), "descontos": VetorDinheiro(descontos)}
+
+
+def calcular_folha_lote(salarios, dependentes=None, pensoes=None, vencimentos=None,
+                        descontos=None, competencia=None) -> Dict[str, VetorDinheiro]:
+    """
+    Calcula a folha de vários funcionários de uma só vez, em centavos inteiros.
+    Os tributos usam apenas o salário base, assim como `calcular_fgts` e `calcular_irrf`;
+    vencimentos e descontos extras entram somente no líquido.
+    :param salarios: Salários base (VetorDinheiro ou reais).
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param pensoes: Pensão alimentícia por funcionário (opcional).
+    :param vencimentos: Total de vencimentos extras por funcionário (opcional).
+    :param descontos: Total de descontos extras por funcionário (opcional).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :return: Dicionário com os vetores inss, base_irrf, valor_irrf, base_fgts, valor_fgts e liquido.
+    """
+    salarios = VetorDinheiro.de_reais(salarios)
+    if salarios.centavos.ndim != 1:
+        raise ValueError("Os salários devem ser informados em um vetor unidimensional.")
+    tamanho = len(salarios)
+    pensoes = VetorDinheiro(normalizar_coluna_centavos(pensoes, tamanho))
+    vencimentos = VetorDinheiro(normalizar_coluna_centavos(vencimentos, tamanho))
+    descontos = VetorDinheiro(normalizar_coluna_centavos(descontos, tamanho))
+
+    irrf = calcular_irrf_lote(salarios, dependentes, pensoes, competencia)
+    fgts = calcular_fgts_lote(salarios, competencia)
+
+    liquido = salarios + vencimentos - descontos - irrf["inss"] - irrf["valor_irrf"] - pensoes
+
+    return {
+        "inss": irrf["inss"],
+        "base_irrf": irrf["base_irrf"],
+        "valor_irrf": irrf["valor_irrf"],
+        "base_fgts": fgts["base_fgts"],
+        "valor_fgts": fgts["valor_fgts"],
+        "liquido": liquido
+    }
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,177 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# cenarios.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from src.calculos_lote import calcular_folha_lote, normalizar_coluna, normalizar_coluna_centavos
+from src.dinheiro import Dinheiro, VetorDinheiro
+from src.tabelas import registro_tabelas
+
+
+class ReajustePercentual:
+    """
+    Reajuste percentual (ex.: 4,5%), opcionalmente limitado a um aumento máximo
+    e/ou restrito aos salários até um valor.
+    """
+
+    def __init__(self, percentual: float, teto: Optional[float] = None, ate_salario: Optional[float] = None):
+        """
+        :param percentual: Percentual do reajuste (4.5 para 4,5%).
+        :param teto: Aumento máximo por funcionário, em reais (opcional).
+        :param ate_salario: Só reajusta salários menores ou iguais a este valor (opcional).
+        """
+        self.percentual = percentual
+        self.teto = teto
+        self.ate_salario = ate_salario
+
+    def aplicar(self, salarios: np.ndarray) -> np.ndarray:
+        """Retorna os salários reajustados, em centavos."""
+        aumento = VetorDinheiro(salarios).multiplicar(Fraction(str(self.percentual)) / 100).centavos
+        if self.teto is not None:
+            aumento = np.minimum(aumento, Dinheiro.de_reais(self.teto).centavos)
+        if self.ate_salario is not None:
+            aumento = np.where(salarios <= Dinheiro.de_reais(self.ate_salario).centavos, aumento, 0)
+        return salarios + aumento
+
+
+class AbonoFixo:
+    """Valor fixo somado ao salário de quem recebe abaixo de um piso (ou de todos, sem piso)."""
+
+    def __init__(self, valor: float, piso: Optional[float] = None):
+        """
+        :param valor: Valor do abono, em reais.
+        :param piso: Só recebe o abono quem ganha menos que este valor (opcional).
+        """
+        self.valor = valor
+        self.piso = piso
+
+    def aplicar(self, salarios: np.ndarray) -> np.ndarray:
+        """Retorna os salários com o abono, em centavos."""
+        abono = Dinheiro.de_reais(self.valor).centavos
+        if self.piso is None:
+            return salarios + abono
+        return np.where(salarios < Dinheiro.de_reais(self.piso).centavos, salarios + abono, salarios)
+
+
+class PisoSalarial:
+    """Eleva ao piso os salários que estiverem abaixo dele."""
+
+    def __init__(self, valor: float):
+        """
+        :param valor: Piso salarial, em reais.
+        """
+        self.valor = valor
+
+    def aplicar(self, salarios: np.ndarray) -> np.ndarray:
+        """Retorna os salários com o piso aplicado, em centavos."""
+        return np.maximum(salarios, Dinheiro.de_reais(self.valor).centavos)
+
+
+class Cenario:
+    """Conjunto de regras de reajuste aplicadas em sequência sobre a folha."""
+
+    def __init__(self, nome: str, regras: Sequence = ()):
+        """
+        :param nome: Nome do cenário (aparece no resultado).
+        :param regras: Regras com o método `aplicar(salarios_em_centavos)`, aplicadas na ordem.
+        """
+        self.nome = nome
+        self.regras = list(regras)
+
+    def aplicar(self, salarios: np.ndarray) -> np.ndarray:
+        """Retorna os salários após todas as regras, em centavos."""
+        for regra in self.regras:
+            salarios = regra.aplicar(salarios)
+        return salarios
+
+
+# Folha compartilhada com os processos de simulação (enviada uma única vez a cada processo)
+_FOLHA: Dict = {}
+
+
+def _preparar_folha(salarios: np.ndarray, dependentes: np.ndarray, pensoes: np.ndarray,
+                    competencia, caminho_tabelas: str):
+    """Guarda a folha no processo e carrega as mesmas tabelas fiscais do processo principal."""
+    _FOLHA.update(salarios=salarios, dependentes=dependentes, pensoes=pensoes, competencia=competencia)
+    if registro_tabelas.caminho != caminho_tabelas:
+        registro_tabelas.carregar(caminho_tabelas)
+
+
+def _percentil(ordenado: np.ndarray, fracao: float) -> Dinheiro:
+    """Percentil pelo posto mais próximo abaixo, sem interpolar (mantém centavos exatos)."""
+    return Dinheiro(int(ordenado[int(fracao * (len(ordenado) - 1))]))
+
+
+def _simular(cenario: Cenario) -> Dict:
+    """Aplica um cenário à folha guardada em `_FOLHA` e resume o resultado."""
+    salarios = cenario.aplicar(_FOLHA["salarios"])
+    folha = calcular_folha_lote(VetorDinheiro(salarios), _FOLHA["dependentes"], VetorDinheiro(_FOLHA["pensoes"]),
+                                competencia=_FOLHA["competencia"])
+
+    total_salarios = int(salarios.sum())
+    total_fgts = folha["valor_fgts"].soma()
+    liquido = np.sort(folha["liquido"].centavos)
+    return {
+        "cenario": cenario.nome,
+        "funcionarios": int(salarios.shape[0]),
+        "total_salarios": Dinheiro(total_salarios),
+        "total_inss": folha["inss"].soma(),
+        "total_irrf": folha["valor_irrf"].soma(),
+        "total_fgts": total_fgts,
+        "custo_empregador": Dinheiro(total_salarios) + total_fgts,
+        "total_liquido": Dinheiro(int(liquido.sum())),
+        "liquido": {
+            "minimo": Dinheiro(int(liquido[0])),
+            "p10": _percentil(liquido, 0.10),
+            "p25": _percentil(liquido, 0.25),
+            "mediana": _percentil(liquido, 0.50),
+            "p75": _percentil(liquido, 0.75),
+            "p90": _percentil(liquido, 0.90),
+            "maximo": Dinheiro(int(liquido[-1])),
+            "media": Dinheiro(int(liquido.sum())).dividir(len(liquido)),
+        },
+    }
+
+
+def simular_cenarios(salarios, cenarios: Sequence[Cenario], dependentes=None, pensoes=None,
+                     competencia=None, processos: Optional[int] = None) -> List[Dict]:
+    """
+    Simula vários cenários de reajuste sobre a mesma folha, distribuindo-os entre processos.
+    A folha é enviada uma vez para cada processo; cada cenário é calculado com `calcular_folha_lote`.
+    Para comparar com a situação atual, inclua um cenário sem regras.
+    :param salarios: Salários base atuais (VetorDinheiro ou reais).
+    :param cenarios: Cenários a simular.
+    :param dependentes: Número de dependentes por funcionário (opcional).
+    :param pensoes: Pensão alimentícia por funcionário (opcional).
+    :param competencia: Competência do cálculo (None usa a tabela mais recente).
+    :param processos: Número de processos (None usa todos os núcleos; 1 simula no próprio processo).
+    :return: Um resumo por cenário, na ordem recebida: custo do empregador (salários + FGTS),
+             totais de INSS/IRRF/FGTS/líquido e a distribuição do líquido.
+    """
+    salarios = VetorDinheiro.de_reais(salarios).centavos
+    tamanho = salarios.shape[0]
+    if tamanho == 0:
+        raise ValueError("A folha não possui funcionários.")
+    argumentos = (salarios, normalizar_coluna(dependentes, tamanho).astype(np.int64),
+                  normalizar_coluna_centavos(pensoes, tamanho), competencia, registro_tabelas.caminho)
+
+    processos = min(processos or os.cpu_count() or 1, len(cenarios))
+    if processos <= 1:
+        _preparar_folha(*argumentos)
+        return [_simular(cenario) for cenario in cenarios]
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_preparar_folha, initargs=argumentos) as executor:
+        return list(executor.map(_simular, cenarios))
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
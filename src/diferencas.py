@@ -0,0 +1,264 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# diferencas.py
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+import numpy as np
+
+from src.dinheiro import Dinheiro, VetorDinheiro
+
+# Colunas comparadas em cada funcionário (mesmos nomes de `calcular_folha_lote`)
+CAMPOS = ("salario", "inss", "valor_irrf", "valor_fgts", "liquido")
+
+
+def _centavos_item(valor) -> int:
+    """Converte o valor de uma rubrica (Dinheiro, número ou texto formatado) em centavos."""
+    if isinstance(valor, Dinheiro):
+        return valor.centavos
+    if isinstance(valor, str):
+        return Dinheiro.de_texto(valor).centavos if valor.strip() else 0
+    return Dinheiro.de_reais(valor).centavos
+
+
+class FolhaCalculada:
+    """
+    Folha de uma competência já calculada, guardada em colunas: um vetor de centavos por campo
+    e as rubricas de todos os funcionários em vetores contínuos, com o início das rubricas de
+    cada funcionário em `inicio_rubricas` (sem um dicionário por funcionário).
+    """
+
+    def __init__(self, codigos: Sequence, colunas: Dict[str, object], rubricas: Optional[Iterable] = None,
+                 competencia=None):
+        """
+        :param codigos: Código de cada funcionário (únicos na folha).
+        :param colunas: Vetores (VetorDinheiro ou reais) de cada campo de `CAMPOS`; campos ausentes ficam zerados.
+        :param rubricas: Para cada funcionário, seus itens no formato de `obter_itens_lancamentos`
+                         (codigo, descricao, desconto, vencimento) ou um `LivroLancamentos` (opcional).
+        :param competencia: Competência da folha (apenas informativa).
+        """
+        self.competencia = competencia
+        self.codigos = list(codigos)
+        tamanho = len(self.codigos)
+
+        self.colunas = {}
+        for campo in CAMPOS:
+            valores = colunas.get(campo)
+            centavos = np.zeros(tamanho, dtype=np.int64) if valores is None else VetorDinheiro.de_reais(valores).centavos
+            if centavos.shape != (tamanho,):
+                raise ValueError(f"Coluna '{campo}' com {centavos.shape[0]} posições, esperado {tamanho}.")
+            self.colunas[campo] = centavos
+
+        self.inicio_rubricas = np.zeros(tamanho + 1, dtype=np.int64)
+        self.rubrica_codigos = []
+        self.rubrica_descricoes = []
+        descontos = []
+        vencimentos = []
+        if rubricas is not None:
+            posicao = 0
+            funcionarios = 0
+            for indice, itens in enumerate(rubricas):
+                funcionarios = indice + 1
+                for item in itens:
+                    self.rubrica_codigos.append(str(item.get("codigo", "")).strip())
+                    self.rubrica_descricoes.append(item.get("descricao", ""))
+                    descontos.append(_centavos_item(item.get("desconto", 0)))
+                    vencimentos.append(_centavos_item(item.get("vencimento", 0)))
+                    posicao += 1
+                self.inicio_rubricas[indice + 1] = posicao
+            if funcionarios != tamanho:
+                raise ValueError(f"Rubricas de {funcionarios} funcionários, esperado {tamanho}.")
+        self.rubrica_descontos = np.array(descontos, dtype=np.int64)
+        self.rubrica_vencimentos = np.array(vencimentos, dtype=np.int64)
+
+    @classmethod
+    def de_lote(cls, codigos: Sequence, salarios, resultado: Dict[str, VetorDinheiro],
+                rubricas: Optional[Iterable] = None, competencia=None) -> "FolhaCalculada":
+        """
+        Monta a folha a partir do resultado de `calcular_folha_lote`.
+        :param codigos: Código de cada funcionário.
+        :param salarios: Salários base usados no cálculo.
+        :param resultado: Dicionário retornado por `calcular_folha_lote`.
+        :param rubricas: Itens de cada funcionário (opcional).
+        :param competencia: Competência da folha.
+        """
+        colunas = dict(resultado)
+        colunas["salario"] = salarios
+        return cls(codigos, colunas, rubricas, competencia)
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def _rubricas(self, indice: int) -> Dict[str, tuple]:
+        """Rubricas de um funcionário, indexadas pelo código (ou pela descrição, se não houver código)."""
+        rubricas = {}
+        for posicao in range(self.inicio_rubricas[indice], self.inicio_rubricas[indice + 1]):
+            chave = self.rubrica_codigos[posicao] or self.rubrica_descricoes[posicao].strip().upper()
+            desconto, vencimento = int(self.rubrica_descontos[posicao]), int(self.rubrica_vencimentos[posicao])
+            if chave in rubricas:  # mesma rubrica lançada duas vezes: soma os valores
+                _, desconto_anterior, vencimento_anterior = rubricas[chave]
+                desconto += desconto_anterior
+                vencimento += vencimento_anterior
+            rubricas[chave] = (self.rubrica_descricoes[posicao], desconto, vencimento)
+        return rubricas
+
+
+def _variacao(anterior: int, atual: int) -> Dict[str, Dinheiro]:
+    return {"anterior": Dinheiro(anterior), "atual": Dinheiro(atual), "diferenca": Dinheiro(atual - anterior)}
+
+
+def _diferencas_rubricas(rubricas_anteriores: Dict[str, tuple], rubricas_atuais: Dict[str, tuple]) -> list:
+    """Compara as rubricas de um funcionário nas duas folhas."""
+    diferencas = []
+    for chave, (descricao, desconto, vencimento) in rubricas_atuais.items():
+        _, desconto_anterior, vencimento_anterior = rubricas_anteriores.pop(chave, ("", 0, 0))
+        if desconto != desconto_anterior or vencimento != vencimento_anterior:
+            diferencas.append({"rubrica": chave, "descricao": descricao,
+                               "desconto": _variacao(desconto_anterior, desconto),
+                               "vencimento": _variacao(vencimento_anterior, vencimento)})
+    for chave, (descricao, desconto, vencimento) in rubricas_anteriores.items():  # rubricas que saíram
+        diferencas.append({"rubrica": chave, "descricao": descricao,
+                           "desconto": _variacao(desconto, 0), "vencimento": _variacao(vencimento, 0)})
+    return diferencas
+
+
+def _segmentos(inicio: np.ndarray, linhas: np.ndarray) -> np.ndarray:
+    """Posições, em ordem, de todas as rubricas das linhas informadas."""
+    quantidades = inicio[linhas + 1] - inicio[linhas]
+    deslocamentos = np.arange(quantidades.sum()) - np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+    return np.repeat(inicio[linhas], quantidades) + deslocamentos
+
+
+def _rubricas_alteradas(anterior: FolhaCalculada, atual: FolhaCalculada,
+                        encontrados: np.ndarray, origem: np.ndarray) -> np.ndarray:
+    """
+    Filtro vetorizado: marca os funcionários cujas rubricas podem ter mudado. Rubricas na mesma
+    ordem e com os mesmos valores nas duas folhas são descartadas sem montar nada por funcionário;
+    as marcadas são conferidas depois, uma a uma, por `_diferencas_rubricas`.
+    """
+    quantidade_atual = np.diff(atual.inicio_rubricas)
+    quantidade_anterior = np.where(encontrados, np.diff(anterior.inicio_rubricas)[origem], 0)
+    alteradas = quantidade_atual != quantidade_anterior
+
+    linhas = np.flatnonzero(~alteradas & (quantidade_atual > 0))
+    if linhas.size:
+        # Chaves das rubricas convertidas em inteiros por um índice hash comum às duas folhas
+        ids = {}
+        chaves = {}
+        for nome, folha in (("anterior", anterior), ("atual", atual)):
+            chaves[nome] = np.fromiter(
+                (ids.setdefault(codigo or descricao.strip().upper(), len(ids))
+                 for codigo, descricao in zip(folha.rubrica_codigos, folha.rubrica_descricoes)),
+                dtype=np.int64, count=len(folha.rubrica_codigos))
+
+        posicoes_atual = _segmentos(atual.inicio_rubricas, linhas)
+        posicoes_anterior = _segmentos(anterior.inicio_rubricas, origem[linhas])
+        diferentes = ((chaves["atual"][posicoes_atual] != chaves["anterior"][posicoes_anterior]) |
+                      (atual.rubrica_descontos[posicoes_atual] != anterior.rubrica_descontos[posicoes_anterior]) |
+                      (atual.rubrica_vencimentos[posicoes_atual] != anterior.rubrica_vencimentos[posicoes_anterior]))
+        linha_de_cada = np.repeat(np.arange(linhas.size), quantidade_atual[linhas])
+        alteradas[linhas] = np.bincount(linha_de_cada, weights=diferentes, minlength=linhas.size) > 0
+    return alteradas
+
+
+def comparar_folhas(anterior: FolhaCalculada, atual: FolhaCalculada,
+                    incluir_iguais: bool = False) -> Iterator[Dict]:
+    """
+    Compara duas folhas e gera, um a um, os funcionários com diferença.
+    A junção usa um índice hash (código -> posição) apenas da folha anterior; as diferenças
+    dos campos são calculadas de uma vez em vetores e as rubricas só são comparadas por funcionário.
+    :param anterior: Folha da competência anterior.
+    :param atual: Folha da competência atual.
+    :param incluir_iguais: Também gera os funcionários sem nenhuma diferença.
+    :return: Gerador de dicionários com codigo, situacao ("alterado", "admitido", "desligado" ou "igual"),
+             campos (apenas os que mudaram, com anterior/atual/diferenca) e rubricas.
+    """
+    indice = {}
+    for posicao, codigo in enumerate(anterior.codigos):
+        if codigo in indice:
+            raise ValueError(f"Código de funcionário repetido na folha anterior: {codigo}")
+        indice[codigo] = posicao
+    if len(set(atual.codigos)) != len(atual):
+        raise ValueError("Código de funcionário repetido na folha atual.")
+
+    posicoes = np.fromiter((indice.get(codigo, -1) for codigo in atual.codigos), dtype=np.int64, count=len(atual))
+    encontrados = posicoes >= 0
+    origem = np.where(encontrados, posicoes, 0)
+
+    # Valores anteriores alinhados à folha atual (zero para admitidos) e máscara de campos alterados
+    anteriores = {campo: np.where(encontrados, anterior.colunas[campo][origem], 0) for campo in CAMPOS}
+    alterados = {campo: anteriores[campo] != atual.colunas[campo] for campo in CAMPOS}
+    algum_alterado = np.logical_or.reduce([alterados[campo] for campo in CAMPOS])
+    rubricas_alteradas = _rubricas_alteradas(anterior, atual, encontrados, origem)
+
+    candidatos = np.arange(len(atual)) if incluir_iguais else \
+        np.flatnonzero(algum_alterado | rubricas_alteradas | ~encontrados)
+    for posicao_atual in candidatos.tolist():
+        codigo = atual.codigos[posicao_atual]
+        posicao_anterior = int(posicoes[posicao_atual])
+
+        rubricas = _diferencas_rubricas(
+            anterior._rubricas(posicao_anterior) if posicao_anterior >= 0 else {},
+            atual._rubricas(posicao_atual)
+        )
+        if posicao_anterior < 0:
+            situacao = "admitido"
+        elif algum_alterado[posicao_atual] or rubricas:
+            situacao = "alterado"
+        elif incluir_iguais:
+            situacao = "igual"
+        else:
+            continue
+
+        yield {
+            "codigo": codigo,
+            "situacao": situacao,
+            "campos": {campo: _variacao(int(anteriores[campo][posicao_atual]), int(atual.colunas[campo][posicao_atual]))
+                       for campo in CAMPOS if alterados[campo][posicao_atual]},
+            "rubricas": rubricas,
+        }
+
+    # Funcionários que estavam na folha anterior e não aparecem na atual
+    presentes = np.zeros(len(anterior), dtype=bool)
+    presentes[posicoes[encontrados]] = True
+    for posicao_anterior in np.flatnonzero(~presentes):
+        posicao_anterior = int(posicao_anterior)
+        yield {
+            "codigo": anterior.codigos[posicao_anterior],
+            "situacao": "desligado",
+            "campos": {campo: _variacao(int(anterior.colunas[campo][posicao_anterior]), 0)
+                       for campo in CAMPOS if anterior.colunas[campo][posicao_anterior] != 0},
+            "rubricas": _diferencas_rubricas(anterior._rubricas(posicao_anterior), {}),
+        }
+
+
+def resumir_diferencas(diferencas: Iterable[Dict]) -> Dict:
+    """
+    Consome o gerador de `comparar_folhas` e totaliza as diferenças, sem guardar os funcionários.
+    :param diferencas: Diferenças geradas por `comparar_folhas`.
+    :return: Dicionário com a contagem por situação, a diferença total por campo e por rubrica.
+    """
+    situacoes = {}
+    campos = {campo: 0 for campo in CAMPOS}
+    rubricas = {}
+    for diferenca in diferencas:
+        situacoes[diferenca["situacao"]] = situacoes.get(diferenca["situacao"], 0) + 1
+        for campo, variacao in diferenca["campos"].items():
+            campos[campo] += variacao["diferenca"].centavos
+        for rubrica in diferenca["rubricas"]:
+            desconto, vencimento = rubricas.get(rubrica["rubrica"], (0, 0))
+            rubricas[rubrica["rubrica"]] = (desconto + rubrica["desconto"]["diferenca"].centavos,
+                                            vencimento + rubrica["vencimento"]["diferenca"].centavos)
+    return {
+        "situacoes": situacoes,
+        "campos": {campo: Dinheiro(total) for campo, total in campos.items()},
+        "rubricas": {rubrica: {"desconto": Dinheiro(desconto), "vencimento": Dinheiro(vencimento)}
+                     for rubrica, (desconto, vencimento) in rubricas.items()},
+    }
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,358 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# dinheiro.py
+import math
+from fractions import Fraction
+from typing import Iterable, List, Union
+import numpy as np
+
+# Regras de arredondamento aceitas pelas operações com centavos
+MEIO_PARA_CIMA = "meio_para_cima"  # 0,5 centavo arredonda para longe do zero (padrão bancário)
+MEIO_PARA_PAR = "meio_para_par"  # 0,5 centavo arredonda para o centavo par
+TRUNCAR = "truncar"  # descarta as frações de centavo
+
+
+def dividir_arredondando(numerador: int, denominador: int, modo: str = MEIO_PARA_CIMA) -> int:
+    """
+    Divide dois inteiros aplicando a regra de arredondamento escolhida, sem ponto flutuante.
+    :param numerador: Valor inteiro a ser dividido.
+    :param denominador: Divisor inteiro positivo.
+    :param modo: MEIO_PARA_CIMA, MEIO_PARA_PAR ou TRUNCAR.
+    :return: Quociente inteiro arredondado.
+    """
+    if modo not in (MEIO_PARA_CIMA, MEIO_PARA_PAR, TRUNCAR):
+        raise ValueError(f"Modo de arredondamento desconhecido: {modo}")
+    sinal = -1 if (numerador < 0) != (denominador < 0) else 1
+    quociente, resto = divmod(abs(numerador), abs(denominador))
+    if modo == TRUNCAR:
+        return sinal * quociente
+    dobro_resto = resto * 2
+    if dobro_resto > abs(denominador) or (dobro_resto == abs(denominador) and
+                                          (modo == MEIO_PARA_CIMA or quociente % 2 == 1)):
+        quociente += 1
+    return sinal * quociente
+
+
+def dividir_arredondando_vetor(numerador: np.ndarray, denominador: int, modo: str = MEIO_PARA_CIMA) -> np.ndarray:
+    """
+    Versão vetorizada de `dividir_arredondando` para vetores int64 e divisor positivo.
+    :param numerador: Vetor de inteiros.
+    :param denominador: Divisor inteiro positivo.
+    :param modo: MEIO_PARA_CIMA, MEIO_PARA_PAR ou TRUNCAR.
+    :return: Vetor int64 com os quocientes arredondados.
+    """
+    numerador = np.asarray(numerador, dtype=np.int64)
+    sinal = np.where(numerador < 0, -1, 1)
+    quociente, resto = np.divmod(np.abs(numerador), denominador)
+    if modo == TRUNCAR:
+        return sinal * quociente
+    dobro_resto = resto * 2
+    if modo == MEIO_PARA_CIMA:
+        sobe = dobro_resto >= denominador
+    elif modo == MEIO_PARA_PAR:
+        sobe = (dobro_resto > denominador) | ((dobro_resto == denominador) & (quociente % 2 == 1))
+    else:
+        raise ValueError(f"Modo de arredondamento desconhecido: {modo}")
+    return sinal * (quociente + sobe)
+
+
+def _centavos_de_reais(valor: float, modo: str = MEIO_PARA_CIMA) -> int:
+    """Converte reais em ponto flutuante para centavos, tolerando o ruído binário (ex.: 2.675 * 100)."""
+    escalado = round(float(valor) * 100, 6)
+    if modo == TRUNCAR:
+        return int(escalado)
+    if modo == MEIO_PARA_PAR:
+        return int(round(escalado))
+    return int(math.copysign(math.floor(abs(escalado) + 0.5), escalado))
+
+
+class Dinheiro:
+    """
+    Valor monetário em centavos inteiros. Somas e subtrações são exatas;
+    multiplicações e divisões arredondam explicitamente (padrão: MEIO_PARA_CIMA).
+    """
+
+    __slots__ = ("centavos",)
+
+    def __init__(self, centavos: int = 0):
+        self.centavos = int(centavos)
+
+    @classmethod
+    def de_reais(cls, valor: Union[float, int, "Dinheiro"], modo: str = MEIO_PARA_CIMA) -> "Dinheiro":
+        """
+        Cria um valor a partir de reais (float/int) ou devolve o próprio Dinheiro.
+        :param valor: Valor em reais.
+        :param modo: Regra de arredondamento das frações de centavo.
+        :return: Dinheiro equivalente.
+        """
+        if isinstance(valor, Dinheiro):
+            return valor
+        return cls(_centavos_de_reais(valor, modo))
+
+    @classmethod
+    def de_texto(cls, texto: str, modo: str = MEIO_PARA_CIMA) -> "Dinheiro":
+        """
+        Interpreta um valor digitado em uma única passagem pelos caracteres.
+        Aceita "1.234,56", "1234,56", "1234.56", "1.234", "-12,5" e "R$ 10,00".
+        O último separador é decimal quando for vírgula ou quando tiver até duas casas;
+        um ponto seguido de exatamente três dígitos é separador de milhar.
+        :param texto: Texto com o valor.
+        :param modo: Regra de arredondamento se houver mais de duas casas decimais.
+        :return: Dinheiro correspondente (zero para texto vazio).
+        :raises ValueError: Se houver caracteres inválidos.
+        """
+        numero = 0
+        digitos = 0
+        casas = 0  # dígitos após o último separador
+        separador = ""
+        negativo = False
+
+        for caractere in texto:
+            if "0" <= caractere <= "9":
+                numero = numero * 10 + (ord(caractere) - 48)
+                digitos += 1
+                casas += 1
+            elif caractere == "," or caractere == ".":
+                separador = caractere
+                casas = 0
+            elif caractere == "-" and digitos == 0:
+                negativo = True
+            elif caractere in " R$\t\u00a0":
+                continue
+            else:
+                raise ValueError(f"Valor monetário inválido: {texto!r}")
+
+        if not separador or (separador == "." and casas == 3):
+            casas = 0
+        centavos = dividir_arredondando(numero * 100, 10 ** casas, modo)
+        return cls(-centavos if negativo else centavos)
+
+    @staticmethod
+    def somar(valores: Iterable["Dinheiro"]) -> "Dinheiro":
+        """
+        Soma exata de uma sequência de valores.
+        :param valores: Iterável de Dinheiro.
+        :return: Total em Dinheiro.
+        """
+        return Dinheiro(sum(valor.centavos for valor in valores))
+
+    def reais(self) -> float:
+        """Retorna o valor em reais como float (apenas para exibição ou integração)."""
+        return self.centavos / 100
+
+    def formatar(self, milhar: bool = True, separador: str = ",") -> str:
+        """
+        Formata o valor em uma única operação.
+        :param milhar: Se True, usa ponto como separador de milhar ("1.234,56").
+        :param separador: Separador decimal ("," para exibição, "." para o texto da lista de lançamentos).
+        :return: Texto formatado.
+        """
+        inteiro, centavos = divmod(abs(self.centavos), 100)
+        sinal = "-" if self.centavos < 0 else ""
+        if milhar:
+            return f"{sinal}{inteiro:,}".replace(",", ".") + f"{separador}{centavos:02d}"
+        return f"{sinal}{inteiro}{separador}{centavos:02d}"
+
+    def multiplicar(self, fator: Union[int, float, Fraction], modo: str = MEIO_PARA_CIMA) -> "Dinheiro":
+        """
+        Multiplica por um fator (ex.: alíquota) e arredonda ao centavo.
+        :param fator: Fator da multiplicação; floats são lidos pela sua representação decimal.
+        :param modo: Regra de arredondamento.
+        :return: Produto em Dinheiro.
+        """
+        fracao = fator if isinstance(fator, Fraction) else Fraction(str(fator))
+        return Dinheiro(dividir_arredondando(self.centavos * fracao.numerator, fracao.denominator, modo))
+
+    def dividir(self, divisor: Union[int, float, Fraction], modo: str = MEIO_PARA_CIMA) -> "Dinheiro":
+        """
+        Divide por um número e arredonda ao centavo.
+        :param divisor: Divisor diferente de zero.
+        :param modo: Regra de arredondamento.
+        :return: Quociente em Dinheiro.
+        """
+        fracao = divisor if isinstance(divisor, Fraction) else Fraction(str(divisor))
+        return Dinheiro(dividir_arredondando(self.centavos * fracao.denominator, fracao.numerator, modo))
+
+    def _outro(self, outro) -> int:
+        if isinstance(outro, Dinheiro):
+            return outro.centavos
+        if isinstance(outro, (int, float)):
+            return _centavos_de_reais(outro)
+        return NotImplemented
+
+    def __add__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else Dinheiro(self.centavos + centavos)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else Dinheiro(self.centavos - centavos)
+
+    def __rsub__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else Dinheiro(centavos - self.centavos)
+
+    def __mul__(self, fator):
+        if isinstance(fator, (int, float, Fraction)):
+            return self.multiplicar(fator)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        if isinstance(divisor, (int, float, Fraction)):
+            return self.dividir(divisor)
+        return NotImplemented
+
+    def __neg__(self):
+        return Dinheiro(-self.centavos)
+
+    def __abs__(self):
+        return Dinheiro(abs(self.centavos))
+
+    def __eq__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else self.centavos == centavos
+
+    def __lt__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else self.centavos < centavos
+
+    def __le__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else self.centavos <= centavos
+
+    def __gt__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else self.centavos > centavos
+
+    def __ge__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else self.centavos >= centavos
+
+    def __hash__(self):
+        # Igual ao hash do valor exato em reais (Dinheiro(100) e 1 caem na mesma chave). Floats são
+        # comparados arredondados ao centavo, como nas demais operações, então não misture Dinheiro
+        # e float como chaves do mesmo dicionário/conjunto.
+        return hash(Fraction(self.centavos, 100))
+
+    def __bool__(self):
+        return self.centavos != 0
+
+    def __float__(self):
+        return self.centavos / 100
+
+    def __str__(self):
+        return self.formatar()
+
+    def __repr__(self):
+        return f"Dinheiro({self.formatar()})"
+
+
+class VetorDinheiro:
+    """
+    Vetor de valores monetários em centavos (int64) para cálculos em lote.
+    A soma é feita em inteiros, de modo que o total bate com o banco ao centavo.
+    """
+
+    __slots__ = ("centavos",)
+
+    def __init__(self, centavos):
+        self.centavos = np.asarray(centavos, dtype=np.int64)
+
+    @classmethod
+    def de_reais(cls, valores, modo: str = MEIO_PARA_CIMA) -> "VetorDinheiro":
+        """
+        Converte um vetor de reais (float) em centavos, com a mesma regra de `Dinheiro.de_reais`.
+        :param valores: Sequência ou vetor de valores em reais (ou um VetorDinheiro).
+        :param modo: Regra de arredondamento das frações de centavo.
+        :return: VetorDinheiro equivalente.
+        """
+        if isinstance(valores, VetorDinheiro):
+            return valores
+        escalado = np.round(np.asarray(valores, dtype=np.float64) * 100, 6)
+        if modo == TRUNCAR:
+            centavos = np.trunc(escalado)
+        elif modo == MEIO_PARA_PAR:
+            centavos = np.rint(escalado)
+        else:
+            centavos = np.copysign(np.floor(np.abs(escalado) + 0.5), escalado)
+        return cls(centavos.astype(np.int64))
+
+    @classmethod
+    def de_textos(cls, textos: Iterable[str], modo: str = MEIO_PARA_CIMA) -> "VetorDinheiro":
+        """
+        Interpreta vários textos com `Dinheiro.de_texto`.
+        :param textos: Iterável de textos com valores.
+        :param modo: Regra de arredondamento.
+        :return: VetorDinheiro com os valores lidos.
+        """
+        return cls(np.fromiter((Dinheiro.de_texto(texto, modo).centavos for texto in textos), dtype=np.int64))
+
+    @classmethod
+    def zeros(cls, tamanho: int) -> "VetorDinheiro":
+        """Cria um vetor de valores zerados."""
+        return cls(np.zeros(tamanho, dtype=np.int64))
+
+    def soma(self) -> Dinheiro:
+        """Retorna o total exato do vetor."""
+        return Dinheiro(int(self.centavos.sum(dtype=np.int64)))
+
+    def reais(self) -> np.ndarray:
+        """Retorna os valores em reais como vetor float64."""
+        return self.centavos / 100
+
+    def formatar(self, milhar: bool = True, separador: str = ",") -> List[str]:
+        """Formata cada posição com `Dinheiro.formatar`."""
+        return [Dinheiro(centavos).formatar(milhar, separador) for centavos in self.centavos.tolist()]
+
+    def multiplicar(self, fator: Union[int, float, Fraction], modo: str = MEIO_PARA_CIMA) -> "VetorDinheiro":
+        """
+        Multiplica todas as posições por um fator e arredonda ao centavo.
+        :param fator: Fator da multiplicação.
+        :param modo: Regra de arredondamento.
+        :return: Novo VetorDinheiro.
+        """
+        fracao = fator if isinstance(fator, Fraction) else Fraction(str(fator))
+        return VetorDinheiro(dividir_arredondando_vetor(self.centavos * fracao.numerator, fracao.denominator, modo))
+
+    def _outro(self, outro):
+        if isinstance(outro, VetorDinheiro):
+            return outro.centavos
+        if isinstance(outro, Dinheiro):
+            return outro.centavos
+        return NotImplemented
+
+    def __add__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else VetorDinheiro(self.centavos + centavos)
+
+    def __sub__(self, outro):
+        centavos = self._outro(outro)
+        return NotImplemented if centavos is NotImplemented else VetorDinheiro(self.centavos - centavos)
+
+    def __neg__(self):
+        return VetorDinheiro(-self.centavos)
+
+    def __len__(self):
+        return self.centavos.shape[0]
+
+    def __getitem__(self, indice):
+        selecionado = self.centavos[indice]
+        if np.ndim(selecionado) == 0:
+            return Dinheiro(int(selecionado))
+        return VetorDinheiro(selecionado)
+
+    def __repr__(self):
+        return f"VetorDinheiro({len(self)} valores, total {self.soma().formatar()})"
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,205 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# exportacao.py
+# Uso: python -m src.exportacao holerites.json|holerites.jsonl destino [--por-funcionario] [--arranjo horizontal] [--limite-memoria 1024]
+import os
+os.environ["QT_API"] = "PyQt5"
+import argparse
+import gc
+import json
+import sys
+import time
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+import psutil
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from src.pdf_generator import ARRANJOS, ArranjoFolha, compor_folha
+from src.pdf_vetorial import EscritorPdfImagens
+from src.renderizador import (DadosHolerite, LayoutHolerite, cache_camadas, carregar_layout, carregar_template,
+                              garantir_aplicacao, paginar_holerite, renderizar_holerite)
+from src.utils import cache_texto, desenhar_imagem_pdf
+
+LIMITE_MEMORIA_MB = 1024  # Teto padrão do RSS do processo durante a exportação
+TAMANHO_BLOCO_LEITURA = 64 * 1024  # Caracteres lidos por vez do arquivo de registros
+
+
+class MonitorMemoria:
+    """
+    Acompanha o RSS (memória residente) do processo durante a exportação e guarda o pico observado.
+    Acima do limite, libera os caches de desenho; se ainda assim não couber, interrompe com MemoryError.
+    """
+
+    def __init__(self, limite_mb: Optional[float] = LIMITE_MEMORIA_MB):
+        """
+        :param limite_mb: Teto do RSS, em MB (None ou 0 apenas mede).
+        """
+        self.limite_mb = limite_mb or None
+        self._processo = psutil.Process()
+        self.inicial = self.pico = self._processo.memory_info().rss
+        self.liberacoes = 0
+
+    def verificar(self) -> int:
+        """Mede o RSS atual, atualiza o pico e aplica o limite. Retorna o RSS em bytes."""
+        rss = self._processo.memory_info().rss
+        if self.limite_mb and rss > self.limite_mb * 2 ** 20:
+            self.liberacoes += 1
+            cache_camadas.limpar()
+            cache_texto.limpar()
+            gc.collect()
+            rss = self._processo.memory_info().rss
+            if rss > self.limite_mb * 2 ** 20:
+                self.pico = max(self.pico, rss)
+                raise MemoryError(f"Uso de memória ({rss / 2 ** 20:.0f} MB) acima do limite de "
+                                  f"{self.limite_mb:.0f} MB")
+        self.pico = max(self.pico, rss)
+        return rss
+
+
+def exportar_pdf(registros: Iterable[Union[DadosHolerite, Dict]], destino: str, por_funcionario: bool = False,
+                 arranjo: Union[str, ArranjoFolha] = "horizontal", limite_memoria_mb: Optional[float] = LIMITE_MEMORIA_MB,
+                 nome_arquivo: str = "holerite_{indice:05d}.pdf", titulo: str = "Holerites",
+                 layout: Optional[LayoutHolerite] = None) -> Dict:
+    """
+    Exporta a folha de pagamento inteira para PDF lendo os registros um a um (pode ser um gerador).
+    Cada página é desenhada, gravada e liberada antes da próxima, então a memória não cresce com
+    a quantidade de funcionários.
+    :param registros: DadosHolerite ou dicionários no formato de `para_dicionario`.
+    :param destino: Caminho do PDF único ou, com `por_funcionario`, pasta dos PDFs.
+    :param por_funcionario: Gera um PDF por funcionário (com o canvas do ReportLab) em vez de um arquivo único.
+    :param arranjo: Disposição do holerite na folha A4 (veja pdf_generator.ARRANJOS).
+    :param limite_memoria_mb: Teto do RSS do processo, em MB (None apenas mede).
+    :param nome_arquivo: Modelo do nome de cada PDF por funcionário; recebe `indice` e `codigo`.
+    :param titulo: Título do PDF único.
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: Relatório com holerites, paginas, arquivos, segundos, rss_inicial_mb, pico_rss_mb e limite_memoria_mb.
+    """
+    garantir_aplicacao()
+    layout = layout or carregar_layout()
+    template = carregar_template(layout.caminho_template, layout.tamanho_template)
+    monitor = MonitorMemoria(limite_memoria_mb)
+    inicio = time.perf_counter()
+    holerites = paginas = 0
+    arquivos = []
+
+    if por_funcionario:
+        os.makedirs(destino, exist_ok=True)
+        escritor = None
+    else:
+        escritor = EscritorPdfImagens(destino, titulo)
+        arquivos.append(destino)
+    try:
+        for indice, registro in enumerate(registros, start=1):
+            dados = registro if isinstance(registro, DadosHolerite) else DadosHolerite(**registro)
+            if por_funcionario:
+                caminho = os.path.join(destino, nome_arquivo.format(indice=indice, codigo=dados.codigo))
+                c = canvas.Canvas(caminho, pagesize=A4)
+            for pagina in paginar_holerite(dados, layout):
+                folha = compor_folha(renderizar_holerite(pagina, template, layout), arranjo)
+                monitor.verificar()
+                if por_funcionario:
+                    desenhar_imagem_pdf(c, folha)
+                else:
+                    escritor.adicionar_imagem(folha)
+                del folha  # A imagem da página é liberada antes da próxima
+                paginas += 1
+            if por_funcionario:
+                c.save()
+                arquivos.append(caminho)
+            holerites += 1
+            monitor.verificar()
+    finally:
+        if escritor is not None:
+            escritor.fechar()
+
+    return {
+        "holerites": holerites,
+        "paginas": paginas,
+        "arquivos": len(arquivos),
+        "destino": destino,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "rss_inicial_mb": round(monitor.inicial / 2 ** 20, 1),
+        "pico_rss_mb": round(monitor.pico / 2 ** 20, 1),
+        "limite_memoria_mb": monitor.limite_mb,
+        "liberacoes_memoria": monitor.liberacoes,
+    }
+
+
+def ler_registros(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO_LEITURA) -> Iterator[Dict]:
+    """
+    Lê os holerites de um arquivo JSON um a um, sem carregar o arquivo inteiro.
+    Aceita uma lista JSON (`[{...}, {...}]`), um único objeto ou JSON Lines (um objeto por linha).
+    Só o registro em leitura fica na memória, além de um bloco do arquivo.
+    :param caminho: Caminho do arquivo .json ou .jsonl.
+    :param tamanho_bloco: Quantidade de caracteres lidos do disco por vez.
+    :return: Gerador com o dicionário de cada holerite.
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        buffer, posicao, fim = "", 0, False
+        em_lista = None  # Descoberto no primeiro caractere: "[" indica uma lista JSON
+
+        while True:
+            # Pula espaços (e as vírgulas entre os itens da lista), lendo mais blocos se preciso
+            while True:
+                while posicao < len(buffer) and (buffer[posicao].isspace() or (em_lista and buffer[posicao] == ",")):
+                    posicao += 1
+                if posicao < len(buffer) or fim:
+                    break
+                buffer, posicao = arquivo.read(tamanho_bloco), 0
+                fim = not buffer
+            if posicao >= len(buffer):
+                return
+            if em_lista is None:
+                em_lista = buffer[posicao] == "["
+                posicao += em_lista
+                continue
+            if em_lista and buffer[posicao] == "]":
+                return
+
+            try:
+                registro, posicao = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                if fim:
+                    raise
+                # Registro incompleto: descarta o que já foi lido e junta o próximo bloco
+                bloco = arquivo.read(tamanho_bloco)
+                buffer, posicao, fim = buffer[posicao:] + bloco, 0, not bloco
+                continue
+            yield registro
+
+
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta os holerites da folha de pagamento para PDF.")
+    parser.add_argument("registros", help="Arquivo JSON (lista de holerites) ou JSON Lines (um por linha).")
+    parser.add_argument("destino", help="PDF de saída ou, com --por-funcionario, pasta de saída.")
+    parser.add_argument("--por-funcionario", action="store_true", help="Gera um PDF por funcionário.")
+    parser.add_argument("--arranjo", default="horizontal", choices=sorted(ARRANJOS),
+                        help="Disposição do holerite na folha A4 (padrão: horizontal).")
+    parser.add_argument("--limite-memoria", type=float, default=LIMITE_MEMORIA_MB,
+                        help=f"Teto do RSS do processo, em MB (padrão {LIMITE_MEMORIA_MB}; 0 apenas mede).")
+    opcoes = parser.parse_args(argumentos)
+
+    try:
+        relatorio = exportar_pdf(ler_registros(opcoes.registros), opcoes.destino, opcoes.por_funcionario, opcoes.arranjo,
+                                 opcoes.limite_memoria)
+    except MemoryError as erro:
+        print(f"⚠️ Exportação interrompida: {erro}")
+        return 1
+    print(f"✅ {relatorio['holerites']} holerite(s), {relatorio['paginas']} página(s) em {relatorio['arquivos']} "
+          f"arquivo(s) - {relatorio['segundos']:.1f} s - pico de memória {relatorio['pico_rss_mb']:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -15,6 +15,8 @@ from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QColor, QPalette, QIcon, QFont
 from datetime import datetime
 from src.utils import aplicar_escalonamento_dpi  # Importa a função de escalonamento
+from src.dinheiro import Dinheiro
+from src.lancamentos import LivroLancamentos
 
 
 def criar_formulario(app_ref):
@@ -24,9 +26,6 @@ def criar_formulario(app_ref):
     """
     fator_escala = app_ref.fator_escala  # Obtém o fator de escala da aplicação principal
 
-    global lista_descontos_espelho
-    global lista_descontos
-
     # Definir o caminho do ícone da impressora
     base_dir = os.path.abspath(os.path.dirname(__file__))  # Caminho absoluto seguro
     icon_print_path = os.path.join(base_dir, "assets", "templates", "img_printer.png")
@@ -268,10 +267,7 @@ def criar_formulario(app_ref):
     lista_descontos.setFixedHeight(int(100 * fator_escala))  # altura
     #lista_descontos.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Sempre mostra a barra
     #lista_descontos.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)  # Rolagem suave
-    lista_descontos_espelho = []
-    total_vencimentos_var = 0.0  # Variável para armazenar o total de vencimentos
-    total_descontos_var = 0.0  # Variável para armazenar o total de descontos
-    total_liquido_var = 0.0  # Variável para armazenar o total líquido
+    lancamentos = LivroLancamentos()  # Lançamentos e totais (atualizados a cada inclusão/remoção)
 
     lista_descontos_layout = QVBoxLayout()
     limpar_lista_button = QPushButton("Limpar Lista")
@@ -285,13 +281,8 @@ def criar_formulario(app_ref):
     #limpar_lista_button.setPalette(palette)
 
     def limpar_lista():
-        nonlocal total_descontos_var, total_liquido_var, total_vencimentos_var
         lista_descontos.clear()
-        lista_descontos_espelho.clear()
-        atualizar_ui()  # Notifica que a lista mudou
-        total_vencimentos_var = 0.0
-        total_descontos_var = 0.0  # Resetar total de descontos ao limpar lista
-        total_liquido_var = 0.0  # Resetar total líquido
+        lancamentos.limpar()  # Zera os totais junto com a lista
         # Emitir o sinal para atualizar os cálculos no `ui.py`
         app_ref.sinal_atualizar_calculos.emit()
 
@@ -378,15 +369,9 @@ def criar_formulario(app_ref):
 
     # Função para adicionar desconto
     def adicionar_desconto():
-        nonlocal total_descontos_var, total_liquido_var, total_vencimentos_var
-
-        # Verificar se o limite de 15 itens já foi atingido
-        if lista_descontos.count() >= 15:
-            QMessageBox.warning(None, "Limite atingido", "O número máximo de descontos/vencimentos permitidos é 15.")
-            return  # Impede a adição de mais itens
-
-        desconto = descontos_input.text().replace('.', '').replace(',', '.')
-        vencimento = vencimentos_input.text().replace('.', '').replace(',', '.')
+        # Sem limite de itens: o que não couber no modelo vai para páginas de continuação
+        desconto = descontos_input.text().strip()
+        vencimento = vencimentos_input.text().strip()
         descricao = descricao_desconto_input.text()
         codigo = codigo_desconto_input.value()
 
@@ -396,8 +381,8 @@ def criar_formulario(app_ref):
             return
 
         try:
-            desconto_valor = float(desconto) if desconto else 0.0
-            vencimento_valor = float(vencimento) if vencimento else 0.0
+            desconto_valor = Dinheiro.de_texto(desconto)
+            vencimento_valor = Dinheiro.de_texto(vencimento)
         except ValueError:
             QMessageBox.warning(None, "Erro", "Os valores de desconto e vencimento devem ser numéricos!")
             return
@@ -405,11 +390,9 @@ def criar_formulario(app_ref):
         # Construção dinâmica da string
         item_text = ""
         if desconto_valor > 0:
-            item_text += f" Desconto: {desconto_valor:.2f} |"
-            total_descontos_var += desconto_valor
+            item_text += f" Desconto: {desconto_valor.formatar(milhar=False, separador='.')} |"
         if vencimento_valor > 0:
-            item_text += f" Vencimento: {vencimento_valor:.2f} |"
-            total_vencimentos_var += vencimento_valor
+            item_text += f" Vencimento: {vencimento_valor.formatar(milhar=False, separador='.')} |"
 
         item_text += f" Descrição: {descricao} | Código: {codigo if codigo != 0 else ' '}"
 
@@ -423,17 +406,15 @@ def criar_formulario(app_ref):
         remover_button.setFixedWidth(int(20 * fator_escala))  # largura
         remover_button.setFixedHeight(int(18 * fator_escala))  # altura
 
+        # Os valores ficam no livro de lançamentos; a lista guarda apenas o identificador
+        id_lancamento = lancamentos.adicionar(desconto_valor, vencimento_valor, descricao,
+                                              codigo if codigo != 0 else "")
+
         def remover_item():
-            nonlocal total_descontos_var, total_liquido_var, total_vencimentos_var
             for i in range(lista_descontos.count()):
                 if lista_descontos.itemWidget(lista_descontos.item(i)) == item_widget:
                     lista_descontos.takeItem(i)
-                    del lista_descontos_espelho[i]
-                    atualizar_ui()
-                    if desconto_valor > 0:
-                        total_descontos_var -= desconto_valor
-                    if vencimento_valor > 0:
-                        total_vencimentos_var -= vencimento_valor
+                    lancamentos.remover(id_lancamento)
                     app_ref.sinal_atualizar_calculos.emit()
                     break
 
@@ -444,26 +425,11 @@ def criar_formulario(app_ref):
         item_widget.setLayout(item_layout)
 
         item = QListWidgetItem()
-        item.setData(Qt.UserRole, {"desconto": desconto_valor, "vencimento": vencimento_valor})
+        item.setData(Qt.UserRole, id_lancamento)
         lista_descontos.addItem(item)
         lista_descontos.setItemWidget(item, item_widget)
 
-        # Adicionar à lista espelho
-        lista_descontos_espelho.append(item_text)
-        atualizar_ui()
-
-        # Atualizar valores exibidos
-        try:
-            salario = float(salario_input.text().replace('.', '').replace(',', '.')) if salario_input.text() else 0.0
-            total_liquido_var = salario + total_vencimentos_var - total_descontos_var
-            valor_liquido_value.setText(f"{total_liquido_var:.2f}".replace('.', ','))
-        except ValueError:
-            valor_liquido_value.setText("0,00")
-
-        total_descontos_value.setText(f"{total_descontos_var:.2f}".replace('.', ','))
-        total_vencimentos_value.setText(f"{total_vencimentos_var:.2f}".replace('.', ','))
-
-        # Limpar campos
+        # Limpar campos (os totais exibidos são atualizados pelo sinal, a partir do livro)
         descontos_input.clear()
         vencimentos_input.clear()
         descricao_desconto_input.clear()
@@ -603,12 +569,7 @@ def criar_formulario(app_ref):
 
     # Atualização automática do valor líquido
     def atualizar_valor_liquido():
-        try:
-            salario = float(salario_input.text().replace(',', '.')) if salario_input.text() else 0.0
-            total_liquido_var = salario - total_descontos_var
-            valor_liquido_value.setText(f"{total_liquido_var:.2f}".replace('.', ','))
-        except ValueError:
-            valor_liquido_value.setText("0,00")
+        valor_liquido_value.setText(lancamentos.totais()["valor_liquido"].formatar(milhar=False))
 
     # Conectar eventos
     #salario_input.textChanged.connect(atualizar_valor_liquido)
@@ -616,9 +577,9 @@ def criar_formulario(app_ref):
 
     # Integração para atualizações dinâmicas
     def atualizar_totais_interface(vencimentos, descontos, liquido):
-        total_vencimentos_value.setText(f"{vencimentos:.2f}".replace('.', ','))
-        total_descontos_value.setText(f"{descontos:.2f}".replace('.', ','))
-        valor_liquido_value.setText(f"{liquido:.2f}".replace('.', ','))
+        total_vencimentos_value.setText(Dinheiro.de_reais(vencimentos).formatar(milhar=False))
+        total_descontos_value.setText(Dinheiro.de_reais(descontos).formatar(milhar=False))
+        valor_liquido_value.setText(Dinheiro.de_reais(liquido).formatar(milhar=False))
 
     # Após adicionar todos os elementos, ajusta o tamanho manualmente
     #ajustar_tamanho_manual(form_layout)
@@ -643,10 +604,7 @@ def criar_formulario(app_ref):
         "descricao_desconto_input": descricao_desconto_input,
         "codigo_desconto_input": codigo_desconto_input,
         "lista_descontos": lista_descontos,
-        "lista_descontos_espelho": lista_descontos_espelho,
-        "atualizar_ui": atualizar_ui,  # Adiciona a função de atualização ao retorno
-        "total_descontos_var": total_descontos_var,
-        "total_liquido_var": total_liquido_var,
+        "lancamentos": lancamentos,
         "sal_contr_inss_input": sal_contr_inss_input,
         "base_fgts_input": base_fgts_input,
         "valor_fgts_input": valor_fgts_input,
@@ -667,14 +625,4 @@ def criar_formulario(app_ref):
     }
 
 
-def atualizar_ui():
-    global lista_descontos_espelho, lista_descontos
-
-    # Se a lista de descontos principal estiver vazia, esvaziar a lista espelho também
-    if lista_descontos.count() == 0:
-        lista_descontos_espelho.clear()
-
-    return lista_descontos_espelho  # Retorna a lista espelho sempre atualizada
-
-
 # Developed by Raphael Soares dos Santos - Payslip Generator
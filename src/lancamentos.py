@@ -0,0 +1,163 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# lancamentos.py
+from typing import Callable, Dict, Iterator, List, Optional
+from src.dinheiro import Dinheiro
+
+
+class LivroLancamentos:
+    """
+    Livro com os descontos/vencimentos do holerite e seus totais.
+    Os totais são atualizados a cada inclusão, alteração ou remoção (O(1)),
+    sem percorrer a lista; o formulário, o desenho do holerite e o cálculo
+    em lote leem todos deste mesmo objeto.
+    """
+
+    def __init__(self):
+        self._lancamentos: Dict[int, Dict] = {}  # dict mantém a ordem de inclusão
+        self._proximo_id = 1
+        self._total_descontos = 0
+        self._total_vencimentos = 0
+        self._salario_base = 0
+        self._ao_alterar: List[Callable[[], None]] = []
+
+    # ------------------------------------------------------------------ alterações
+
+    def adicionar(self, desconto: Dinheiro = None, vencimento: Dinheiro = None,
+                  descricao: str = "", codigo="") -> int:
+        """
+        Inclui um lançamento e atualiza os totais.
+        :param desconto: Valor do desconto (opcional).
+        :param vencimento: Valor do vencimento (opcional).
+        :param descricao: Descrição exibida no holerite.
+        :param codigo: Código da rubrica.
+        :return: Identificador do lançamento, usado para editar ou remover.
+        """
+        desconto = desconto or Dinheiro()
+        vencimento = vencimento or Dinheiro()
+        identificador = self._proximo_id
+        self._proximo_id += 1
+        self._lancamentos[identificador] = {
+            "codigo": codigo,
+            "descricao": descricao,
+            "desconto": desconto,
+            "vencimento": vencimento,
+        }
+        self._total_descontos += desconto.centavos
+        self._total_vencimentos += vencimento.centavos
+        self._notificar()
+        return identificador
+
+    def remover(self, identificador: int):
+        """
+        Remove um lançamento e desconta seus valores dos totais.
+        :param identificador: Identificador retornado por `adicionar`.
+        """
+        lancamento = self._lancamentos.pop(identificador, None)
+        if lancamento is None:
+            return
+        self._total_descontos -= lancamento["desconto"].centavos
+        self._total_vencimentos -= lancamento["vencimento"].centavos
+        self._notificar()
+
+    def editar(self, identificador: int, desconto: Optional[Dinheiro] = None,
+               vencimento: Optional[Dinheiro] = None, descricao: Optional[str] = None, codigo=None):
+        """
+        Altera os campos informados de um lançamento, ajustando os totais pela diferença.
+        :param identificador: Identificador retornado por `adicionar`.
+        """
+        lancamento = self._lancamentos[identificador]
+        if desconto is not None:
+            self._total_descontos += desconto.centavos - lancamento["desconto"].centavos
+            lancamento["desconto"] = desconto
+        if vencimento is not None:
+            self._total_vencimentos += vencimento.centavos - lancamento["vencimento"].centavos
+            lancamento["vencimento"] = vencimento
+        if descricao is not None:
+            lancamento["descricao"] = descricao
+        if codigo is not None:
+            lancamento["codigo"] = codigo
+        self._notificar()
+
+    def limpar(self):
+        """Remove todos os lançamentos e zera os totais (o salário base é mantido)."""
+        self._lancamentos.clear()
+        self._total_descontos = 0
+        self._total_vencimentos = 0
+        self._notificar()
+
+    def definir_salario(self, salario_base: Dinheiro):
+        """
+        Guarda o salário base já interpretado, para que os totais não releiam o texto do formulário.
+        :param salario_base: Salário base do funcionário.
+        """
+        if salario_base.centavos != self._salario_base:
+            self._salario_base = salario_base.centavos
+            self._notificar()
+
+    def ao_alterar(self, callback: Callable[[], None]):
+        """
+        Registra uma função chamada após qualquer alteração no livro.
+        :param callback: Função sem argumentos.
+        """
+        self._ao_alterar.append(callback)
+
+    def _notificar(self):
+        for callback in self._ao_alterar:
+            callback()
+
+    # ------------------------------------------------------------------ leitura
+
+    @property
+    def salario_base(self) -> Dinheiro:
+        return Dinheiro(self._salario_base)
+
+    @property
+    def total_descontos(self) -> Dinheiro:
+        return Dinheiro(self._total_descontos)
+
+    @property
+    def total_vencimentos(self) -> Dinheiro:
+        return Dinheiro(self._total_vencimentos)
+
+    def totais(self) -> Dict[str, Dinheiro]:
+        """
+        Retorna os totais do holerite no mesmo formato de `atualizar_totais`.
+        :return: Dicionário com total_vencimentos (salário + vencimentos), total_descontos e valor_liquido.
+        """
+        total_vencimentos = self._salario_base + self._total_vencimentos
+        return {
+            "total_vencimentos": Dinheiro(total_vencimentos),
+            "total_descontos": Dinheiro(self._total_descontos),
+            "valor_liquido": Dinheiro(total_vencimentos - self._total_descontos)
+        }
+
+    def itens(self) -> List[Dict[str, str]]:
+        """
+        Retorna os lançamentos formatados para exibição no holerite
+        (mesmas chaves de `HoleriteDesign.obter_itens_lancamentos`; valores zerados ficam vazios).
+        """
+        return [
+            {
+                "codigo": lancamento["codigo"],
+                "descricao": lancamento["descricao"],
+                "desconto": lancamento["desconto"].formatar() if lancamento["desconto"] else "",
+                "vencimento": lancamento["vencimento"].formatar() if lancamento["vencimento"] else "",
+            }
+            for lancamento in self._lancamentos.values()
+        ]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._lancamentos.values())
+
+    def __len__(self) -> int:
+        return len(self._lancamentos)
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -6,162 +6,376 @@
 ============================================================
 """
 
+# pdf_generator.py
+# Uso: python -m src.pdf_generator holerites.json pasta_saida [--arranjo quadruplo|duplicado] [--sem-marcas]
 import os
 os.environ["QT_API"] = "PyQt5"
 import sys
-from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QWidget
-from PyQt5.QtGui import QPixmap, QPainter
-from PyQt5.QtCore import Qt, QSize
+import json
+import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter, QPen, QPixmap
+from PyQt5.QtCore import Qt, QRect, QSize
 from src.utils import obter_pasta_temp
+from src.renderizador import (DadosHolerite, LayoutHolerite, carregar_layout, carregar_template, garantir_aplicacao,
+                              paginar_holerite, renderizar_holerite)
 
 
-class FolhaA4Viewer(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Visualização da Folha A4")
-        self.setAttribute(Qt.WA_DontShowOnScreen)
+class ArranjoFolha:
+    """
+    Posição dos holerites em uma folha A4 (em pixels da imagem da folha).
+    """
+
+    __slots__ = ("nome", "tamanho", "escala", "posicoes")
 
+    def __init__(self, nome: str, tamanho, escala: float, posicoes):
+        """
+        :param nome: Nome do arranjo (usado no nome do arquivo: holerite_{nome}.png).
+        :param tamanho: Largura e altura da folha.
+        :param escala: Escala do holerite sobre a caixa base de 700x550.
+        :param posicoes: Canto superior esquerdo de cada cópia do holerite na folha.
         """
-        if not os.path.exists(self.preview_path):
-            print("A imagem 'holerite_preview.png' não foi encontrada. Encerrando o programa.")
-           # sys.exit()"""
+        self.nome = nome
+        self.tamanho = tuple(tamanho)
+        self.escala = escala
+        self.posicoes = tuple(tuple(posicao) for posicao in posicoes)
+
+    def tamanho_holerite(self) -> QSize:
+        """Caixa onde o holerite é encaixado (mantendo a proporção)."""
+        return QSize(int(700 * self.escala), int(550 * self.escala))
+
+
+# Folha A4 retrato (1700x2400) ou paisagem (2400x1700)
+ARRANJOS: Dict[str, ArranjoFolha] = {
+    "duplicado": ArranjoFolha("duplicado", (1700, 2400), 2.20, ((75, 190), (75, 1250))),
+    "vertical": ArranjoFolha("vertical", (1700, 2400), 2.20, ((75, 720),)),
+    "horizontal": ArranjoFolha("horizontal", (2400, 1700), 3.20, ((80, 145),)),
+    # Quatro holerites (1120x711) em duas linhas e duas colunas, folha paisagem
+    "quadruplo": ArranjoFolha("quadruplo", (2400, 1700), 1.60, ((53, 92), (1227, 92), (53, 895), (1227, 895))),
+}
+
+TAMANHO_MARCA = 20  # Comprimento das marcas de corte, em pixels da folha
+AFASTAMENTO_MARCA = 6  # Distância entre a marca de corte e a borda do holerite
+
+
+def _arranjo(arranjo: Union[str, ArranjoFolha]) -> ArranjoFolha:
+    if isinstance(arranjo, ArranjoFolha):
+        return arranjo
+    try:
+        return ARRANJOS[arranjo]
+    except KeyError:
+        raise ValueError(f"Arranjo de folha desconhecido: {arranjo}") from None
+
+
+def redimensionar_holerite(holerite: QImage, arranjo: Union[str, ArranjoFolha]) -> QImage:
+    """
+    Redimensiona o holerite para a caixa do arranjo (mantendo a proporção).
+    :param holerite: Imagem do holerite (QImage ou QPixmap).
+    :param arranjo: Nome do arranjo ou ArranjoFolha.
+    :return: QImage redimensionada.
+    """
+    if isinstance(holerite, QPixmap):
+        holerite = holerite.toImage()
+    return holerite.scaled(_arranjo(arranjo).tamanho_holerite(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def compor_folha(holerite: QImage, arranjo: Union[str, ArranjoFolha] = "duplicado",
+                 redimensionado: Optional[QImage] = None) -> QImage:
+    """
+    Monta a folha A4 em memória: fundo branco e uma cópia do holerite em cada posição do arranjo.
+    :param holerite: Imagem do holerite no tamanho original (QImage ou QPixmap).
+    :param arranjo: Nome do arranjo ("duplicado", "vertical", "horizontal") ou ArranjoFolha.
+    :param redimensionado: Holerite já redimensionado para o arranjo (evita redimensionar de novo).
+    :return: QImage da folha.
+    """
+    arranjo = _arranjo(arranjo)
+    if redimensionado is None:
+        redimensionado = redimensionar_holerite(holerite, arranjo)
+
+    folha = QImage(arranjo.tamanho[0], arranjo.tamanho[1], QImage.Format_RGB32)
+    folha.fill(Qt.white)
+    painter = QPainter(folha)
+    for x, y in arranjo.posicoes:
+        painter.drawImage(x, y, redimensionado)
+    painter.end()
+    return folha
+
+
+def compor_folhas(holerite: QImage, arranjos: Iterable[Union[str, ArranjoFolha]] = tuple(ARRANJOS)) -> Dict[str, QImage]:
+    """
+    Monta várias folhas a partir do mesmo holerite; arranjos com a mesma escala
+    compartilham o holerite redimensionado.
+    :return: Dicionário nome do arranjo -> QImage da folha.
+    """
+    redimensionados = {}
+    folhas = {}
+    for arranjo in map(_arranjo, arranjos):
+        chave = (arranjo.tamanho_holerite().width(), arranjo.tamanho_holerite().height())
+        if chave not in redimensionados:
+            redimensionados[chave] = redimensionar_holerite(holerite, arranjo)
+        folhas[arranjo.nome] = compor_folha(holerite, arranjo, redimensionados[chave])
+    return folhas
+
+
+def desenhar_marcas_corte(painter: QPainter, retangulo: QRect):
+    """
+    Desenha as marcas de corte nos quatro cantos do retângulo, do lado de fora
+    (as marcas não invadem o holerite nem o espaço entre dois holerites vizinhos).
+    """
+    esquerda, topo = retangulo.left(), retangulo.top()
+    direita, base = esquerda + retangulo.width(), topo + retangulo.height()
+    inicio, fim = AFASTAMENTO_MARCA, AFASTAMENTO_MARCA + TAMANHO_MARCA
+    for x, sentido_x in ((esquerda, -1), (direita, 1)):
+        for y, sentido_y in ((topo, -1), (base, 1)):
+            painter.drawLine(x + sentido_x * inicio, y, x + sentido_x * fim, y)
+            painter.drawLine(x, y + sentido_y * inicio, x, y + sentido_y * fim)
+
+
+def impor_lote(registros: Iterable[Union[DadosHolerite, Dict]], arranjo: Union[str, ArranjoFolha] = "quadruplo",
+               marcas_corte: bool = True, layout: Optional[LayoutHolerite] = None) -> Iterator[QImage]:
+    """
+    Distribui os holerites da folha de pagamento pelas posições do arranjo, um funcionário
+    diferente em cada posição. Os registros são consumidos aos poucos: só a folha A4 em
+    montagem fica na memória, e o tempo cresce de forma linear com a quantidade.
+    Páginas de continuação de um holerite ocupam as posições seguintes.
+    :param registros: DadosHolerite ou dicionários no formato de `para_dicionario`.
+    :param arranjo: Nome do arranjo ("duplicado" = 2 por folha, "quadruplo" = 4 por folha) ou ArranjoFolha.
+    :param marcas_corte: Desenha marcas de corte em volta de cada holerite.
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: Gerador com a QImage de cada folha A4 (a última pode ter posições vazias).
+    """
+    garantir_aplicacao()
+    arranjo = _arranjo(arranjo)
+    layout = layout or carregar_layout()
+    template = carregar_template(layout.caminho_template, layout.tamanho_template)
+    paginas = (pagina
+               for registro in registros
+               for pagina in paginar_holerite(registro if isinstance(registro, DadosHolerite)
+                                              else DadosHolerite(**registro), layout))
+    while True:
+        grupo = list(islice(paginas, len(arranjo.posicoes)))
+        if not grupo:
+            return
+        folha = QImage(arranjo.tamanho[0], arranjo.tamanho[1], QImage.Format_RGB32)
+        folha.fill(Qt.white)
+        painter = QPainter(folha)
+        painter.setPen(QPen(Qt.black, 1))
+        for (x, y), dados in zip(arranjo.posicoes, grupo):
+            holerite = redimensionar_holerite(renderizar_holerite(dados, template, layout), arranjo)
+            painter.drawImage(x, y, holerite)
+            if marcas_corte:
+                desenhar_marcas_corte(painter, QRect(x, y, holerite.width(), holerite.height()))
+        painter.end()
+        yield folha
+
+
+def salvar_lote(registros: Iterable[Union[DadosHolerite, Dict]], pasta_saida: str,
+                arranjo: Union[str, ArranjoFolha] = "quadruplo", marcas_corte: bool = True,
+                nome_arquivo: str = "folha_{indice:05d}.png", layout: Optional[LayoutHolerite] = None) -> Iterator[str]:
+    """
+    Monta (com `impor_lote`) e salva cada folha A4 assim que fica pronta.
+    :param nome_arquivo: Modelo do nome do arquivo; recebe `indice` (1, 2, 3...).
+    :return: Gerador com o caminho de cada folha salva.
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    for indice, folha in enumerate(impor_lote(registros, arranjo, marcas_corte, layout), start=1):
+        caminho = os.path.join(pasta_saida, nome_arquivo.format(indice=indice))
+        if not folha.save(caminho):
+            raise OSError(f"Não foi possível salvar a imagem em {caminho}")
+        yield caminho
+
+
+def salvar_folha(folha: QImage, nome: str, pasta: Optional[str] = None) -> str:
+    """
+    Salva a folha como holerite_{nome}.png (por padrão na pasta temporária).
+    :return: Caminho do arquivo salvo.
+    """
+    pasta = pasta or obter_pasta_temp()
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"holerite_{nome}.png")
+    if not folha.save(caminho, "PNG"):
+        raise OSError(f"Não foi possível salvar a imagem em {caminho}")
+    return caminho
+
+
+class FolhaA4Viewer:
+    """
+    Gera as folhas A4 (duplicado, vertical, horizontal) do holerite atual.
+    As folhas são montadas em memória com QPainter e gravadas só quando pedidas, uma de cada vez,
+    em uma thread de apoio. Cada folha pronta fica associada à impressão digital dos dados do
+    holerite e é reaproveitada enquanto os dados não mudarem. Um holerite com páginas de
+    continuação (veja `paginar_holerite`) gera uma folha por página em cada arranjo.
+    """
 
-        self.label_folha = QLabel(self)
-        self.label_folha.setAlignment(Qt.AlignCenter)
-        self.setCentralWidget(self.label_folha)
+    def __init__(self):
+        self.holerite = None  # QImage(s) do holerite (ou função que as desenha); sem elas, lê holerite_preview.png
+        self.impressao = None  # Impressão digital dos dados do holerite atual (None: sempre gera de novo)
+        self.preview_path = os.path.join(obter_pasta_temp(), "holerite_preview.png")
+        self._folhas = {}  # (arranjo, página) -> (impressão digital, Future com o caminho da folha)
+        self.folhas_geradas = 0
+        self.folhas_reaproveitadas = 0
+        # Um único trabalhador: as folhas são gravadas na ordem em que foram pedidas
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="folhas_a4")
+
+    def definir_holerite(self, holerite: Union[QImage, QPixmap, List[QImage], Callable, None],
+                         impressao: Optional[str] = None) -> bool:
+        """
+        Define o holerite usado nas próximas folhas.
+        :param holerite: QImage, QPixmap, lista com uma QImage por página, função que desenha o
+                         holerite (chamada só se preciso) ou None (volta a ler holerite_preview.png).
+        :param impressao: Impressão digital dos dados; se for a mesma do holerite atual, as folhas já
+                          geradas continuam valendo.
+        :return: True se o holerite mudou.
+        """
+        if impressao is not None and impressao == self.impressao:
+            return False
+        for _, futuro in self._folhas.values():
+            futuro.cancel()  # Folhas ainda na fila, de dados antigos, não são mais necessárias
+        self._folhas = {}
+        self.holerite = holerite
+        self.impressao = impressao
+        return True
+
+    def _paginas_holerite(self) -> Optional[List[QImage]]:
+        holerite = self.holerite
+        if callable(holerite):
+            holerite = self.holerite = holerite()  # Desenhado uma única vez, no primeiro pedido de folha
+        if holerite is None:
+            holerite = QImage(self.preview_path)
+        paginas = [pagina.toImage() if isinstance(pagina, QPixmap) else pagina
+                   for pagina in (holerite if isinstance(holerite, (list, tuple)) else [holerite])]
+        if not paginas or any(pagina.isNull() for pagina in paginas):
+            print("Erro ao carregar a imagem do holerite")
+            return None
+        if self.holerite is not None:
+            self.holerite = paginas
+        return paginas
+
+    def _imagem_holerite(self, pagina: int = 1) -> Optional[QImage]:
+        paginas = self._paginas_holerite()
+        return None if paginas is None else paginas[pagina - 1]
+
+    @property
+    def total_paginas(self) -> int:
+        """Quantidade de páginas do holerite atual (1 se não houver continuação)."""
+        paginas = self._paginas_holerite()
+        return len(paginas) if paginas else 1
+
+    def compor(self, nome: str, pagina: int = 1) -> Optional[QImage]:
+        """
+        Monta uma folha do holerite atual sem gravá-la.
+        :param nome: Nome do arranjo ("duplicado", "vertical", "horizontal").
+        :param pagina: Página do holerite (1 é a primeira).
+        :return: QImage da folha, ou None se não houver imagem do holerite.
+        """
+        holerite = self._imagem_holerite(pagina)
+        return None if holerite is None else compor_folha(holerite, nome)
 
-        #self.posicao_holerite_duplicado()
-        #self.posicao_holerite_horizontal()
-        #self.posicao_holerite_vertical()
+    def compor_paginas(self, nome: str) -> Optional[List[QImage]]:
+        """
+        Monta as folhas de todas as páginas do holerite atual, sem gravá-las.
+        :param nome: Nome do arranjo ("duplicado", "vertical", "horizontal").
+        :return: Uma QImage por página, ou None se não houver imagem do holerite.
+        """
+        paginas = self._paginas_holerite()
+        return None if paginas is None else [compor_folha(holerite, nome) for holerite in paginas]
+
+    def _gerar(self, holerite: QImage, nome: str, pasta: str, pagina: int = 1) -> str:
+        """Executado na thread de apoio: só QImage/QPainter, sem widgets."""
+        # A primeira página mantém o nome de sempre (holerite_{nome}.png)
+        arquivo = nome if pagina == 1 else f"{nome}_pagina{pagina}"
+        save_path = salvar_folha(compor_folha(holerite, nome), arquivo, pasta)
+        print(f"Imagem do 'holerite_{arquivo}' salva em: {save_path}")
+        return save_path
+
+    def _pedir(self, nome: str, pagina: int = 1) -> Optional[Future]:
+        _arranjo(nome)
+        memorizada = self._folhas.get((nome, pagina))
+        if memorizada and self.impressao is not None and memorizada[0] == self.impressao \
+                and not memorizada[1].cancelled():
+            self.folhas_reaproveitadas += 1
+            return memorizada[1]
+        holerite = self._imagem_holerite(pagina)
+        if holerite is None:
+            return None
+        futuro = self._executor.submit(self._gerar, holerite, nome, os.path.dirname(self.preview_path), pagina)
+        self._folhas[(nome, pagina)] = (self.impressao, futuro)
+        self.folhas_geradas += 1
+        return futuro
+
+    def preparar(self, nomes: Iterable[str] = tuple(ARRANJOS)):
+        """Agenda em segundo plano as folhas (de todas as páginas) que ainda não estão prontas."""
+        for nome in nomes:
+            for pagina in range(1, self.total_paginas + 1):
+                self._pedir(nome, pagina)
+
+    def folha(self, nome: str, pagina: int = 1) -> Optional[str]:
+        """
+        Retorna o caminho da folha pronta para o holerite atual, gerando-a agora se preciso
+        (ou aguardando a geração em segundo plano já iniciada).
+        :param nome: Nome do arranjo ("duplicado", "vertical", "horizontal").
+        :param pagina: Página do holerite (1 é a primeira).
+        :return: Caminho de holerite_{nome}.png (holerite_{nome}_pagina{n}.png nas continuações),
+                 ou None se não houver imagem do holerite.
+        """
+        futuro = self._pedir(nome, pagina)
+        return None if futuro is None else futuro.result()
 
+    def folhas(self, nome: str) -> List[str]:
+        """
+        Retorna os caminhos das folhas de todas as páginas do holerite atual, na ordem.
+        :param nome: Nome do arranjo ("duplicado", "vertical", "horizontal").
+        :return: Lista de caminhos (vazia se não houver imagem do holerite).
+        """
+        futuros = [self._pedir(nome, pagina) for pagina in range(1, self.total_paginas + 1)]
+        return [futuro.result() for futuro in futuros if futuro is not None]
 
     def posicao_holerite_duplicado(self):
         """
         Posiciona dois holerites dentro da folha A4.
         """
-        # Obtém o caminho correto da pasta temporária
-        temp_dir = obter_pasta_temp()
-        # Caminho atualizado para a imagem salva na pasta TEMP
-        self.preview_path = os.path.join(temp_dir, "holerite_preview.png")
-
-        # Define o fundo branco
-        self.setGeometry(100, 100, 1700, 2400)
-        self.setStyleSheet("background-color: white;")
-
-        preview_pixmap = QPixmap(self.preview_path)
-        if preview_pixmap.isNull():
-            print("Erro ao carregar 'holerite_preview.png'")
-            return
-
-        # Define a escala e configura o tamanho da visualização
-        escala = 2.20
-        holerite_size = QSize(int(700 * escala), int(550 * escala))
-
-        # Exibe o primeiro holerite no topo da página
-        self.label_top = QLabel(self)
-        self.label_top.setPixmap(preview_pixmap.scaled(holerite_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.label_top.resize(self.label_top.pixmap().size())
-        self.label_top.move(75, 190)
-        self.label_top.show()
-
-        # Exibe o segundo holerite na parte inferior da página
-        self.label_bottom = QLabel(self)
-        self.label_bottom.setPixmap(preview_pixmap.scaled(holerite_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.label_bottom.resize(self.label_bottom.pixmap().size())
-        self.label_bottom.move(75, 1250)
-        self.label_bottom.show()
-
-        # Salva a imagem individualmente e reinicia a interface
-        self.salvar_imagem_individual("duplicado")
-        self.restart_viewer()  # Reinicia a interface antes da próxima função
-
+        return self.folha("duplicado")
 
     def posicao_holerite_vertical(self):
         """
         Posiciona um único holerite no centro da folha A4.
         """
-        # Obtém o caminho correto da pasta temporária
-        temp_dir = obter_pasta_temp()
-        # Caminho atualizado para a imagem salva na pasta TEMP
-        self.preview_path = os.path.join(temp_dir, "holerite_preview.png")
-
-        # Define o fundo branco
-        self.setGeometry(100, 100, 1700, 2400)
-        self.setStyleSheet("background-color: white;")
-
-        preview_pixmap = QPixmap(self.preview_path)
-        if preview_pixmap.isNull():
-            print("Erro ao carregar 'holerite_preview.png'")
-            return
-
-        # Define a escala e configura o tamanho da visualização
-        escala = 2.20
-        holerite_size = QSize(int(700 * escala), int(550 * escala))
-
-        self.label_single = QLabel(self)
-        self.label_single.setPixmap(preview_pixmap.scaled(holerite_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.label_single.resize(self.label_single.pixmap().size())
-        self.label_single.move(75, 720)
-        self.label_single.show()
-
-        # Salva a imagem individualmente e reinicia a interface
-        self.salvar_imagem_individual("vertical")
-        self.restart_viewer()  # Reinicia a interface antes da próxima função
-
+        return self.folha("vertical")
 
     def posicao_holerite_horizontal(self):
         """
         Configura a posição horizontal da pré-visualização do holerite.
         """
-        # Obtém o caminho correto da pasta temporária
-        temp_dir = obter_pasta_temp()
-        # Caminho atualizado para a imagem salva na pasta TEMP
-        self.preview_path = os.path.join(temp_dir, "holerite_preview.png")
-
-        # Define o fundo branco
-        self.setGeometry(100, 100, 2400, 1700)
-        self.setStyleSheet("background-color: white;")
-
-        preview_pixmap = QPixmap(self.preview_path)
-        if preview_pixmap.isNull():
-            print("Erro ao carregar 'holerite_preview.png'")
-            return
-
-        # Define a escala e configura o tamanho da visualização
-        escala = 3.20
-        holerite_size = QSize(int(700 * escala), int(550 * escala))
-
-        self.label_single = QLabel(self)
-        self.label_single.setPixmap(preview_pixmap.scaled(holerite_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.label_single.resize(self.label_single.pixmap().size())
-        self.label_single.move(80, 145)
-        self.label_single.show()
-
-        # Salva a imagem individualmente e reinicia a interface
-        self.salvar_imagem_individual("horizontal")
-        self.restart_viewer()  # Reinicia a interface antes da próxima função
+        return self.folha("horizontal")
 
+    def salvar_imagem_individual(self, nome):
+        """Garante a folha com o nome fornecido salva como holerite_{nome}.png na pasta temporária."""
+        return self.folha(nome)
 
-    def restart_viewer(self):
-        """Fecha e reabre a janela para resetar totalmente o estado gráfico."""
-        self.close()  # Fecha a interface para limpar memória
-        self.__init__()  # Reinicia a classe do zero
 
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Monta folhas A4 com vários holerites (um funcionário por posição).")
+    parser.add_argument("registros", help="Arquivo JSON com a lista de holerites.")
+    parser.add_argument("pasta_saida", help="Pasta onde as folhas serão salvas.")
+    parser.add_argument("--arranjo", default="quadruplo", choices=sorted(ARRANJOS),
+                        help="Disposição dos holerites na folha (padrão: quadruplo, 4 por folha).")
+    parser.add_argument("--sem-marcas", action="store_true", help="Não desenha as marcas de corte.")
+    opcoes = parser.parse_args(argumentos)
 
-    def salvar_imagem_individual(self, nome):
-        """Salva a imagem atual com o nome fornecido."""
-        pixmap = QPixmap(self.size())  # Captura a interface atual
-        self.render(pixmap)  # Renderiza a interface em um QPixmap
-        save_path = os.path.join(os.path.dirname(self.preview_path), f"holerite_{nome}.png")
-        pixmap.save(save_path, "PNG")
-        print(f"Imagem do 'holerite_{nome}' salva em: {save_path}")
+    with open(opcoes.registros, "r", encoding="utf-8") as arquivo:
+        registros = json.load(arquivo)
+    if isinstance(registros, dict):
+        registros = [registros]
+    quantidade = sum(1 for _ in salvar_lote(registros, opcoes.pasta_saida, opcoes.arranjo, not opcoes.sem_marcas))
+    print(f"✅ {quantidade} folha(s) salva(s) em {opcoes.pasta_saida}")
+    return 0
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    viewer = FolhaA4Viewer()
-    #viewer.show()
-    sys.exit(app.exec_())
+    sys.exit(main())
 
 
 # Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,436 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# pdf_vetorial.py
+# Uso: python -m src.pdf_vetorial holerites.json saida.pdf
+import os
+os.environ["QT_API"] = "PyQt5"
+import sys
+import json
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from PyQt5.QtGui import QFont
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from src.renderizador import DadosHolerite, InstrucaoTexto, LayoutHolerite, carregar_layout, paginar_holerite
+from src.utils import ajustar_texto, preparar_imagem_pdf, quebrar_texto
+
+DPI_RASTER = 96  # Resolução lógica das QImage do renderizador (converte pontos do Qt em unidades do layout)
+FONTE_PDF = "Helvetica"  # Fontes padrão do PDF: não são embutidas e o texto fica pesquisável
+FONTE_PDF_NEGRITO = "Helvetica-Bold"
+NOME_MODELO = "modelo_holerite"
+
+# Texto já posicionado, em unidades do layout: (fonte do PDF, tamanho, x, y da linha de base, texto)
+Comando = Tuple[str, float, float, float, str]
+
+
+def _fonte_pdf(fonte: QFont) -> str:
+    """Escolhe a fonte do PDF equivalente ao peso da QFont do layout."""
+    return FONTE_PDF_NEGRITO if fonte.weight() >= QFont.DemiBold else FONTE_PDF
+
+
+def _comandos_instrucao(instrucao: InstrucaoTexto, texto: str, x: float, y: float) -> List[Comando]:
+    """Converte um campo do layout em textos posicionados, com as mesmas regras de `_desenhar`."""
+    caixa_alta = str.upper if instrucao.maiusculas else str
+    fonte = instrucao.fonte
+    nome = _fonte_pdf(fonte)
+    tamanho = fonte.pointSize() * DPI_RASTER / 72
+
+    if instrucao.ajuste:
+        linhas, tamanho_ajustado, deslocamento = ajustar_texto(
+            texto, instrucao.ajuste["largura"], fonte.family(), fonte.weight(), fonte.pointSize(),
+            instrucao.ajuste.get("fonte_minima", 5)
+        )
+        tamanho = tamanho_ajustado * DPI_RASTER / 72
+        return [(nome, tamanho, x, y - deslocamento + i * instrucao.ajuste["entrelinha"], caixa_alta(linha))
+                for i, linha in enumerate(linhas) if linha]
+    if instrucao.quebra:
+        linhas = quebrar_texto(texto, instrucao.quebra["largura"], fonte)
+        return [(nome, tamanho, x, y + i * instrucao.quebra["entrelinha"], caixa_alta(linha))
+                for i, linha in enumerate(linhas) if linha]
+    if not texto:
+        return []
+
+    texto = caixa_alta(texto)
+    largura_texto = stringWidth(texto, nome, tamanho)
+    if instrucao.caixa:
+        # Texto no topo da caixa, alinhado horizontalmente dentro dela
+        largura, _, _ = instrucao.caixa
+        x += (largura - largura_texto) * instrucao.ancora
+        y += instrucao.metrics.ascent()
+    else:
+        x -= largura_texto * instrucao.ancora
+    return [(nome, tamanho, x, y, texto)]
+
+
+def comandos_holerite(dados: DadosHolerite, layout: Optional[LayoutHolerite] = None) -> List[Comando]:
+    """
+    Lista os textos do holerite já posicionados nas unidades do layout, sem desenhar nada.
+    A quebra de linhas e o ajuste de fonte são os mesmos da imagem; o alinhamento usa as
+    métricas da fonte do PDF.
+    :param dados: Dados do holerite.
+    :param layout: Layout compilado (None usa o layout padrão).
+    """
+    layout = layout or carregar_layout()
+    comandos = []
+    for instrucao in layout.instrucoes_cabecalho + layout.instrucoes_variaveis:
+        if not instrucao.visivel(dados):
+            continue
+        texto = instrucao.obter_texto(getattr(dados, instrucao.campo) if instrucao.campo else None)
+        comandos.extend(_comandos_instrucao(instrucao, texto, instrucao.x, instrucao.y))
+
+    item_y = layout.item_y
+    for item in dados.itens:
+        for coluna in layout.colunas_itens:
+            comandos.extend(_comandos_instrucao(coluna, coluna.obter_texto(item.get(coluna.campo, "")),
+                                                coluna.x, item_y))
+        item_y += layout.item_entrelinha
+    return comandos
+
+
+class GeometriaPdf:
+    """Posição do holerite na página do PDF e conversão das unidades do layout para pontos."""
+
+    def __init__(self, layout: LayoutHolerite, pagina=landscape(A4), x: Optional[float] = None,
+                 y_topo: Optional[float] = None, largura: Optional[float] = None, margem: float = 29):
+        """
+        :param layout: Layout compilado.
+        :param pagina: Tamanho da página em pontos.
+        :param x: Borda esquerda do holerite (None centraliza).
+        :param y_topo: Distância do topo da página até o holerite (None centraliza).
+        :param largura: Largura do holerite em pontos (None ocupa a página menos as margens).
+        :param margem: Margem lateral usada quando a largura não é informada.
+        """
+        self.layout = layout
+        self.pagina = pagina
+        largura = largura or pagina[0] - 2 * margem
+        self.escala = largura / layout.tamanho[0]  # Pontos por pixel da imagem do holerite
+        self.largura = largura
+        self.altura = layout.tamanho[1] * self.escala
+        self.x = (pagina[0] - largura) / 2 if x is None else x
+        self.y_topo = (pagina[1] - self.altura) / 2 if y_topo is None else y_topo
+
+    def ponto(self, x: float, y: float) -> Tuple[float, float]:
+        """Converte um ponto do grupo de textos do layout para coordenadas do PDF (origem embaixo)."""
+        layout = self.layout
+        px = layout.grupo_x + x * layout.grupo_escala
+        py = layout.grupo_y + y * layout.grupo_escala
+        return self.x + px * self.escala, self.pagina[1] - (self.y_topo + py * self.escala)
+
+    def tamanho_fonte(self, tamanho: float) -> float:
+        """Converte um tamanho de fonte em unidades do layout para pontos do PDF."""
+        return tamanho * self.layout.grupo_escala * self.escala
+
+    def area_modelo(self, caminho: str) -> Tuple[float, float, float, float]:
+        """
+        Calcula onde a imagem do modelo é desenhada (mesmo redimensionamento da imagem do holerite).
+        :return: (x, y, largura, altura) em pontos do PDF.
+        """
+        largura_imagem, altura_imagem = ImageReader(caminho).getSize()
+        largura_max, altura_max = self.layout.tamanho_template
+        fator = min(largura_max / largura_imagem, altura_max / altura_imagem)
+        largura = largura_imagem * fator * self.escala
+        altura = altura_imagem * fator * self.escala
+        return self.x, self.pagina[1] - self.y_topo - altura, largura, altura
+
+
+def registrar_modelo(c: canvas.Canvas, geometria: GeometriaPdf, nome: str = NOME_MODELO) -> Optional[str]:
+    """
+    Registra a imagem do modelo uma única vez no PDF, como um XObject reutilizado em todas as páginas.
+    :return: Nome do XObject, ou None se a imagem do modelo não existir.
+    """
+    caminho = geometria.layout.caminho_template
+    if not os.path.exists(caminho):
+        print(f"Erro: Não foi possível carregar a imagem no caminho: {caminho}")
+        return None
+    c.beginForm(nome)
+    x, y, largura, altura = geometria.area_modelo(caminho)
+    c.drawImage(caminho, x, y, width=largura, height=altura, mask='auto')
+    c.endForm()
+    return nome
+
+
+def desenhar_holerite_pdf(c: canvas.Canvas, dados: DadosHolerite, geometria: GeometriaPdf,
+                          modelo: Optional[str] = NOME_MODELO):
+    """
+    Desenha um holerite na página atual: o modelo (XObject já registrado) e os campos como texto real.
+    :param c: Canvas do ReportLab.
+    :param dados: Dados do holerite.
+    :param geometria: Posição do holerite na página.
+    :param modelo: Nome do XObject do modelo (None não desenha o modelo).
+    """
+    if modelo:
+        c.doForm(modelo)
+    c.setFillColorRGB(0, 0, 0)
+    fonte_atual = None
+    for nome, tamanho, x, y, texto in comandos_holerite(dados, geometria.layout):
+        if (nome, tamanho) != fonte_atual:
+            c.setFont(nome, geometria.tamanho_fonte(tamanho))
+            fonte_atual = (nome, tamanho)
+        c.drawString(*geometria.ponto(x, y), texto)
+
+
+def gerar_pdf_holerite(dados: DadosHolerite, pdf_path: str, layout: Optional[LayoutHolerite] = None) -> str:
+    """
+    Gera o PDF vetorial de um holerite (texto pesquisável sobre o modelo), em A4 paisagem,
+    com páginas de continuação se os itens não couberem no modelo.
+    :param dados: Dados do holerite.
+    :param pdf_path: Caminho do PDF a ser salvo.
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: Caminho do PDF salvo.
+    """
+    geometria = GeometriaPdf(layout or carregar_layout())
+    c = canvas.Canvas(pdf_path, pagesize=geometria.pagina)
+    c.setTitle(f"Holerite {dados.funcionario}".strip())
+    modelo = registrar_modelo(c, geometria)
+    for pagina in paginar_holerite(dados, geometria.layout):
+        desenhar_holerite_pdf(c, pagina, geometria, modelo)
+        c.showPage()
+    c.save()
+    print(f"PDF salvo com sucesso em: {pdf_path}")
+    return pdf_path
+
+
+def _texto_pdf(texto: str) -> bytes:
+    """Codifica um texto como string literal do PDF (WinAnsiEncoding, com escapes)."""
+    codificado = texto.encode("cp1252", errors="replace")
+    return b"(" + codificado.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _numero(valor: float) -> bytes:
+    """Formata um número para o conteúdo do PDF (sem zeros à direita)."""
+    return (f"{valor:.3f}".rstrip("0").rstrip(".") or "0").encode("ascii")
+
+
+class EscritorPdf:
+    """
+    Grava um PDF de forma incremental: cada objeto vai para o arquivo assim que é criado e só a sua
+    posição fica na memória. A árvore de páginas, o catálogo e a tabela de referências são gravados
+    em `fechar()`.
+
+    O canvas do ReportLab mantém todas as páginas em memória até o save(); por isso os objetos
+    do PDF são gravados diretamente aqui.
+    """
+
+    def __init__(self, pdf_path: str, titulo: str = "Holerites", descarregar_a_cada: int = 50):
+        """
+        :param pdf_path: Caminho do PDF a ser gravado.
+        :param titulo: Título do documento.
+        :param descarregar_a_cada: Quantidade de páginas entre as descargas do arquivo em disco.
+        """
+        self.pdf_path = pdf_path
+        self.titulo = titulo
+        self.descarregar_a_cada = max(1, descarregar_a_cada)
+        self.paginas = 0
+        self._arquivo = open(pdf_path, "wb")
+        self._posicoes: Dict[int, int] = {}
+        self._kids: List[int] = []
+        self._proximo = 3  # 1 = catálogo e 2 = árvore de páginas, gravados no fechamento
+        self._arquivo.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _gravar(self, conteudo: bytes, fluxo: Optional[bytes] = None, numero: Optional[int] = None) -> int:
+        """Grava um objeto (com fluxo opcional) e retorna o seu número."""
+        if numero is None:
+            numero = self._proximo
+            self._proximo += 1
+        self._posicoes[numero] = self._arquivo.tell()
+        self._arquivo.write(str(numero).encode("ascii") + b" 0 obj\n" + conteudo)
+        if fluxo is not None:
+            self._arquivo.write(b"\nstream\n" + fluxo + b"\nendstream")
+        self._arquivo.write(b"\nendobj\n")
+        return numero
+
+    def _gravar_pagina(self, conteudo: bytes, recursos: bytes, pagina: Tuple[float, float]):
+        """
+        Grava o fluxo de conteúdo e o objeto de uma página.
+        :param conteudo: Operadores de desenho da página (serão comprimidos).
+        :param recursos: Dicionário de recursos da página (fontes, imagens).
+        :param pagina: Largura e altura da página, em pontos.
+        """
+        conteudo = zlib.compress(conteudo)
+        fluxo = self._gravar(b"<< /Filter /FlateDecode /Length %d >>" % len(conteudo), conteudo)
+        largura_pagina, altura_pagina = pagina
+        self._kids.append(self._gravar(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 " + _numero(largura_pagina) + b" " +
+            _numero(altura_pagina) + b"] /Resources " + recursos + b" /Contents %d 0 R >>" % fluxo))
+
+        self.paginas += 1
+        if self.paginas % self.descarregar_a_cada == 0:
+            self._arquivo.flush()
+
+    def fechar(self):
+        """Grava a árvore de páginas, o catálogo e a tabela de referências, e fecha o arquivo."""
+        if self._arquivo.closed:
+            return
+        kids = b" ".join(b"%d 0 R" % numero for numero in self._kids)
+        self._gravar(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._kids), numero=2)
+        self._gravar(b"<< /Type /Catalog /Pages 2 0 R >>", numero=1)
+        info = self._gravar(b"<< /Title " + _texto_pdf(self.titulo) + b" /Producer (Payslip Generator) >>")
+
+        inicio_xref = self._arquivo.tell()
+        total = self._proximo
+        linhas = [b"xref", b"0 %d" % total, b"0000000000 65535 f "]
+        linhas.extend(b"%010d 00000 n " % self._posicoes[numero] for numero in range(1, total))
+        self._arquivo.write(b"\n".join(linhas) + b"\n")
+        self._arquivo.write(b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                            % (total, info, inicio_xref))
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        self.fechar()
+        return False
+
+
+class EscritorPdfImagens(EscritorPdf):
+    """
+    Grava um PDF com uma imagem por página (holerites já desenhados), página a página:
+    cada imagem é comprimida, gravada e liberada antes da próxima.
+    """
+
+    def adicionar_imagem(self, imagem):
+        """
+        Grava uma página com a imagem centralizada, na orientação da imagem.
+        :param imagem: Caminho, QImage, imagem PIL ou bytes (veja `preparar_imagem_pdf`).
+        """
+        img, pagina, (x, y, largura, altura) = preparar_imagem_pdf(imagem)
+        dados = zlib.compress(img.tobytes(), 6)
+        numero = self._gravar(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>" % (img.width, img.height, len(dados)), dados)
+        self._gravar_pagina(b"q " + b" ".join(map(_numero, (largura, 0, 0, altura, x, y))) + b" cm /Imagem Do Q",
+                            b"<< /XObject << /Imagem %d 0 R >> >>" % numero, pagina)
+
+
+class EscritorPdfHolerites(EscritorPdf):
+    """
+    Grava vários holerites em um único PDF, uma página por holerite (mais as páginas de continuação
+    de quem tiver itens demais), escrevendo cada página
+    no arquivo assim que ela é adicionada. A imagem do modelo e as fontes são gravadas uma vez
+    e referenciadas por todas as páginas, então a memória não cresce com a quantidade de páginas
+    (guarda-se apenas a posição de cada objeto no arquivo).
+    Os textos são os mesmos de `comandos_holerite`.
+    """
+
+    _FONTES = {FONTE_PDF: b"F1", FONTE_PDF_NEGRITO: b"F2"}
+
+    def __init__(self, pdf_path: str, layout: Optional[LayoutHolerite] = None,
+                 geometria: Optional[GeometriaPdf] = None, titulo: str = "Holerites", descarregar_a_cada: int = 50):
+        """
+        :param pdf_path: Caminho do PDF a ser gravado.
+        :param layout: Layout compilado (None usa o layout padrão).
+        :param geometria: Posição do holerite na página (None centraliza em A4 paisagem).
+        :param titulo: Título do documento.
+        :param descarregar_a_cada: Quantidade de páginas entre as descargas do arquivo em disco.
+        """
+        super().__init__(pdf_path, titulo, descarregar_a_cada)
+        self.geometria = geometria or GeometriaPdf(layout or carregar_layout())
+        self.holerites = 0
+
+        self._fontes = {}
+        for nome, apelido in self._FONTES.items():
+            self._fontes[apelido] = self._gravar(
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /" + nome.encode("ascii") +
+                b" /Encoding /WinAnsiEncoding >>")
+        self._modelo = self._gravar_modelo()
+        # Posição do modelo na página, calculada uma vez e repetida em todas as páginas
+        self._area_modelo = (self.geometria.area_modelo(self.geometria.layout.caminho_template)
+                             if self._modelo is not None else None)
+
+    def _gravar_modelo(self) -> Optional[int]:
+        """Grava a imagem do modelo uma única vez, como XObject de imagem."""
+        caminho = self.geometria.layout.caminho_template
+        if not os.path.exists(caminho):
+            print(f"Erro: Não foi possível carregar a imagem no caminho: {caminho}")
+            return None
+        with Image.open(caminho) as img:
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                fundo = Image.new("RGB", img.size, (255, 255, 255))  # Transparência sobre fundo branco
+                fundo.paste(img, mask=img.split()[-1])
+                img = fundo
+            else:
+                img = img.convert("RGB")
+            largura, altura = img.size
+            dados = zlib.compress(img.tobytes(), 6)
+        return self._gravar(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>" % (largura, altura, len(dados)), dados)
+
+    def adicionar(self, dados: DadosHolerite):
+        """Grava as páginas de um holerite no arquivo (mais de uma se houver continuação)."""
+        for pagina in paginar_holerite(dados, self.geometria.layout):
+            self._adicionar_pagina(pagina)
+        self.holerites += 1
+
+    def _adicionar_pagina(self, dados: DadosHolerite):
+        """Grava uma página no arquivo."""
+        geometria = self.geometria
+        partes = []
+        if self._modelo is not None:
+            x, y, largura, altura = self._area_modelo
+            partes.append(b"q " + b" ".join(map(_numero, (largura, 0, 0, altura, x, y))) + b" cm /Modelo Do Q")
+        partes.append(b"0 0 0 rg BT")
+        fonte_atual = None
+        for nome, tamanho, x, y, texto in comandos_holerite(dados, geometria.layout):
+            if (nome, tamanho) != fonte_atual:
+                partes.append(b"/" + self._FONTES[nome] + b" " + _numero(geometria.tamanho_fonte(tamanho)) + b" Tf")
+                fonte_atual = (nome, tamanho)
+            px, py = geometria.ponto(x, y)
+            partes.append(b"1 0 0 1 " + _numero(px) + b" " + _numero(py) + b" Tm " + _texto_pdf(texto) + b" Tj")
+        partes.append(b"ET")
+
+        fontes = b" ".join(b"/" + apelido + b" %d 0 R" % numero for apelido, numero in self._fontes.items())
+        xobjetos = b" /XObject << /Modelo %d 0 R >>" % self._modelo if self._modelo is not None else b""
+        self._gravar_pagina(b"\n".join(partes), b"<< /Font << " + fontes + b" >>" + xobjetos + b" >>",
+                            geometria.pagina)
+
+
+def gerar_pdf_lote(registros: Iterable[Union[DadosHolerite, Dict]], pdf_path: str,
+                   layout: Optional[LayoutHolerite] = None, titulo: str = "Holerites") -> int:
+    """
+    Gera um único PDF com um holerite por página (mais as continuações), lendo os registros um a um.
+    :param registros: DadosHolerite ou dicionários no formato de `para_dicionario` (pode ser um gerador).
+    :param pdf_path: Caminho do PDF a ser salvo.
+    :param layout: Layout compilado (None usa o layout padrão).
+    :param titulo: Título do documento.
+    :return: Quantidade de páginas gravadas.
+    """
+    with EscritorPdfHolerites(pdf_path, layout, titulo=titulo) as escritor:
+        for registro in registros:
+            escritor.adicionar(registro if isinstance(registro, DadosHolerite) else DadosHolerite(**registro))
+    print(f"PDF salvo com sucesso em: {pdf_path}")
+    return escritor.paginas
+
+
+def main(argumentos=None) -> int:
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    if len(argumentos) != 2:
+        print("Uso: python -m src.pdf_vetorial holerites.json saida.pdf")
+        return 2
+    with open(argumentos[0], "r", encoding="utf-8") as arquivo:
+        registros = json.load(arquivo)
+    if isinstance(registros, dict):
+        registros = [registros]
+    paginas = gerar_pdf_lote(registros, argumentos[1])
+    print(f"✅ {paginas} holerite(s) em {argumentos[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -66,12 +66,15 @@ class PreVisualizacaoHolerite(QDialog):
         # Obtém o caminho correto da pasta temporária
         self.assets_dir = obter_pasta_temp()
 
-        # Lista de imagens com caminho absoluto
-        self.imagens = [
-            os.path.join(self.assets_dir, "holerite_duplicado.png"),
-            os.path.join(self.assets_dir, "holerite_horizontal.png"),
-            os.path.join(self.assets_dir, "holerite_vertical.png")
-        ]
+        # Folhas na ordem de navegação (cada arranjo, página a página) e lista de imagens com caminho absoluto
+        self.variantes = ["duplicado", "horizontal", "vertical"]
+        pdf_viewer = getattr(self.ui, "pdf_viewer", None)
+        self.total_paginas = 1
+        if pdf_viewer is not None and pdf_viewer.holerite is not None:
+            self.total_paginas = pdf_viewer.total_paginas
+        self.folhas = [(nome, pagina) for nome in self.variantes for pagina in range(1, self.total_paginas + 1)]
+        self.imagens = [os.path.join(self.assets_dir, f"holerite_{nome}.png" if pagina == 1 else
+                                     f"holerite_{nome}_pagina{pagina}.png") for nome, pagina in self.folhas]
         self.imagem_atual = 0
         self.zoom_factor = 0.3 * self.fator_escala
 
@@ -95,7 +98,7 @@ class PreVisualizacaoHolerite(QDialog):
 
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignCenter)
-        self.carregar_imagem(self.imagens[self.imagem_atual])
+        self.carregar_imagem(self.obter_imagem(self.imagem_atual))
         self.scroll_area.setWidget(self.image_label)
 
         # Layout para centralizar
@@ -157,8 +160,8 @@ class PreVisualizacaoHolerite(QDialog):
         self.label_tipo.setReadOnly(True)
         self.label_tipo.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self.label_tipo.setFixedSize(
-            int(250 * self.fator_escala), int(25 * self.fator_escala)
-        )  # Aplica a escala corretamente
+            int(300 * self.fator_escala), int(25 * self.fator_escala)
+        )  # Aplica a escala corretamente (cabe o número da página de continuação)
         self.label_tipo.setStyleSheet("background-color: white; border: 1px solid #ccc;")
 
         # Botão Próximo
@@ -272,6 +275,23 @@ class PreVisualizacaoHolerite(QDialog):
         self.gerar_pdf_do_holerite_preview()
 
 
+    def obter_imagem(self, indice):
+        """
+        Retorna o caminho da folha de índice `indice`, pedindo-a ao gerador de folhas da tela
+        principal: só a folha exibida precisa estar pronta, as demais são geradas sob demanda.
+        """
+        pdf_viewer = getattr(self.ui, "pdf_viewer", None)
+        if pdf_viewer is not None and pdf_viewer.holerite is not None:
+            caminho = pdf_viewer.folha(*self.folhas[indice])
+            if caminho:
+                return caminho
+        return self.imagens[indice]
+
+    def caminhos_folhas(self, indice):
+        """Retorna os caminhos de todas as páginas do arranjo da folha de índice `indice`."""
+        nome = self.folhas[indice][0]
+        return [self.obter_imagem(posicao) for posicao, (variante, _) in enumerate(self.folhas) if variante == nome]
+
     def carregar_imagem(self, nome_imagem):
         imagem_path = os.path.join(self.assets_dir, nome_imagem)
         if os.path.exists(imagem_path):
@@ -309,9 +329,12 @@ class PreVisualizacaoHolerite(QDialog):
         self.atualizar_previsualizacao()
 
     def atualizar_previsualizacao(self):
-        self.carregar_imagem(self.imagens[self.imagem_atual])
-        nomes = ["Holerite Duplo", "Holerite Padrão - Folha Horizontal", "Holerite Padrão - Folha Vertical"]
-        self.label_tipo.setText(nomes[self.imagem_atual])
+        self.carregar_imagem(self.obter_imagem(self.imagem_atual))
+        nomes = {"duplicado": "Holerite Duplo", "horizontal": "Holerite Padrão - Folha Horizontal",
+                 "vertical": "Holerite Padrão - Folha Vertical"}
+        nome, pagina = self.folhas[self.imagem_atual]
+        texto = nomes[nome] if self.total_paginas == 1 else f"{nomes[nome]} ({pagina}/{self.total_paginas})"
+        self.label_tipo.setText(texto)
 
     def gerar_pdf_do_holerite_preview(self, *args, **kwargs):
         """Permite que o usuário escolha o local e nome do arquivo antes de gerar o PDF da pré-visualização."""
@@ -350,8 +373,16 @@ class PreVisualizacaoHolerite(QDialog):
             QMessageBox.warning(self, "Ação Cancelada", "A geração do PDF foi cancelada.")
             return
 
-        # Salva o PDF somente se a imagem existir
-        if os.path.exists(imagem_path):
+        # As folhas do arranjo selecionado (uma por página) são montadas em memória e vão direto para o PDF
+        pdf_viewer = getattr(self.ui, "pdf_viewer", None)
+        folhas = None
+        if pdf_viewer is not None and pdf_viewer.holerite is not None:
+            folhas = pdf_viewer.compor_paginas(self.folhas[self.imagem_atual][0])
+        if folhas:
+            imagem_para_pdf(folhas, pdf_path)
+            QMessageBox.information(self, "PDF Salvo", f"PDF salvo com sucesso em:\n{pdf_path}")
+        # Sem a folha em memória, salva o PDF somente se a imagem existir
+        elif os.path.exists(imagem_path):
             imagem_para_pdf(imagem_path, pdf_path)
             QMessageBox.information(self, "PDF Salvo", f"PDF salvo com sucesso em:\n{pdf_path}")
         else:
@@ -360,20 +391,20 @@ class PreVisualizacaoHolerite(QDialog):
     def imprimir_holerite_preview_window(self):
         """Imprime o holerite que está sendo exibido na pré-visualização."""
 
-        # Pega a imagem atualmente selecionada
+        # Pega as páginas do arranjo atualmente selecionado
         if 0 <= self.imagem_atual < len(self.imagens):
-            holerite_selecionado = self.imagens[self.imagem_atual]
+            holerites_selecionados = self.caminhos_folhas(self.imagem_atual)
         else:
             QMessageBox.warning(self, "Erro", "Nenhum holerite selecionado.")
             return
 
-        # Caminho da imagem selecionada
-        caminho_imagem = os.path.join(self.assets_dir, holerite_selecionado)
+        # Caminho das imagens selecionadas
+        caminhos = [os.path.join(self.assets_dir, holerite) for holerite in holerites_selecionados]
 
-        # Verifica se a imagem existe antes de imprimir
-        if os.path.exists(caminho_imagem):
+        # Verifica se as imagens existem antes de imprimir
+        if all(os.path.exists(caminho) for caminho in caminhos):
             try:
-                imprimir_holerite(caminho_imagem, parent=self)
+                imprimir_holerite(caminhos, parent=self)
             except Exception as e:
                 QMessageBox.warning(self, "Erro", f"Falha ao imprimir o holerite: {str(e)}")
         else:
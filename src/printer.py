@@ -19,7 +19,7 @@ def imprimir_holerite(caminho_imagem, parent=None):
     Função para imprimir a imagem do holerite com qualidade máxima.
     Caso a imagem esteja na horizontal, ela será rotacionada para impressão.
 
-    :param caminho_imagem: Caminho da imagem do holerite gerado.
+    :param caminho_imagem: Caminho da imagem do holerite gerado (ou lista de caminhos, uma folha por página).
     :param parent: Janela principal que chama a função (para exibir diálogos).
     """
     printer = QPrinter(QPrinter.HighResolution)
@@ -30,39 +30,44 @@ def imprimir_holerite(caminho_imagem, parent=None):
     if dialog.exec_() != QPrintDialog.Accepted:
         return  # Usuário cancelou a impressão
 
-    # Criar um pintor para desenhar no documento de impressão
-    painter = QPainter(printer)
-    pixmap = QPixmap(caminho_imagem)
-
-    if pixmap.isNull():
+    caminhos = caminho_imagem if isinstance(caminho_imagem, (list, tuple)) else [caminho_imagem]
+    pixmaps = [QPixmap(caminho) for caminho in caminhos]
+    if not pixmaps or any(pixmap.isNull() for pixmap in pixmaps):
         QMessageBox.warning(parent, "Erro", "Não foi possível carregar a imagem para impressão.")
         return
 
-    # Obtém as dimensões reais da imagem
-    with Image.open(caminho_imagem) as img:
-        img_largura, img_altura = img.size
+    # Criar um pintor para desenhar no documento de impressão
+    painter = QPainter(printer)
 
     # Dimensões da página
     largura_pagina = printer.pageRect().width()
     altura_pagina = printer.pageRect().height()
 
-    # Se a imagem for mais larga que alta (modo paisagem), rotaciona
-    if img_largura > img_altura:
-        transform = QTransform()
-        transform.rotate(90)  # Gira a imagem 90 graus para impressão correta
-        pixmap = pixmap.transformed(transform, Qt.SmoothTransformation)
+    for indice, (caminho, pixmap) in enumerate(zip(caminhos, pixmaps)):
+        if indice:
+            printer.newPage()  # Cada página de continuação do holerite vai em uma nova folha
+
+        # Obtém as dimensões reais da imagem
+        with Image.open(caminho) as img:
+            img_largura, img_altura = img.size
+
+        # Se a imagem for mais larga que alta (modo paisagem), rotaciona
+        if img_largura > img_altura:
+            transform = QTransform()
+            transform.rotate(90)  # Gira a imagem 90 graus para impressão correta
+            pixmap = pixmap.transformed(transform, Qt.SmoothTransformation)
 
-    # Ajustar a imagem para preencher a página corretamente
-    proporcao = min(largura_pagina / pixmap.width(), altura_pagina / pixmap.height())
-    nova_largura = int(pixmap.width() * proporcao)
-    nova_altura = int(pixmap.height() * proporcao)
+        # Ajustar a imagem para preencher a página corretamente
+        proporcao = min(largura_pagina / pixmap.width(), altura_pagina / pixmap.height())
+        nova_largura = int(pixmap.width() * proporcao)
+        nova_altura = int(pixmap.height() * proporcao)
 
-    # Centraliza a imagem na folha
-    x = (largura_pagina - nova_largura) // 2
-    y = (altura_pagina - nova_altura) // 2
+        # Centraliza a imagem na folha
+        x = (largura_pagina - nova_largura) // 2
+        y = (altura_pagina - nova_altura) // 2
 
-    # Desenha a imagem na folha
-    painter.drawPixmap(x, y, nova_largura, nova_altura, pixmap)
+        # Desenha a imagem na folha
+        painter.drawPixmap(x, y, nova_largura, nova_altura, pixmap)
     painter.end()  # Finaliza a impressão
 
 
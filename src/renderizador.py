@@ -0,0 +1,682 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# renderizador.py
+# Uso: python -m src.renderizador holerites.json pasta_saida
+import os
+os.environ["QT_API"] = "PyQt5"
+import sys
+import json
+import hashlib
+from typing import Dict, Iterable, List, Optional, Union
+
+from PyQt5.QtCore import Qt, QCoreApplication, QRect, QRectF
+from PyQt5.QtGui import QFont, QGuiApplication, QImage, QPainter, QPixmap, QTransform
+
+from src.cache import CacheLRU
+from src.dinheiro import Dinheiro
+from src.utils import (formatar_data_emissao, formatar_valor, quebrar_texto, formatar_cnpj, ajustar_texto_e_fonte,
+                       formatar_valor_lista, obter_fonte, obter_metricas, cache_texto, ajustar_texto)
+
+base_dir = os.path.abspath(os.path.dirname(__file__))  # Caminho absoluto seguro
+CAMINHO_LAYOUT = os.path.join(base_dir, "assets", "layouts", "um_holerite_horizontal.json")
+
+# Campos de texto do holerite, na forma exibida no formulário
+CAMPOS_HOLERITE = (
+    "empresa", "endereco", "cnpj", "data_emissao", "codigo", "funcionario", "funcao", "tipo", "cbo", "fl",
+    "referencia", "salario_base", "codigo_salario", "sal_contr_inss", "base_fgts", "valor_fgts", "base_irrf",
+    "total_vencimentos", "total_descontos", "valor_liquido", "observacoes",
+)
+CAMPOS_ITEM = ("codigo", "descricao", "desconto", "vencimento")
+
+
+def _texto(valor) -> str:
+    """Normaliza um valor do registro para o texto exibido (0 e None ficam vazios, como nos QSpinBox)."""
+    if valor is None:
+        return ""
+    if isinstance(valor, Dinheiro):
+        return valor.formatar(milhar=False)
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return str(valor) if valor != 0 else ""
+    return str(valor)
+
+
+def _linha(widget) -> str:
+    return widget.text().strip()
+
+
+# Widget do formulário (atributo de HoleriteApp, mesmo nome da chave em obter_dados_holerite) e leitura do valor
+LEITURA_FORMULARIO = {
+    "empresa": ("empresa_input", _linha),
+    "endereco": ("endereco_input", _linha),
+    "cnpj": ("cnpj_input", _linha),
+    "data_emissao": ("data_emissao_input", _linha),
+    "codigo": ("codigo_input", lambda widget: widget.value()),
+    "funcionario": ("funcionario_input", _linha),
+    "funcao": ("funcao_input", _linha),
+    "tipo": ("tipo_input", lambda widget: widget.currentText()),
+    "cbo": ("cbo_input", lambda widget: widget.value()),
+    "fl": ("fl_input", lambda widget: widget.value()),
+    "referencia": ("referencia_input", _linha),
+    "salario_base": ("salario_saida_copia", _linha),
+    "codigo_salario": ("codigo_salario_input", lambda widget: widget.value()),
+    "sal_contr_inss": ("sal_contr_inss_input", _linha),
+    "base_fgts": ("base_fgts_input", _linha),
+    "valor_fgts": ("valor_fgts_input", _linha),
+    "base_irrf": ("base_irrf_input", _linha),
+    "total_vencimentos": ("total_vencimentos_label", _linha),
+    "total_descontos": ("total_descontos_label", _linha),
+    "valor_liquido": ("valor_liquido_label", lambda widget: widget.text()),
+    "observacoes": ("observacoes_input", lambda widget: widget.toPlainText().strip()),
+}
+
+
+def ler_campo_formulario(app, campo: str):
+    """
+    Lê do formulário (HoleriteApp) apenas o valor de um campo do holerite, direto do seu widget.
+    :param app: Instância de HoleriteApp.
+    :param campo: Campo de `CAMPOS_HOLERITE`.
+    """
+    nome, leitor = LEITURA_FORMULARIO[campo]
+    return leitor(getattr(app, nome))
+
+
+class DadosHolerite:
+    """
+    Registro simples com os dados de um holerite, independente dos widgets do formulário.
+    Valores monetários podem ser informados como texto ("2500,00") ou Dinheiro.
+    """
+
+    __slots__ = CAMPOS_HOLERITE + ("itens", "pagina", "total_paginas")
+
+    def __init__(self, itens: Optional[Iterable[Dict]] = None, pagina: int = 1, total_paginas: int = 1, **campos):
+        """
+        :param itens: Itens de desconto/vencimento (codigo, descricao, desconto, vencimento).
+        :param pagina: Número desta página do holerite (páginas de continuação começam em 2).
+        :param total_paginas: Quantidade de páginas do holerite.
+        :param campos: Campos de `CAMPOS_HOLERITE`; os omitidos ficam vazios.
+        """
+        desconhecidos = set(campos) - set(CAMPOS_HOLERITE)
+        if desconhecidos:
+            raise TypeError(f"Campos desconhecidos no holerite: {', '.join(sorted(desconhecidos))}")
+        for campo in CAMPOS_HOLERITE:
+            setattr(self, campo, _texto(campos.get(campo)))
+        self.itens = [dict(item) for item in (itens or [])]
+        self.pagina = pagina
+        self.total_paginas = total_paginas
+
+    @classmethod
+    def de_formulario(cls, app, itens: Optional[List[Dict]] = None) -> "DadosHolerite":
+        """
+        Copia os dados atuais do formulário (HoleriteApp) para um registro.
+        :param app: Instância de HoleriteApp.
+        :param itens: Itens já lidos do livro de lançamentos (opcional; se omitido, são lidos agora).
+        """
+        return cls(itens=app.lancamentos.itens() if itens is None else itens,
+                   **{campo: leitor(getattr(app, nome)) for campo, (nome, leitor) in LEITURA_FORMULARIO.items()})
+
+    def para_dicionario(self) -> Dict:
+        """Retorna o registro como dicionário (para JSON ou para recriá-lo com `DadosHolerite(**d)`)."""
+        dicionario = {campo: getattr(self, campo) for campo in CAMPOS_HOLERITE}
+        dicionario["itens"] = [dict(item) for item in self.itens]
+        if self.total_paginas > 1:
+            dicionario.update(pagina=self.pagina, total_paginas=self.total_paginas)
+        return dicionario
+
+    def impressao_digital(self) -> str:
+        """
+        Resumo (SHA-1) de tudo o que é desenhado no holerite: registros com a mesma
+        impressão digital geram a mesma imagem.
+        """
+        conteudo = [_texto(getattr(self, campo)) for campo in CAMPOS_HOLERITE]
+        conteudo.append([[_texto(item.get(campo)) for campo in CAMPOS_ITEM] for item in self.itens])
+        conteudo.append([self.pagina, self.total_paginas])
+        return hashlib.sha1(json.dumps(conteudo, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+_APLICACAO = None
+
+
+def garantir_aplicacao():
+    """
+    Garante que exista uma aplicação Qt (necessária para fontes e QPainter).
+    Fora da interface gráfica, cria uma QGuiApplication na plataforma "offscreen".
+    """
+    global _APLICACAO
+    aplicacao = QCoreApplication.instance()
+    if aplicacao is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        aplicacao = _APLICACAO = QGuiApplication(sys.argv[:1])  # Referência mantida: evita que seja destruída
+    return aplicacao
+
+
+_TEMPLATES: Dict[tuple, QImage] = {}
+
+
+def carregar_template(caminho: str, tamanho=(1549, 979)) -> QImage:
+    """
+    Carrega (uma única vez por caminho e tamanho) a imagem do modelo, já redimensionada.
+    :param caminho: Caminho da imagem do modelo.
+    :param tamanho: Largura e altura máximas (a proporção da imagem é mantida).
+    :return: QImage do modelo (nula se o arquivo não puder ser lido).
+    """
+    chave = (caminho, tuple(tamanho))
+    template = _TEMPLATES.get(chave)
+    if template is None:
+        garantir_aplicacao()
+        template = QImage(caminho)
+        if template.isNull():
+            print(f"Erro: Não foi possível carregar a imagem no caminho: {caminho}")
+        else:
+            template = template.scaled(tamanho[0], tamanho[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        _TEMPLATES[chave] = template
+    return template
+
+
+# Formatações disponíveis para os campos do layout
+FORMATOS = {
+    "texto": str,
+    "valor": formatar_valor,
+    "valor_lista": formatar_valor_lista,
+    "cnpj": formatar_cnpj,
+    "data_emissao": formatar_data_emissao,
+}
+
+# Fração da largura do texto deslocada para a esquerda em cada alinhamento
+ANCORAS = {"esquerda": 0.0, "centro": 0.5, "direita": 1.0}
+ALINHAMENTOS_CAIXA = {"esquerda": Qt.AlignLeft, "centro": Qt.AlignHCenter, "direita": Qt.AlignRight}
+
+
+def _criar_fonte(spec: Dict, padrao: Dict) -> QFont:
+    """Cria a QFont de um campo, completando a especificação com a fonte padrão do layout."""
+    fonte = {**padrao, **spec}
+    peso = getattr(QFont, fonte.get("peso", "Normal"), None)
+    if not isinstance(peso, int):
+        raise ValueError(f"Peso de fonte inválido no layout: {fonte.get('peso')}")
+    return obter_fonte(fonte["familia"], int(fonte["tamanho"]), peso)
+
+
+class InstrucaoTexto:
+    """Um texto do layout já compilado: fonte, métricas, posição e forma de desenhar."""
+
+    __slots__ = ("campo", "texto", "formatar", "x", "y", "fonte", "metrics", "ancora", "caixa", "ajuste",
+                 "quebra", "ocultar", "maiusculas", "camada", "paginas")
+
+    def __init__(self, spec: Dict, fonte_padrao: Dict, maiusculas: bool):
+        """
+        :param spec: Especificação do campo no layout.
+        :param fonte_padrao: Fonte padrão do layout (completa a fonte do campo).
+        :param maiusculas: Padrão do layout para converter o texto em maiúsculas.
+        """
+        self.campo = spec.get("campo")
+        self.texto = spec.get("texto")
+        if (self.campo is None) == (self.texto is None):
+            raise ValueError(f"O campo do layout deve ter 'campo' ou 'texto': {spec}")
+        if self.campo is not None and self.campo not in CAMPOS_HOLERITE and self.campo not in CAMPOS_ITEM:
+            raise ValueError(f"Campo desconhecido no layout: {self.campo}")
+        try:
+            self.formatar = FORMATOS[spec.get("formato", "texto")]
+            self.ancora = ANCORAS[spec.get("alinhamento", "esquerda")]
+        except KeyError as erro:
+            raise ValueError(f"Valor inválido no layout: {erro} em {spec}") from None
+        self.x, self.y = spec["x"], spec.get("y", 0)  # Colunas de itens recebem o y da linha
+        self.fonte = _criar_fonte(spec.get("fonte", {}), fonte_padrao)
+        self.metrics = obter_metricas(self.fonte)
+        caixa = spec.get("caixa")
+        # Texto dentro de um retângulo, alinhado pelas flags do Qt (como o drawText com QRect)
+        self.caixa = (caixa[0], caixa[1], ALINHAMENTOS_CAIXA[spec.get("alinhamento", "esquerda")]) if caixa else None
+        self.ajuste = spec.get("ajuste")  # Diminui a fonte e quebra linhas para caber na largura
+        self.quebra = spec.get("quebra")  # Quebra linhas na largura, sem mudar a fonte
+        self.ocultar = frozenset(spec.get("ocultar", ()))
+        self.maiusculas = spec.get("maiusculas", maiusculas)
+        self.camada = spec.get("camada", "variavel")
+        if self.camada not in ("cabecalho", "variavel"):
+            raise ValueError(f"Camada inválida no layout: {self.camada}")
+        self.paginas = spec.get("paginas", "todas")  # Holerites com continuação: todas, primeira ou ultima
+        if self.paginas not in ("todas", "primeira", "ultima"):
+            raise ValueError(f"Valor inválido para 'paginas' no layout: {self.paginas}")
+
+    def visivel(self, dados: DadosHolerite) -> bool:
+        """Indica se o campo aparece na página do holerite representada por `dados`."""
+        if self.paginas == "primeira":
+            return dados.pagina == 1
+        if self.paginas == "ultima":
+            return dados.pagina == dados.total_paginas
+        return True
+
+    def obter_texto(self, valor) -> str:
+        """Aplica a formatação do campo ao valor (ou retorna o texto fixo)."""
+        if self.texto is not None:
+            return self.texto
+        texto = _texto(valor)
+        return "" if texto in self.ocultar else self.formatar(texto)
+
+
+class LayoutHolerite:
+    """
+    Layout de um modelo de holerite, lido de um arquivo JSON e compilado uma única vez em uma
+    lista de instruções de desenho (fontes, métricas e âncoras já calculadas).
+    Um novo modelo precisa apenas de um novo arquivo de layout em assets/layouts.
+    """
+
+    def __init__(self, spec: Dict, pasta_assets: str = os.path.join(base_dir, "assets")):
+        """
+        :param spec: Conteúdo do arquivo de layout.
+        :param pasta_assets: Pasta base para o caminho relativo do modelo.
+        """
+        garantir_aplicacao()
+        self.nome = spec.get("nome", "")
+        self.caminho_template = os.path.join(pasta_assets, spec["template"])
+        self.tamanho = tuple(spec["tamanho"])
+        self.tamanho_template = tuple(spec.get("tamanho_template", spec["tamanho"]))
+        grupo = spec.get("grupo", {})
+        self.grupo_x, self.grupo_y = grupo.get("x", 0), grupo.get("y", 0)
+        self.grupo_escala = grupo.get("escala", 1)
+
+        fonte_padrao = spec["fonte"]
+        maiusculas = spec.get("maiusculas", False)
+        self.fonte = _criar_fonte({}, fonte_padrao)
+        instrucoes = [InstrucaoTexto(campo, fonte_padrao, maiusculas) for campo in spec.get("campos", ())]
+        # Campos da camada "cabecalho" são iguais para todos os funcionários da empresa na competência
+        self.instrucoes_cabecalho = [instrucao for instrucao in instrucoes if instrucao.camada == "cabecalho"]
+        self.instrucoes_variaveis = [instrucao for instrucao in instrucoes if instrucao.camada != "cabecalho"]
+
+        itens = spec.get("itens", {})
+        self.item_y = itens.get("y", 0)
+        self.item_entrelinha = itens.get("entrelinha", 12)
+        self.itens_por_pagina = itens.get("maximo")  # None: todos os itens na mesma página
+        self.texto_transporte = itens.get("transporte", "TRANSPORTE")
+        self.texto_continua = itens.get("continua", "CONTINUA NA PÁGINA {proxima} DE {total}")
+        self.colunas_itens = [InstrucaoTexto(coluna, fonte_padrao, maiusculas) for coluna in itens.get("colunas", ())]
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "LayoutHolerite":
+        """Lê e compila um arquivo de layout."""
+        with open(caminho, "r", encoding="utf-8") as arquivo:
+            return cls(json.load(arquivo))
+
+
+_LAYOUTS: Dict[str, LayoutHolerite] = {}
+
+
+def carregar_layout(caminho: str = CAMINHO_LAYOUT) -> LayoutHolerite:
+    """
+    Retorna o layout compilado, lendo o arquivo apenas na primeira vez.
+    :param caminho: Caminho do arquivo JSON do layout.
+    """
+    layout = _LAYOUTS.get(caminho)
+    if layout is None:
+        layout = _LAYOUTS[caminho] = LayoutHolerite.carregar(caminho)
+    return layout
+
+
+def _desenhar(painter: QPainter, instrucao: InstrucaoTexto, texto: str, x: int, y: int):
+    """
+    Desenha um texto já formatado conforme a instrução (alinhado, em caixa, ajustado ou quebrado).
+    A conversão para maiúsculas é feita por linha, depois da quebra medida no texto original.
+    """
+    caixa_alta = str.upper if instrucao.maiusculas else str
+    if instrucao.ajuste:
+        # Diminui a fonte até caber e expande o bloco para cima e para baixo a partir da base
+        # (a função já deixa no painter a fonte reduzida, vinda do cache de fontes)
+        linhas, _, deslocamento = ajustar_texto_e_fonte(
+            painter, texto, instrucao.ajuste["largura"], instrucao.fonte.pointSize(),
+            instrucao.ajuste.get("fonte_minima", 5)
+        )
+        for i, linha in enumerate(linhas):
+            painter.drawText(x, y - deslocamento + i * instrucao.ajuste["entrelinha"], caixa_alta(linha))
+    elif instrucao.quebra:
+        linhas = quebrar_texto(texto, instrucao.quebra["largura"], instrucao.fonte)
+        for i, linha in enumerate(linhas):
+            painter.drawText(x, y + i * instrucao.quebra["entrelinha"], caixa_alta(linha))
+    elif instrucao.caixa:
+        largura, altura, alinhamento = instrucao.caixa
+        painter.drawText(x, y, largura, altura, alinhamento, caixa_alta(texto))
+    elif texto:
+        texto = caixa_alta(texto)
+        if instrucao.ancora:
+            x -= int(instrucao.metrics.width(texto) * instrucao.ancora)
+        painter.drawText(x, y, texto)
+
+
+def _area_instrucao(instrucao: InstrucaoTexto, texto: str) -> QRectF:
+    """Retângulo ocupado pelo texto de um campo, nas coordenadas do grupo de textos do layout."""
+    caixa_alta = str.upper if instrucao.maiusculas else str
+    fonte, metrics = instrucao.fonte, instrucao.metrics
+    if instrucao.caixa:
+        largura, altura, _ = instrucao.caixa
+        return QRectF(instrucao.x, instrucao.y, largura, altura)
+    if instrucao.ajuste or instrucao.quebra:
+        if instrucao.ajuste:
+            linhas, tamanho, deslocamento = ajustar_texto(
+                texto, instrucao.ajuste["largura"], fonte.family(), fonte.weight(), fonte.pointSize(),
+                instrucao.ajuste.get("fonte_minima", 5)
+            )
+            metrics = obter_metricas(obter_fonte(fonte.family(), tamanho, fonte.weight()))
+            topo, entrelinha = instrucao.y - deslocamento, instrucao.ajuste["entrelinha"]
+        else:
+            linhas = quebrar_texto(texto, instrucao.quebra["largura"], fonte)
+            topo, entrelinha = instrucao.y, instrucao.quebra["entrelinha"]
+        largura = max((metrics.width(caixa_alta(linha)) for linha in linhas), default=0)
+        return QRectF(instrucao.x, topo - metrics.ascent(), largura,
+                      (len(linhas) - 1) * entrelinha + metrics.height())
+    largura = metrics.width(caixa_alta(texto))
+    return QRectF(instrucao.x - int(largura * instrucao.ancora), instrucao.y - metrics.ascent(),
+                  largura, metrics.height())
+
+
+def area_campo(dados: DadosHolerite, campo: str, layout: Optional[LayoutHolerite] = None) -> QRect:
+    """
+    Retângulo do widget/imagem ocupado por um campo do holerite com os dados atuais
+    (união de todas as posições do campo no layout; "itens" devolve a área da lista de itens).
+    Usado para repintar apenas a região alterada na pré-visualização.
+    :param dados: Dados do holerite.
+    :param campo: Nome do campo (de `CAMPOS_HOLERITE`) ou "itens".
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: QRect em pixels, com folga para a suavização do texto (vazio se o campo não é desenhado).
+    """
+    layout = layout or carregar_layout()
+    area = QRectF()
+    if campo == "itens":
+        linhas = max(len(dados.itens), layout.itens_por_pagina or 0)
+        if linhas:
+            metrics = obter_metricas(layout.fonte)
+            area = QRectF(0, layout.item_y - metrics.ascent(), layout.tamanho[0] / layout.grupo_escala,
+                          (linhas - 1) * layout.item_entrelinha + metrics.height())
+    else:
+        for instrucao in layout.instrucoes_cabecalho + layout.instrucoes_variaveis:
+            if instrucao.campo == campo and instrucao.visivel(dados):
+                area = area.united(_area_instrucao(instrucao, instrucao.obter_texto(getattr(dados, campo))))
+    if area.isEmpty():
+        return QRect()
+    transformacao = QTransform().translate(layout.grupo_x, layout.grupo_y).scale(layout.grupo_escala,
+                                                                                 layout.grupo_escala)
+    return transformacao.mapRect(area).toAlignedRect().adjusted(-3, -3, 3, 3)
+
+
+def _centavos(valor) -> int:
+    """Valor exibido no holerite (texto ou Dinheiro) em centavos; textos inválidos contam como zero."""
+    if isinstance(valor, Dinheiro):
+        return valor.centavos
+    try:
+        return Dinheiro.de_texto(_texto(valor)).centavos
+    except ValueError:
+        return 0
+
+
+def paginar_holerite(dados: DadosHolerite, layout: Optional[LayoutHolerite] = None) -> List[DadosHolerite]:
+    """
+    Divide um holerite com mais itens do que cabem no modelo em páginas de continuação.
+    Cada página seguinte começa com a linha de transporte (subtotais das páginas anteriores);
+    as páginas que continuam mostram nos totais o subtotal a transportar (o valor líquido só
+    aparece na última, pelo campo marcado com "paginas": "ultima" no layout).
+    A divisão é feita em uma única passagem pelos itens.
+    :param dados: Dados do holerite completo.
+    :param layout: Layout compilado (define quantos itens cabem por página).
+    :return: Lista de páginas (apenas `dados` se tudo couber em uma página).
+    """
+    layout = layout or carregar_layout()
+    capacidade = layout.itens_por_pagina
+    if not capacidade or len(dados.itens) <= capacidade:
+        return [dados]
+    if capacidade < 2:
+        raise ValueError("O layout precisa de ao menos 2 linhas de itens por página para a continuação.")
+
+    # Subtotais acumulados: os vencimentos partem do salário base, como o total do formulário
+    vencimentos = _centavos(dados.salario_base)
+    descontos = 0
+    blocos, subtotais, bloco = [], [], []
+    for item in dados.itens:
+        # A primeira página usa todas as linhas; as seguintes reservam uma para o transporte
+        if len(bloco) == (capacidade if not blocos else capacidade - 1):
+            blocos.append(bloco)
+            subtotais.append((vencimentos, descontos))
+            bloco = []
+        bloco.append(item)
+        vencimentos += _centavos(item.get("vencimento"))
+        descontos += _centavos(item.get("desconto"))
+    blocos.append(bloco)
+
+    campos = {campo: getattr(dados, campo) for campo in CAMPOS_HOLERITE}
+    total = len(blocos)
+    paginas = []
+    for indice, bloco in enumerate(blocos):
+        pagina = dict(campos)
+        itens = bloco
+        if indice > 0:
+            anterior_venc, anterior_desc = subtotais[indice - 1]
+            transporte = {"codigo": "", "descricao": layout.texto_transporte,
+                          "vencimento": Dinheiro(anterior_venc), "desconto": Dinheiro(anterior_desc)}
+            itens = [transporte] + bloco
+        if indice < total - 1:
+            subtotal_venc, subtotal_desc = subtotais[indice]
+            pagina.update(
+                total_vencimentos=Dinheiro(subtotal_venc), total_descontos=Dinheiro(subtotal_desc),
+                observacoes=layout.texto_continua.format(proxima=indice + 2, total=total),
+            )
+        paginas.append(DadosHolerite(itens=itens, pagina=indice + 1, total_paginas=total, **pagina))
+    return paginas
+
+
+def _pintar_campos(painter: QPainter, dados: DadosHolerite, instrucoes: List[InstrucaoTexto]):
+    """Percorre as instruções, trocando a fonte do painter somente quando ela muda."""
+    fonte_atual = None
+    for instrucao in instrucoes:
+        if instrucao.paginas != "todas" and not instrucao.visivel(dados):
+            continue
+        texto = instrucao.obter_texto(getattr(dados, instrucao.campo) if instrucao.campo else None)
+        if instrucao.fonte is not fonte_atual:
+            painter.setFont(instrucao.fonte)
+            fonte_atual = instrucao.fonte
+        _desenhar(painter, instrucao, texto, instrucao.x, instrucao.y)
+        if instrucao.ajuste:
+            fonte_atual = None  # O ajuste deixa no painter uma fonte reduzida
+    return fonte_atual
+
+
+def _iniciar_grupo(painter: QPainter, layout: LayoutHolerite):
+    """Prepara o painter para desenhar no sistema de coordenadas do grupo de textos do layout."""
+    painter.setRenderHint(QPainter.HighQualityAntialiasing)
+    painter.setPen(Qt.black)
+    painter.translate(layout.grupo_x, layout.grupo_y)
+    painter.scale(layout.grupo_escala, layout.grupo_escala)
+
+
+def pintar_cabecalho(painter: QPainter, dados: DadosHolerite, template: Union[QImage, QPixmap, None] = None,
+                     layout: Optional[LayoutHolerite] = None):
+    """
+    Desenha a camada fixa do holerite: o modelo e os campos da empresa (camada "cabecalho" do layout).
+    :param painter: QPainter já iniciado sobre o dispositivo de destino.
+    :param dados: Dados do holerite (apenas os campos do cabeçalho são usados).
+    :param template: Imagem do modelo desenhada ao fundo (opcional).
+    :param layout: Layout compilado (None usa o layout padrão).
+    """
+    layout = layout or carregar_layout()
+    painter.save()
+    painter.setRenderHint(QPainter.HighQualityAntialiasing)
+    if isinstance(template, QImage) and not template.isNull():
+        painter.drawImage(0, 0, template)
+    elif isinstance(template, QPixmap) and not template.isNull():
+        painter.drawPixmap(0, 0, template)
+    _iniciar_grupo(painter, layout)
+    _pintar_campos(painter, dados, layout.instrucoes_cabecalho)
+    painter.restore()
+
+
+def pintar_variaveis(painter: QPainter, dados: DadosHolerite, layout: Optional[LayoutHolerite] = None):
+    """
+    Desenha os campos que mudam de um funcionário para outro, incluindo os itens.
+    :param painter: QPainter já iniciado sobre o dispositivo de destino.
+    :param dados: Dados do holerite.
+    :param layout: Layout compilado (None usa o layout padrão).
+    """
+    layout = layout or carregar_layout()
+    painter.save()
+    _iniciar_grupo(painter, layout)
+    fonte_atual = _pintar_campos(painter, dados, layout.instrucoes_variaveis)
+
+    item_y = layout.item_y
+    for item in dados.itens:
+        try:
+            for coluna in layout.colunas_itens:
+                if coluna.fonte is not fonte_atual:
+                    painter.setFont(coluna.fonte)
+                    fonte_atual = coluna.fonte
+                _desenhar(painter, coluna, coluna.obter_texto(item.get(coluna.campo, "")), coluna.x, item_y)
+            item_y += layout.item_entrelinha
+        except ValueError as e:
+            print(f"Erro ao processar item: {e} (valor inválido)")
+        except Exception as e:
+            print(f"Erro inesperado ao processar item: {e}")
+    painter.restore()
+
+
+def pintar_holerite(painter: QPainter, dados: DadosHolerite, template: Union[QImage, QPixmap, None] = None,
+                    layout: Optional[LayoutHolerite] = None):
+    """
+    Desenha o holerite completo com o QPainter informado (widget, QImage, impressora...),
+    percorrendo a lista de instruções do layout.
+    :param painter: QPainter já iniciado sobre o dispositivo de destino.
+    :param dados: Dados do holerite.
+    :param template: Imagem do modelo desenhada ao fundo (opcional).
+    :param layout: Layout compilado (None usa o layout padrão).
+    """
+    layout = layout or carregar_layout()
+    pintar_cabecalho(painter, dados, template, layout)
+    pintar_variaveis(painter, dados, layout)
+
+
+# Camadas "modelo + cabeçalho da empresa" já compostas; cada uma ocupa ~6 MB (1542 x 979 x 4 bytes)
+cache_camadas = CacheLRU(tamanho_maximo=8)
+
+
+def camada_cabecalho(dados: DadosHolerite, template: Union[QImage, QPixmap, None] = None,
+                     layout: Optional[LayoutHolerite] = None) -> QImage:
+    """
+    Retorna a imagem com o modelo e o cabeçalho da empresa já desenhados, composta uma única vez
+    por (modelo, empresa, competência). A chave usa os textos exibidos no cabeçalho, então datas
+    de emissão do mesmo mês compartilham a mesma camada.
+    :param dados: Dados do holerite (apenas os campos do cabeçalho são usados).
+    :param template: Imagem do modelo (None usa o modelo do layout).
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: QImage compartilhada (copie antes de desenhar sobre ela).
+    """
+    layout = layout or carregar_layout()
+    if template is None:
+        template = carregar_template(layout.caminho_template, layout.tamanho_template)
+    textos = tuple(instrucao.obter_texto(getattr(dados, instrucao.campo) if instrucao.campo else None)
+                   for instrucao in layout.instrucoes_cabecalho)
+    chave = (layout, template.cacheKey(), textos)
+    camada = cache_camadas.obter(chave)
+    if camada is None:
+        camada = QImage(layout.tamanho[0], layout.tamanho[1], QImage.Format_ARGB32_Premultiplied)
+        camada.fill(Qt.white)
+        painter = QPainter(camada)
+        pintar_cabecalho(painter, dados, template, layout)
+        painter.end()
+        cache_camadas.guardar(chave, camada)
+    return camada
+
+
+def metricas_renderizacao() -> Dict:
+    """
+    Retorna as métricas de renderização do processo: uso dos caches de textos ajustados e de
+    camadas de cabeçalho (acertos, falhas, taxa de acerto) e quantidade de layouts e modelos carregados.
+    """
+    return {
+        "cache_texto": cache_texto.estatisticas(),
+        "cache_camadas": cache_camadas.estatisticas(),
+        "layouts": len(_LAYOUTS),
+        "templates": len(_TEMPLATES),
+    }
+
+
+def renderizar_holerite(dados: DadosHolerite, template: Optional[QImage] = None,
+                        layout: Optional[LayoutHolerite] = None, camadas: bool = True) -> QImage:
+    """
+    Desenha o holerite em uma QImage fora da tela, sem janela nem formulário.
+    Com `camadas`, parte da camada "modelo + cabeçalho" em cache e desenha só os campos variáveis.
+    :param dados: Dados do holerite.
+    :param template: Modelo de fundo (None usa o modelo do layout, carregado uma vez).
+    :param layout: Layout compilado (None usa o layout padrão).
+    :param camadas: Usa o cache de camadas de cabeçalho (False desenha tudo do zero).
+    :return: QImage com o holerite desenhado, no tamanho do layout.
+    """
+    layout = layout or carregar_layout()
+    if template is None:
+        template = carregar_template(layout.caminho_template, layout.tamanho_template)
+    if camadas:
+        imagem = camada_cabecalho(dados, template, layout).copy()
+        painter = QPainter(imagem)
+        pintar_variaveis(painter, dados, layout)
+    else:
+        imagem = QImage(layout.tamanho[0], layout.tamanho[1], QImage.Format_ARGB32_Premultiplied)
+        imagem.fill(Qt.white)
+        painter = QPainter(imagem)
+        pintar_holerite(painter, dados, template, layout)
+    painter.end()
+    return imagem
+
+
+def salvar_holerite(dados: DadosHolerite, caminho: str, template: Optional[QImage] = None,
+                    layout: Optional[LayoutHolerite] = None) -> str:
+    """
+    Renderiza o holerite e salva a imagem (formato pela extensão do arquivo).
+    :return: Caminho do arquivo salvo.
+    """
+    if not renderizar_holerite(dados, template, layout).save(caminho):
+        raise OSError(f"Não foi possível salvar a imagem em {caminho}")
+    return caminho
+
+
+def renderizar_lote(registros: Iterable[Union[DadosHolerite, Dict]], pasta_saida: str,
+                    nome_arquivo: str = "holerite_{indice:05d}.png",
+                    layout: Optional[LayoutHolerite] = None) -> Iterable[str]:
+    """
+    Renderiza vários holerites, um por vez (a memória não cresce com a quantidade).
+    Holerites com itens demais geram também as páginas de continuação.
+    :param registros: DadosHolerite ou dicionários no formato de `para_dicionario`.
+    :param pasta_saida: Pasta onde as imagens serão salvas.
+    :param nome_arquivo: Modelo do nome do arquivo; recebe `indice` e `codigo`.
+    :param layout: Layout compilado (None usa o layout padrão).
+    :return: Gerador com o caminho de cada imagem salva (uma por página).
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    layout = layout or carregar_layout()
+    template = carregar_template(layout.caminho_template, layout.tamanho_template)
+    for indice, registro in enumerate(registros, start=1):
+        dados = registro if isinstance(registro, DadosHolerite) else DadosHolerite(**registro)
+        nome = nome_arquivo.format(indice=indice, codigo=dados.codigo)
+        for pagina in paginar_holerite(dados, layout):
+            if pagina.pagina > 1:  # Páginas de continuação: holerite_00001_2.png, holerite_00001_3.png...
+                base, extensao = os.path.splitext(nome)
+                caminho = os.path.join(pasta_saida, f"{base}_{pagina.pagina}{extensao}")
+            else:
+                caminho = os.path.join(pasta_saida, nome)
+            yield salvar_holerite(pagina, caminho, template, layout)
+
+
+def main(argumentos=None) -> int:
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    if len(argumentos) != 2:
+        print("Uso: python -m src.renderizador holerites.json pasta_saida")
+        return 2
+    with open(argumentos[0], "r", encoding="utf-8") as arquivo:
+        registros = json.load(arquivo)
+    if isinstance(registros, dict):
+        registros = [registros]
+    quantidade = sum(1 for _ in renderizar_lote(registros, argumentos[1]))
+    print(f"✅ {quantidade} holerite(s) salvo(s) em {argumentos[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,238 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# tabelas.py
+import os
+import json
+import hashlib
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+from src.dinheiro import Dinheiro, dividir_arredondando
+
+base_dir = os.path.abspath(os.path.dirname(__file__))  # Caminho absoluto seguro
+CAMINHO_TABELAS = os.path.join(base_dir, "assets", "tabelas", "tabelas_fiscais.json")
+
+
+def chave_competencia(competencia=None) -> Optional[int]:
+    """
+    Converte uma competência em um número inteiro comparável (ano * 12 + mês - 1).
+    Aceita "AAAA-MM", "MM/AAAA", "DD/MM/AAAA", objetos date/datetime ou None.
+    :param competencia: Competência a ser convertida.
+    :return: Chave inteira da competência ou None se não for informada.
+    """
+    if competencia is None or competencia == "":
+        return None
+    if isinstance(competencia, date):
+        return competencia.year * 12 + competencia.month - 1
+
+    return _chave_texto(str(competencia).strip())
+
+
+@lru_cache(maxsize=256)
+def _chave_texto(texto: str) -> int:
+    """Interpreta a competência em texto (resultado em cache: a folha repete poucas competências)."""
+    correspondencia = re.fullmatch(r"(\d{4})-(\d{1,2})", texto)
+    if correspondencia:
+        ano, mes = int(correspondencia.group(1)), int(correspondencia.group(2))
+    else:
+        correspondencia = re.fullmatch(r"(?:\d{1,2}/)?(\d{1,2})/(\d{4})", texto)
+        if not correspondencia:
+            raise ValueError(f"Competência inválida: {texto}")
+        mes, ano = int(correspondencia.group(1)), int(correspondencia.group(2))
+
+    if not 1 <= mes <= 12:
+        raise ValueError(f"Mês inválido na competência: {texto}")
+    return ano * 12 + mes - 1
+
+
+# Alíquotas são guardadas como inteiros em partes por milhão para o cálculo em centavos
+ESCALA_ALIQUOTA = 1_000_000
+# Limite da última faixa do IRRF (sem teto), representável em int64
+SEM_TETO = 2 ** 62
+
+
+def _aliquota_inteira(aliquota: float) -> int:
+    """Converte uma alíquota decimal (ex.: 0.075) em partes por milhão, sem perda."""
+    fracao = Fraction(str(aliquota)) * ESCALA_ALIQUOTA
+    if fracao.denominator != 1:
+        raise ValueError(f"Alíquota com precisão maior que a suportada: {aliquota}")
+    return int(fracao)
+
+
+class TabelaFiscal:
+    """
+    Tabelas de INSS e IRRF de uma vigência, compiladas em vetores ordenados de inteiros
+    (centavos e alíquotas em partes por milhão). As fronteiras das faixas do INSS guardam
+    o valor acumulado da contribuição, de modo que o cálculo é uma busca binária seguida
+    de uma única conta, arredondada ao centavo (MEIO_PARA_CIMA).
+    """
+
+    __slots__ = ("vigencia", "versao", "deducao_dependente", "aliquota_fgts",
+                 "inss_fronteiras", "inss_aliquotas", "inss_acumulado", "inss_maximo",
+                 "irrf_limites", "irrf_aliquotas", "irrf_deducoes")
+
+    def __init__(self, vigencia: str, faixas_inss: List[Tuple[float, float]],
+                 faixas_irrf: List[Tuple[Optional[float], float, float]],
+                 deducao_dependente: float, aliquota_fgts: float):
+        self.vigencia = vigencia
+        # Identifica o conteúdo da tabela; muda sempre que uma faixa ou alíquota mudar
+        self.versao = hashlib.sha1(json.dumps(
+            [vigencia, faixas_inss, faixas_irrf, deducao_dependente, aliquota_fgts]
+        ).encode("utf-8")).hexdigest()[:12]
+        self.deducao_dependente = Dinheiro.de_reais(deducao_dependente).centavos
+        self.aliquota_fgts = _aliquota_inteira(aliquota_fgts)
+
+        # INSS: cada limite é consumido como largura da faixa, como no cálculo original.
+        # O acumulado fica em centavos * ESCALA_ALIQUOTA, portanto exato.
+        self.inss_fronteiras = [0]
+        self.inss_aliquotas = []
+        self.inss_acumulado = [0]
+        for limite, aliquota in faixas_inss:
+            largura = Dinheiro.de_reais(limite).centavos
+            aliquota = _aliquota_inteira(aliquota)
+            self.inss_aliquotas.append(aliquota)
+            self.inss_acumulado.append(self.inss_acumulado[-1] + largura * aliquota)
+            self.inss_fronteiras.append(self.inss_fronteiras[-1] + largura)
+        self.inss_maximo = dividir_arredondando(self.inss_acumulado[-1], ESCALA_ALIQUOTA)
+
+        # IRRF: limite None representa a última faixa (sem teto)
+        faixas_irrf = sorted(faixas_irrf, key=lambda f: float("inf") if f[0] is None else f[0])
+        self.irrf_limites = [SEM_TETO if limite is None else Dinheiro.de_reais(limite).centavos
+                             for limite, _, _ in faixas_irrf]
+        self.irrf_aliquotas = [_aliquota_inteira(aliquota) for _, aliquota, _ in faixas_irrf]
+        self.irrf_deducoes = [Dinheiro.de_reais(deducao).centavos for _, _, deducao in faixas_irrf]
+        if self.irrf_limites[-1] != SEM_TETO:
+            raise ValueError(f"Tabela de IRRF de {vigencia} sem faixa final.")
+
+    def calcular_inss(self, salario_centavos: int) -> int:
+        """
+        Calcula a contribuição ao INSS por busca binária nas fronteiras compiladas.
+        :param salario_centavos: Salário base em centavos.
+        :return: Contribuição ao INSS em centavos.
+        """
+        if salario_centavos <= 0:
+            return 0
+        faixa = bisect_left(self.inss_fronteiras, salario_centavos) - 1
+        if faixa >= len(self.inss_aliquotas):
+            return self.inss_maximo
+        acumulado = (self.inss_acumulado[faixa] +
+                     (salario_centavos - self.inss_fronteiras[faixa]) * self.inss_aliquotas[faixa])
+        return dividir_arredondando(acumulado, ESCALA_ALIQUOTA)
+
+    def calcular_irrf(self, base_centavos: int) -> int:
+        """
+        Aplica a tabela progressiva do IRRF sobre a base já deduzida.
+        :param base_centavos: Base de cálculo do IRRF em centavos.
+        :return: IRRF em centavos, antes de limitar a zero.
+        """
+        faixa = bisect_left(self.irrf_limites, base_centavos)
+        return dividir_arredondando(base_centavos * self.irrf_aliquotas[faixa], ESCALA_ALIQUOTA) - \
+            self.irrf_deducoes[faixa]
+
+    def calcular_fgts(self, base_centavos: int) -> int:
+        """
+        Calcula o depósito de FGTS sobre a base informada.
+        :param base_centavos: Base do FGTS em centavos.
+        :return: Valor do FGTS em centavos.
+        """
+        return dividir_arredondando(base_centavos * self.aliquota_fgts, ESCALA_ALIQUOTA)
+
+
+class RegistroTabelas:
+    """
+    Registro das tabelas fiscais por vigência, carregado de um arquivo JSON.
+    A tabela de uma competência é a de maior vigência que não seja posterior a ela.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_TABELAS):
+        self.caminho = caminho
+        self._chaves = []
+        self._tabelas = []
+        self._ao_recarregar = []
+
+    def carregar(self, caminho: Optional[str] = None):
+        """
+        Lê o arquivo de tabelas e compila cada vigência uma única vez.
+        :param caminho: Caminho alternativo do arquivo JSON.
+        """
+        if caminho:
+            self.caminho = caminho
+        with open(self.caminho, "r", encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+
+        tabelas = []
+        for item in dados.get("tabelas", []):
+            tabela = TabelaFiscal(
+                item["vigencia"],
+                [tuple(faixa) for faixa in item["inss"]],
+                [tuple(faixa) for faixa in item["irrf"]],
+                item.get("deducao_dependente", 0.0),
+                item.get("aliquota_fgts", 0.08)
+            )
+            tabelas.append((chave_competencia(tabela.vigencia), tabela))
+
+        if not tabelas:
+            raise ValueError(f"Nenhuma tabela fiscal encontrada em {self.caminho}")
+
+        tabelas.sort(key=lambda par: par[0])
+        self._chaves = [chave for chave, _ in tabelas]
+        self._tabelas = [tabela for _, tabela in tabelas]
+
+        # Avisa quem guarda resultados calculados com as tabelas anteriores
+        for callback in self._ao_recarregar:
+            callback()
+
+    def ao_recarregar(self, callback: Callable[[], None]):
+        """
+        Registra uma função chamada sempre que as tabelas forem (re)carregadas.
+        :param callback: Função sem argumentos (ex.: limpar um cache de cálculos).
+        """
+        self._ao_recarregar.append(callback)
+
+    def obter(self, competencia=None) -> TabelaFiscal:
+        """
+        Retorna a tabela vigente na competência informada (ou a mais recente).
+        :param competencia: Competência no formato aceito por `chave_competencia`.
+        :return: Tabela fiscal compilada.
+        """
+        if not self._tabelas:
+            self.carregar()
+
+        chave = chave_competencia(competencia)
+        if chave is None:
+            return self._tabelas[-1]
+
+        posicao = bisect_right(self._chaves, chave) - 1
+        if posicao < 0:
+            raise ValueError(f"Nenhuma tabela fiscal vigente na competência {competencia}")
+        return self._tabelas[posicao]
+
+    def vigencias(self) -> List[str]:
+        """Retorna as vigências carregadas, em ordem cronológica."""
+        if not self._tabelas:
+            self.carregar()
+        return [tabela.vigencia for tabela in self._tabelas]
+
+
+registro_tabelas = RegistroTabelas()
+
+
+def obter_tabela(competencia=None) -> TabelaFiscal:
+    """
+    Atalho para obter a tabela vigente no registro padrão.
+    :param competencia: Competência desejada (None para a mais recente).
+    :return: Tabela fiscal compilada.
+    """
+    return registro_tabelas.obter(competencia)
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -15,9 +15,10 @@ from PyQt5.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot, QUrl, QSize, QRect
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QMessageBox, QPushButton, QFileDialog, QShortcut, QSplashScreen,
     QMainWindow, QSizePolicy)
-from src.form_layout import criar_formulario, atualizar_ui # Importa o formulário modularizado
+from src.form_layout import criar_formulario  # Importa o formulário modularizado
 from src.pdf_generator import FolhaA4Viewer
-from src.calculos import calcular_fgts, calcular_irrf, atualizar_totais
+from src.calculos import calcular_fgts, calcular_irrf
+from src.dinheiro import Dinheiro
 from src.utils import (imagem_para_pdf, criar_pasta_temp, limpar_pasta_temp, obter_pasta_temp,
                        obter_caminho_area_de_trabalho, aplicar_escalonamento_dpi)
 from src.preview_window import PreVisualizacaoHolerite, abrir_previsualizacao  # Nova janela de pré-visualização
@@ -141,6 +142,7 @@ class HoleriteApp(QWidget):
             "total_vencimentos_label": self.total_vencimentos_label,
             "total_descontos_label": self.total_descontos_label,
             "valor_liquido_label": self.valor_liquido_label,
+            "lancamentos": self.lancamentos,
         }
 
     def __init__(self):
@@ -205,7 +207,6 @@ class HoleriteApp(QWidget):
 
         # Formulário modularizado
         form_layout, entradas = criar_formulario(self)
-        self.atualizar_ui = atualizar_ui
         main_layout.addLayout(form_layout)
 
         # Integração dos campos com a classe
@@ -233,6 +234,7 @@ class HoleriteApp(QWidget):
         self.observacoes_input = entradas["observacoes_input"]
 
         self.lista_descontos = entradas["lista_descontos"]
+        self.lancamentos = entradas["lancamentos"]
 
         self.total_vencimentos_label = entradas["totais"]["vencimentos"]
         self.total_descontos_label = entradas["totais"]["descontos"]
@@ -249,7 +251,6 @@ class HoleriteApp(QWidget):
         self.gerar_button.clicked.connect(self.gerar_holerite)
         self.imprimir_button.clicked.connect(self.imprimir_holerite_preview)
         self.limpar_button.clicked.connect(self.limpar_campos)
-        self.lista_descontos_espelho = self.atualizar_ui()
 
         # Conectar atualizações automáticas
         self.salario_input.textChanged.connect(self.atualizar_calculos)
@@ -257,25 +258,33 @@ class HoleriteApp(QWidget):
         # Configuração final
         self.setLayout(main_layout)
 
-        self.empresa_input.textChanged.connect(self.notificar_holerite_generator)
-        self.endereco_input.textChanged.connect(self.notificar_holerite_generator)
-        self.cnpj_input.textChanged.connect(self.notificar_holerite_generator)
-        self.codigo_input.valueChanged.connect(self.notificar_holerite_generator)
-        self.funcionario_input.textChanged.connect(self.notificar_holerite_generator)
-        self.funcao_input.textChanged.connect(self.notificar_holerite_generator)
-        self.cbo_input.valueChanged.connect(self.notificar_holerite_generator)
-        self.fl_input.valueChanged.connect(self.notificar_holerite_generator)
-        self.tipo_input.currentIndexChanged.connect(self.notificar_holerite_generator)
-        self.referencia_input.textChanged.connect(self.notificar_holerite_generator)
-        self.salario_input.textChanged.connect(self.notificar_holerite_generator)
-        self.salario_saida_copia.textChanged.connect(self.notificar_holerite_generator)
-        self.codigo_salario_input.valueChanged.connect(self.notificar_holerite_generator)
-        self.sal_contr_inss_input.textChanged.connect(self.notificar_holerite_generator)
-        self.base_fgts_input.textChanged.connect(self.notificar_holerite_generator)
-        self.valor_fgts_input.textChanged.connect(self.notificar_holerite_generator)
-        self.base_irrf_input.textChanged.connect(self.notificar_holerite_generator)
-        self.data_emissao_input.textChanged.connect(self.notificar_holerite_generator)
-        self.observacoes_input.textChanged.connect(self.notificar_holerite_generator)
+        # Cada entrada repinta no holerite apenas a região do campo que ela alimenta
+        sinais_campos = (
+            (self.empresa_input.textChanged, "empresa"),
+            (self.endereco_input.textChanged, "endereco"),
+            (self.cnpj_input.textChanged, "cnpj"),
+            (self.codigo_input.valueChanged, "codigo"),
+            (self.funcionario_input.textChanged, "funcionario"),
+            (self.funcao_input.textChanged, "funcao"),
+            (self.cbo_input.valueChanged, "cbo"),
+            (self.fl_input.valueChanged, "fl"),
+            (self.tipo_input.currentIndexChanged, "tipo"),
+            (self.referencia_input.textChanged, "referencia"),
+            (self.salario_input.textChanged, "salario_base"),
+            (self.salario_saida_copia.textChanged, "salario_base"),
+            (self.codigo_salario_input.valueChanged, "codigo_salario"),
+            (self.sal_contr_inss_input.textChanged, "sal_contr_inss"),
+            (self.base_fgts_input.textChanged, "base_fgts"),
+            (self.valor_fgts_input.textChanged, "valor_fgts"),
+            (self.base_irrf_input.textChanged, "base_irrf"),
+            (self.data_emissao_input.textChanged, "data_emissao"),
+            (self.observacoes_input.textChanged, "observacoes"),
+            (self.total_vencimentos_label.textChanged, "total_vencimentos"),
+            (self.total_descontos_label.textChanged, "total_descontos"),
+            (self.valor_liquido_label.textChanged, "valor_liquido"),
+        )
+        for sinal, campo in sinais_campos:
+            sinal.connect(lambda *_, campo=campo: self.notificar_holerite_generator(campo))
 
 
 
@@ -284,54 +293,40 @@ class HoleriteApp(QWidget):
         Atualiza os cálculos e chama a função para atualizar os totais na interface.
         """
         try:
-            salario_text = self.salario_input.text().replace('.', '').replace(',', '.')
-            salario = float(salario_text) if salario_text else 0.0
-
-            total_descontos = 0.0
-            total_vencimentos = 0.0
-
-            # Identifica descontos e vencimentos separadamente
-            for i in range(self.lista_descontos.count()):
-                item = self.lista_descontos.item(i)
-                item_data = item.data(Qt.UserRole)
-
-
-                if isinstance(item_data, float):
-                    # Se for um número, assumimos que é um desconto (comportamento antigo)
-                    total_descontos += item_data
-                elif isinstance(item_data, dict):
-                    # Se for um dicionário, usamos os valores corretos
-                    desconto_valor = float(item_data.get("desconto", 0.0))
-                    vencimento_valor = float(item_data.get("vencimento", 0.0))
-
-                    if desconto_valor > 0:
-                        total_descontos += desconto_valor
-                    if vencimento_valor > 0:
-                        total_vencimentos += vencimento_valor
+            salario = Dinheiro.de_texto(self.salario_input.text())
+            self.lancamentos.definir_salario(salario)
 
+            # Totais mantidos pelo livro de lançamentos (sem percorrer a lista)
             salario_base = salario
             fgts = calcular_fgts(salario)
-            irrf = calcular_irrf(salario, total_descontos)
-            totais = atualizar_totais(salario + total_vencimentos, total_descontos, irrf['valor_irrf'])
-
-            self.salario_saida_copia.setText(f"{salario_base:.2f}".replace('.', ','))
-            self.sal_contr_inss_input.setText(f"{salario_base:.2f}".replace('.', ','))
-            self.base_fgts_input.setText(f"{fgts['base_fgts']:.2f}".replace('.', ','))
-            self.valor_fgts_input.setText(f"{fgts['valor_fgts']:.2f}".replace('.', ','))
-            self.base_irrf_input.setText(f"{irrf['base_irrf']:.2f}".replace('.', ','))
-            self.total_vencimentos_label.setText(f"{totais['total_vencimentos']:.2f}".replace('.', ','))
-            self.total_descontos_label.setText(f"{totais['total_descontos']:.2f}".replace('.', ','))
-            self.valor_liquido_label.setText(f"{totais['valor_liquido']:.2f}".replace('.', ','))
+            irrf = calcular_irrf(salario)
+            totais = self.lancamentos.totais()
+
+            self.salario_saida_copia.setText(salario_base.formatar(milhar=False))
+            self.sal_contr_inss_input.setText(salario_base.formatar(milhar=False))
+            self.base_fgts_input.setText(fgts['base_fgts'].formatar(milhar=False))
+            self.valor_fgts_input.setText(fgts['valor_fgts'].formatar(milhar=False))
+            self.base_irrf_input.setText(irrf['base_irrf'].formatar(milhar=False))
+            self.total_vencimentos_label.setText(totais['total_vencimentos'].formatar(milhar=False))
+            self.total_descontos_label.setText(totais['total_descontos'].formatar(milhar=False))
+            self.valor_liquido_label.setText(totais['valor_liquido'].formatar(milhar=False))
         except ValueError:
             pass
 
 
-    def notificar_holerite_generator(self):
+    def notificar_holerite_generator(self, campo=None):
         """
         Notifica o HoleriteGenerator para atualizar a exibição quando um campo for alterado.
+        A repintura é agendada (e agrupada) pelo agendador do holerite, não feita na hora.
+        :param campo: Campo do holerite alterado; só a região dele é repintada (None repinta tudo).
         """
-        if self.holerite_generator:
-            self.holerite_generator.update()
+        generator = getattr(self, "holerite_generator", None)
+        if not generator:
+            return
+        if campo is None:
+            generator.marcar_sujo()
+        else:
+            generator.marcar_campo(campo)
 
     def salvar_estado_anterior(self):
         """Salva todos os dados atuais antes de limpar o formulário."""
@@ -390,6 +385,7 @@ class HoleriteApp(QWidget):
             self.descricao_desconto_input.clear()
             self.codigo_desconto_input.setValue(0)
             self.lista_descontos.clear()
+            self.lancamentos.limpar()
             self.sal_contr_inss_input.clear()
             self.base_fgts_input.clear()
             self.valor_fgts_input.clear()
@@ -437,13 +433,19 @@ class HoleriteApp(QWidget):
 
         QMessageBox.information(self, "Restaurado", "Os dados foram restaurados com sucesso!")
 
+    def preparar_folhas(self):
+        """
+        Entrega ao gerador de folhas A4 o holerite atual. O holerite só é desenhado quando
+        alguma folha for pedida, e as folhas já prontas continuam valendo se os dados não mudaram.
+        """
+        dados = self.holerite_generator.dados_atuais()
+        self.pdf_viewer.definir_holerite(lambda: self.holerite_generator.renderizar_paginas(dados),
+                                         dados.impressao_digital())
+
     def gerar_holerite(self):
         if self.holerite_generator:
-            # Atualiza a pré-visualização do holerite
-            self.holerite_generator.update()
-            # Aciona a função de salvar imagem do holerite
-            self.holerite_generator.salvar_como_imagem()
-            self.pdf_viewer.posicao_holerite_duplicado()
+            # A folha é montada em memória na hora de gerar o PDF
+            self.preparar_folhas()
             self.gerar_pdf_do_holerite()
 
     def abrir_previsualizacao(self):
@@ -451,27 +453,18 @@ class HoleriteApp(QWidget):
         Ativa a funcionalidade do botão de pré-visualizar holerite,
         chamando a função de salvar imagem da interface do HoleriteGenerator.
         """
+        # Só a folha exibida primeiro (duplicado) é gerada agora; as outras ficam
+        # para segundo plano e são reaproveitadas enquanto os dados não mudarem
+        caminho = None
         if self.holerite_generator:
-            self.holerite_generator.update()
-            self.holerite_generator.salvar_como_imagem()
-            self.pdf_viewer.posicao_holerite_duplicado()
-            self.pdf_viewer.posicao_holerite_horizontal()
-            self.pdf_viewer.posicao_holerite_vertical()
-
-        # Obtém o caminho correto da pasta temporária
-        temp_dir = obter_pasta_temp()
+            self.preparar_folhas()
+            caminho = self.pdf_viewer.posicao_holerite_duplicado()
+            self.pdf_viewer.preparar(("horizontal", "vertical"))
 
-        """ Abre a janela de pré-visualização apenas se os arquivos existirem. """
-        arquivos_necessarios = [
-            "holerite_duplicado.png",
-            "holerite_horizontal.png",
-            "holerite_vertical.png"
-        ]
-        for arquivo in arquivos_necessarios:
-            caminho = os.path.join(temp_dir, arquivo)  # Caminho atualizado
-            if not os.path.exists(caminho):
-                QMessageBox.warning(self, "Erro", f"O arquivo {arquivo} não foi gerado corretamente.")
-                return  # Impede a abertura da janela se um arquivo estiver faltando
+        """ Abre a janela de pré-visualização apenas se a folha exibida existir. """
+        if not caminho or not os.path.exists(caminho):
+            QMessageBox.warning(self, "Erro", "O arquivo holerite_duplicado.png não foi gerado corretamente.")
+            return  # Impede a abertura da janela se a folha não foi gerada
 
         """ Ativa a funcionalidade do botão de pré-visualizar holerite. """
         if hasattr(self, 'preview_window') and self.preview_window is not None:
@@ -524,8 +517,13 @@ class HoleriteApp(QWidget):
             QMessageBox.warning(self, "Ação Cancelada", "A geração do PDF foi cancelada.")
             return
 
-        # Se a imagem do holerite existir, gera o PDF
-        if os.path.exists(imagem_path):
+        # As folhas montadas em memória (uma por página) vão direto para o PDF;
+        # sem elas, usa a imagem da pasta temporária
+        folhas = self.pdf_viewer.compor_paginas("duplicado") if self.pdf_viewer.holerite is not None else None
+        if folhas:
+            imagem_para_pdf(folhas, pdf_path)
+            QMessageBox.information(self, "PDF Salvo", f"PDF salvo com sucesso em:\n{pdf_path}")
+        elif os.path.exists(imagem_path):
             imagem_para_pdf(imagem_path, pdf_path)
             QMessageBox.information(self, "PDF Salvo", f"PDF salvo com sucesso em:\n{pdf_path}")
         else:
@@ -534,21 +532,19 @@ class HoleriteApp(QWidget):
     def imprimir_holerite_preview(self):
         """Envia o holerite duplicado para a impressora."""
 
-        if self.holerite_generator:
-            self.holerite_generator.update()
-            self.holerite_generator.salvar_como_imagem()
-            self.pdf_viewer.posicao_holerite_duplicado()
-
         # Obtém o caminho da pasta temporária
         temp_dir = obter_pasta_temp()
 
-        # Atualiza o caminho da imagem para a pasta temp
-        caminho_imagem = os.path.join(temp_dir, "holerite_duplicado.png")
+        # Atualiza o caminho da imagem para a pasta temp (uma folha por página do holerite)
+        caminhos = [os.path.join(temp_dir, "holerite_duplicado.png")]
+        if self.holerite_generator:
+            self.preparar_folhas()
+            caminhos = self.pdf_viewer.folhas("duplicado") or caminhos
 
         # Aguarda um curto intervalo para garantir que o arquivo foi salvo antes de imprimir
         QTimer.singleShot(500, lambda: (
-            imprimir_holerite(caminho_imagem, parent=self)
-            if os.path.exists(caminho_imagem)
+            imprimir_holerite(caminhos, parent=self)
+            if all(os.path.exists(caminho) for caminho in caminhos)
             else QMessageBox.warning(self, "Erro", "A imagem do holerite não foi gerada corretamente.")
         ))
 
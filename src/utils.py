@@ -11,6 +11,7 @@ os.environ["QT_API"] = "PyQt5"
 
 from datetime import datetime
 from PyQt5.QtWidgets import QWidget
+from src.cache import CacheLRU
 
 
 def formatar_data_emissao(data):
@@ -124,14 +125,61 @@ def formatar_valor(valor: str) -> str:
 from PyQt5.QtGui import QFont, QFontMetrics
 
 
-def quebrar_texto(texto, largura_maxima, fonte=QFont("Roboto", 7, QFont.Medium)):
+# Cache de fontes e métricas do processo, por (família, tamanho, peso).
+# As fontes são compartilhadas: copie com QFont(fonte) antes de alterá-las.
+_FONTES = {}
+_METRICAS = {}
+
+
+def obter_fonte(familia="Roboto", tamanho=7, peso=QFont.Medium):
+    """
+    Retorna a QFont de (família, tamanho, peso), criando-a somente na primeira vez.
+    :param familia: Família da fonte.
+    :param tamanho: Tamanho em pontos.
+    :param peso: Peso da fonte (QFont.Medium, QFont.Bold...).
+    :return: QFont compartilhada (não deve ser alterada).
+    """
+    chave = (familia, tamanho, peso)
+    fonte = _FONTES.get(chave)
+    if fonte is None:
+        fonte = _FONTES[chave] = QFont(familia, tamanho, peso)
+    return fonte
+
+
+def obter_metricas(fonte):
+    """
+    Retorna o QFontMetrics da fonte, criado uma única vez por (família, tamanho, peso).
+    Requer uma aplicação Qt já criada.
+    :param fonte: QFont a medir.
+    """
+    chave = (fonte.family(), fonte.pointSize(), fonte.weight())
+    metrics = _METRICAS.get(chave)
+    if metrics is None:
+        metrics = _METRICAS[chave] = QFontMetrics(obter_fonte(*chave))
+    return metrics
+
+
+# Textos já quebrados/ajustados: funções e observações se repetem entre muitos funcionários.
+# Chave: (operação, texto, largura máxima, família, tamanho, peso[, tamanho mínimo])
+cache_texto = CacheLRU(tamanho_maximo=2048)
+
+
+def configurar_cache_texto(tamanho_maximo):
+    """
+    Define o número máximo de textos ajustados guardados no cache.
+    :param tamanho_maximo: Limite de itens (0 desativa o cache).
+    """
+    cache_texto.configurar(tamanho_maximo)
+
+
+def quebrar_texto(texto, largura_maxima, fonte=None):
     """
     Quebra o texto em várias linhas de acordo com a largura real das palavras.
 
     Parâmetros:
         - texto: str -> O texto que será quebrado em múltiplas linhas.
         - largura_maxima: int -> A largura máxima permitida antes da quebra de linha.
-        - fonte: QFont -> Fonte usada para medir o tamanho das palavras.
+        - fonte: QFont -> Fonte usada para medir o tamanho das palavras (padrão: Roboto 7 Medium).
 
     Retorna:
         - list[str] -> Lista de linhas ajustadas ao limite de largura.
@@ -139,7 +187,13 @@ def quebrar_texto(texto, largura_maxima, fonte=QFont("Roboto", 7, QFont.Medium))
     if not texto:
         return [""]
 
-    metrics = QFontMetrics(fonte)
+    fonte = fonte or obter_fonte("Roboto", 7, QFont.Medium)
+    chave = ("quebra", texto, largura_maxima, fonte.family(), fonte.pointSize(), fonte.weight())
+    linhas = cache_texto.obter(chave)
+    if linhas is not None:
+        return list(linhas)
+
+    metrics = obter_metricas(fonte)
     palavras = texto.split()
     linhas = []
     linha_atual = ""
@@ -156,6 +210,7 @@ def quebrar_texto(texto, largura_maxima, fonte=QFont("Roboto", 7, QFont.Medium))
     if linha_atual:
         linhas.append(linha_atual)
 
+    cache_texto.guardar(chave, tuple(linhas))
     return linhas
 
 
@@ -178,28 +233,32 @@ def calcular_identificador_aleatorio(dados):
 
 from PyQt5.QtGui import QFontMetrics, QFont
 
-def ajustar_texto_e_fonte(painter, texto, largura_maxima, font_size_inicial=7, min_font_size=5):
+def ajustar_texto(texto, largura_maxima, familia="Roboto", peso=QFont.Medium, font_size_inicial=7, min_font_size=5):
     """
-    Ajusta dinamicamente o tamanho da fonte e quebra linhas conforme necessário para caber no espaço disponível.
-    Agora também ajusta a posição vertical do texto para expandir para cima e para baixo ao mesmo tempo.
+    Calcula o ajuste de `ajustar_texto_e_fonte` sem precisar de um QPainter
+    (usado também pela saída em PDF vetorial).
 
-    :param painter: Objeto QPainter usado para medir o texto.
     :param texto: String do texto a ser ajustado.
     :param largura_maxima: Largura máxima disponível para desenhar o texto.
+    :param familia: Família da fonte.
+    :param peso: Peso da fonte.
     :param font_size_inicial: Tamanho inicial da fonte.
     :param min_font_size: Tamanho mínimo permitido para a fonte.
     :return: Lista de linhas formatadas, tamanho de fonte ajustado e deslocamento vertical.
     """
-    font = painter.font()
-    font.setPointSize(font_size_inicial)
-    painter.setFont(font)
-    metrics = QFontMetrics(font)
+    chave = ("ajuste", texto, largura_maxima, familia, font_size_inicial, peso, min_font_size)
+    resultado = cache_texto.obter(chave)
+    if resultado is not None:
+        linhas, tamanho, deslocamento_vertical = resultado
+        return list(linhas), tamanho, deslocamento_vertical
+
+    tamanho = font_size_inicial
+    metrics = obter_metricas(obter_fonte(familia, tamanho, peso))
 
     # Tenta ajustar a fonte reduzindo até que caiba na largura máxima
-    while metrics.width(texto) > largura_maxima and font.pointSize() > min_font_size:
-        font.setPointSize(font.pointSize() - 1)
-        painter.setFont(font)
-        metrics = QFontMetrics(font)
+    while metrics.width(texto) > largura_maxima and tamanho > min_font_size:
+        tamanho -= 1
+        metrics = obter_metricas(obter_fonte(familia, tamanho, peso))
 
     # Agora faz a quebra de linha conforme o novo tamanho da fonte
     palavras = texto.split()
@@ -220,7 +279,27 @@ def ajustar_texto_e_fonte(painter, texto, largura_maxima, font_size_inicial=7, m
     altura_total_texto = len(linhas) * metrics.height()
     deslocamento_vertical = altura_total_texto // 2  # Centraliza o texto verticalmente
 
-    return linhas, font.pointSize(), deslocamento_vertical
+    cache_texto.guardar(chave, (tuple(linhas), tamanho, deslocamento_vertical))
+    return linhas, tamanho, deslocamento_vertical
+
+
+def ajustar_texto_e_fonte(painter, texto, largura_maxima, font_size_inicial=7, min_font_size=5):
+    """
+    Ajusta dinamicamente o tamanho da fonte e quebra linhas conforme necessário para caber no espaço disponível.
+    Agora também ajusta a posição vertical do texto para expandir para cima e para baixo ao mesmo tempo.
+
+    :param painter: Objeto QPainter usado para medir o texto (recebe a fonte ajustada).
+    :param texto: String do texto a ser ajustado.
+    :param largura_maxima: Largura máxima disponível para desenhar o texto.
+    :param font_size_inicial: Tamanho inicial da fonte.
+    :param min_font_size: Tamanho mínimo permitido para a fonte.
+    :return: Lista de linhas formatadas, tamanho de fonte ajustado e deslocamento vertical.
+    """
+    familia, peso = painter.font().family(), painter.font().weight()
+    linhas, tamanho, deslocamento_vertical = ajustar_texto(texto, largura_maxima, familia, peso,
+                                                           font_size_inicial, min_font_size)
+    painter.setFont(obter_fonte(familia, tamanho, peso))
+    return linhas, tamanho, deslocamento_vertical
 
 
 CONFIG = {
@@ -292,49 +371,112 @@ def obter_caminho_area_de_trabalho():
 
 
 from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
+import io
 import os
 from PIL import Image
+from PyQt5.QtGui import QImage, QPainter
+
+# Maior que A4 em pixels a 300dpi: acima disso a imagem é reduzida antes de ir para o PDF
+LIMITE_IMAGEM_PDF = (3508, 2480)
+
+
+def _qimage_para_pil(imagem):
+    """Copia os pixels de uma QImage para uma imagem PIL RGB (transparência sobre fundo branco)."""
+    if imagem.hasAlphaChannel():
+        fundo = QImage(imagem.size(), QImage.Format_RGB32)
+        fundo.fill(0xFFFFFFFF)
+        painter = QPainter(fundo)
+        painter.drawImage(0, 0, imagem)
+        painter.end()
+        imagem = fundo
+    imagem = imagem.convertToFormat(QImage.Format_RGB888)
+    largura, altura, linha = imagem.width(), imagem.height(), imagem.bytesPerLine()
+    dados = imagem.constBits().asstring(linha * altura)
+    return Image.frombuffer("RGB", (largura, altura), dados, "raw", "RGB", linha, 1)
+
+
+def abrir_imagem_rgb(imagem):
+    """
+    Lê uma imagem em memória ou em disco como imagem PIL RGB, decodificando-a uma única vez.
+    :param imagem: Caminho do arquivo, QImage, imagem PIL, bytes com o arquivo (PNG/JPEG) ou objeto de arquivo.
+    :return: Imagem PIL no modo RGB (transparência sobre fundo branco).
+    """
+    if isinstance(imagem, QImage):
+        return _qimage_para_pil(imagem)
+    if isinstance(imagem, (bytes, bytearray, memoryview)):
+        imagem = io.BytesIO(imagem)
+    if not isinstance(imagem, Image.Image):
+        with Image.open(imagem) as aberta:
+            return abrir_imagem_rgb(aberta.copy() if aberta.mode in ("RGBA", "LA", "P") else aberta.convert("RGB"))
+    if imagem.mode in ("RGBA", "LA", "P"):
+        imagem = imagem.convert("RGBA")
+        fundo = Image.new("RGB", imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel("A"))
+        return fundo
+    return imagem if imagem.mode == "RGB" else imagem.convert("RGB")
+
+
+def preparar_imagem_pdf(imagem):
+    """
+    Decodifica a imagem e calcula a página onde ela fica centralizada, em paisagem ou retrato
+    conforme a imagem; imagens maiores que LIMITE_IMAGEM_PDF são reduzidas (mantendo a proporção).
+    :param imagem: Qualquer formato aceito por `abrir_imagem_rgb`.
+    :return: (imagem PIL RGB, tamanho da página, (x, y, largura, altura) da imagem na página).
+    """
+    img = abrir_imagem_rgb(imagem)
+    img_largura, img_altura = img.size
+
+    # Ajuste da qualidade de renderização (Redimensionamento otimizado)
+    limite = LIMITE_IMAGEM_PDF if img_largura > img_altura else LIMITE_IMAGEM_PDF[::-1]
+    if img_largura > limite[0] or img_altura > limite[1]:
+        reducao = min(limite[0] / img_largura, limite[1] / img_altura)
+        img = img.resize((round(img_largura * reducao), round(img_altura * reducao)), Image.Resampling.LANCZOS)
+
+    # Define a orientação da página (paisagem ou retrato)
+    pagina = landscape(A4) if img_largura > img_altura else A4
+    largura, altura = pagina
+
+    proporcao = min(largura / img_largura, altura / img_altura)
+    nova_largura = img_largura * proporcao
+    nova_altura = img_altura * proporcao
+
+    # Centraliza
+    x = (largura - nova_largura) / 2
+    y = (altura - nova_altura) / 2
+    return img, pagina, (x, y, nova_largura, nova_altura)
+
+
+def desenhar_imagem_pdf(c, imagem):
+    """
+    Desenha a imagem centralizada em uma nova página do canvas (veja `preparar_imagem_pdf`).
+    :param c: Canvas do ReportLab.
+    :param imagem: Qualquer formato aceito por `abrir_imagem_rgb`.
+    """
+    img, pagina, (x, y, largura, altura) = preparar_imagem_pdf(imagem)
+    c.setPageSize(pagina)
+    # A imagem já decodificada (e reduzida) vai direto para o ReportLab, sem arquivo intermediário
+    c.drawImage(ImageReader(img), x, y, width=largura, height=altura, preserveAspectRatio=True)
+    c.showPage()
+
 
-def imagem_para_pdf(imagem_path, pdf_path):
+def imagem_para_pdf(imagem, pdf_path):
     """
-    Converte uma imagem em um arquivo PDF em alta qualidade,
+    Converte uma imagem (ou uma lista delas, uma por página) em um arquivo PDF em alta qualidade,
     com ajuste automático para paisagem ou retrato.
+    :param imagem: Caminho do arquivo, QImage, imagem PIL, bytes com o arquivo da imagem ou lista desses.
+    :param pdf_path: Caminho do PDF (ou objeto de arquivo, para gerar o PDF em memória).
     """
     try:
         if not pdf_path:
             print("Operação cancelada. PDF não foi gerado.")
             return
 
-        with Image.open(imagem_path) as img:
-            img = img.convert('RGB')  # Remove canais alfa para evitar erros
-            img_largura, img_altura = img.size
-
-            # Ajuste da qualidade de renderização (Redimensionamento otimizado)
-            if img_largura > 3508 or img_altura > 2480:  # Maior que A4 em pixels a 300dpi
-                img = img.resize((3508, 2480), Image.Resampling.LANCZOS)
-
-            # Define a orientação da página (paisagem ou retrato)
-            pagina = landscape(A4) if img_largura > img_altura else A4
-            largura, altura = pagina
-
-            proporcao = min(largura / img_largura, altura / img_altura)
-            nova_largura = img_largura * proporcao
-            nova_altura = img_altura * proporcao
-
-            # Centraliza
-            x = (largura - nova_largura) / 2
-            y = (altura - nova_altura) / 2
-
-            c = canvas.Canvas(pdf_path, pagesize=pagina)
-            c.drawImage(
-                imagem_path, x, y,
-                width=nova_largura, height=nova_altura,
-                preserveAspectRatio=True,
-                mask='auto'
-            )
-            c.showPage()
-            c.save()
+        c = canvas.Canvas(pdf_path, pagesize=A4)
+        for pagina in (imagem if isinstance(imagem, (list, tuple)) else [imagem]):
+            desenhar_imagem_pdf(c, pagina)
+        c.save()
 
         print(f"PDF salvo com sucesso em: {pdf_path}")
     except Exception as e:
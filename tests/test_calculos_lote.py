@@ -0,0 +1,176 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# test_calculos_lote.py
+import numpy as np
+import pytest
+
+from src.calculos import (_liquido_centavos, calcular_fgts, calcular_inss, calcular_irrf, calcular_salario_bruto,
+                          configurar_cache)
+from src.calculos_lote import (calcular_decimo_terceiro_lote, calcular_ferias_lote, calcular_folha_lote,
+                               calcular_rescisao_lote, calcular_salario_bruto_lote)
+from src.dinheiro import Dinheiro, VetorDinheiro, dividir_arredondando
+from src.tabelas import registro_tabelas
+
+VIGENCIAS = registro_tabelas.vigencias()
+
+
+def salarios_teste(tabela, quantidade, semente):
+    """Salários aleatórios (em centavos) mais os de cada fronteira de faixa e seus vizinhos."""
+    aleatorio = np.random.default_rng(semente)
+    fronteiras = list(tabela.inss_fronteiras[1:]) + [limite for limite in tabela.irrf_limites[:-1]]
+    bordas = [fronteira + deslocamento for fronteira in fronteiras for deslocamento in (-1, 0, 1)]
+    sorteados = aleatorio.integers(0, 3_000_000, quantidade)
+    return np.concatenate([np.array([0, 1, 99, 100] + bordas, dtype=np.int64), sorteados])
+
+
+@pytest.fixture(autouse=True)
+def sem_cache():
+    # Sem o cache, cada chamada escalar refaz a conta pela tabela
+    configurar_cache(0)
+    yield
+    configurar_cache(4096)
+
+
+@pytest.mark.parametrize("vigencia", VIGENCIAS)
+def test_folha_lote_igual_calculo_escalar(vigencia):
+    tabela = registro_tabelas.obter(vigencia)
+    salarios = salarios_teste(tabela, 20000, 1)
+    aleatorio = np.random.default_rng(2)
+    dependentes = aleatorio.integers(0, 5, salarios.size)
+    pensoes = np.where(aleatorio.random(salarios.size) < 0.2, aleatorio.integers(0, 150_000, salarios.size), 0)
+    vencimentos = aleatorio.integers(0, 50_000, salarios.size)
+    descontos = aleatorio.integers(0, 50_000, salarios.size)
+
+    folha = calcular_folha_lote(VetorDinheiro(salarios), dependentes, VetorDinheiro(pensoes),
+                                VetorDinheiro(vencimentos), VetorDinheiro(descontos), competencia=vigencia)
+    for i in range(salarios.size):
+        salario, pensao = Dinheiro(salarios[i]), Dinheiro(pensoes[i])
+        inss = calcular_inss(salario, vigencia)
+        irrf = calcular_irrf(salario, int(dependentes[i]), pensao, vigencia)
+        fgts = calcular_fgts(salario, vigencia)
+        esperado = {
+            "inss": inss.centavos,
+            "base_irrf": irrf["base_irrf"].centavos,
+            "valor_irrf": irrf["valor_irrf"].centavos,
+            "base_fgts": fgts["base_fgts"].centavos,
+            "valor_fgts": fgts["valor_fgts"].centavos,
+            "liquido": (salario + Dinheiro(vencimentos[i]) - Dinheiro(descontos[i]) - inss - irrf["valor_irrf"]
+                        - pensao).centavos,
+        }
+        obtido = {campo: int(folha[campo].centavos[i]) for campo in esperado}
+        assert obtido == esperado, (vigencia, int(salarios[i]), int(dependentes[i]), int(pensoes[i]))
+
+
+def test_folha_lote_aceita_reais():
+    salarios = [1412.0, 2826.65, 7786.02]
+    folha = calcular_folha_lote(salarios, dependentes=1, pensoes=100.0)
+    for i, salario in enumerate(salarios):
+        assert folha["valor_irrf"].centavos[i] == calcular_irrf(salario, 1, 100.0)["valor_irrf"].centavos
+
+
+@pytest.mark.parametrize("vigencia", VIGENCIAS)
+def test_salario_bruto_lote_igual_escalar_e_atinge_o_liquido(vigencia):
+    tabela = registro_tabelas.obter(vigencia)
+    aleatorio = np.random.default_rng(5)
+    quantidade = 1000
+    alvos = np.concatenate([[0, 1, 100_000], aleatorio.integers(0, 2_500_000, quantidade)])
+    dependentes = aleatorio.integers(0, 4, alvos.size)
+    pensoes = np.where(aleatorio.random(alvos.size) < 0.2, aleatorio.integers(0, 100_000, alvos.size), 0)
+
+    brutos = calcular_salario_bruto_lote(VetorDinheiro(alvos), dependentes, VetorDinheiro(pensoes), vigencia)
+    for i in range(alvos.size):
+        bruto = int(brutos.centavos[i])
+        escalar = calcular_salario_bruto(Dinheiro(alvos[i]), int(dependentes[i]), Dinheiro(pensoes[i]), vigencia)
+        assert bruto == escalar.centavos
+        # O bruto atinge o líquido pedido e o centavo anterior não
+        argumentos = (int(dependentes[i]), int(pensoes[i]))
+        assert _liquido_centavos(tabela, bruto, *argumentos) >= alvos[i]
+        if bruto > 0:
+            assert _liquido_centavos(tabela, bruto - 1, *argumentos) < alvos[i]
+
+
+def test_ferias_lote_igual_calculo_escalar():
+    tabela = registro_tabelas.obter()
+    salarios = salarios_teste(tabela, 1000, 7)
+    aleatorio = np.random.default_rng(8)
+    dias = aleatorio.integers(1, 31, salarios.size)
+    dependentes = aleatorio.integers(0, 4, salarios.size)
+
+    ferias = calcular_ferias_lote(VetorDinheiro(salarios), dias, dependentes)
+    for i in range(salarios.size):
+        valor_ferias = dividir_arredondando(int(salarios[i]) * int(dias[i]), 30)
+        bruto = Dinheiro(valor_ferias + dividir_arredondando(valor_ferias, 3))
+        irrf = calcular_irrf(bruto, int(dependentes[i]))
+        assert int(ferias["bruto"].centavos[i]) == bruto.centavos
+        assert int(ferias["inss"].centavos[i]) == calcular_inss(bruto).centavos
+        assert int(ferias["valor_irrf"].centavos[i]) == irrf["valor_irrf"].centavos
+        assert int(ferias["valor_fgts"].centavos[i]) == calcular_fgts(bruto)["valor_fgts"].centavos
+        assert int(ferias["liquido"].centavos[i]) == (bruto - calcular_inss(bruto) - irrf["valor_irrf"]).centavos
+
+
+def test_decimo_terceiro_lote_igual_calculo_escalar():
+    tabela = registro_tabelas.obter()
+    salarios = salarios_teste(tabela, 1000, 9)
+    aleatorio = np.random.default_rng(10)
+    avos = aleatorio.integers(1, 13, salarios.size)
+    dependentes = aleatorio.integers(0, 4, salarios.size)
+
+    primeira = calcular_decimo_terceiro_lote(VetorDinheiro(salarios), avos, parcela=1)
+    segunda = calcular_decimo_terceiro_lote(VetorDinheiro(salarios), avos, parcela=2, dependentes=dependentes)
+    for i in range(salarios.size):
+        integral = Dinheiro(dividir_arredondando(int(salarios[i]) * int(avos[i]), 12))
+        adiantamento = Dinheiro(dividir_arredondando(integral.centavos, 2))
+        irrf = calcular_irrf(integral, int(dependentes[i]))
+        assert int(primeira["bruto"].centavos[i]) == adiantamento.centavos
+        assert int(primeira["valor_fgts"].centavos[i]) == calcular_fgts(adiantamento)["valor_fgts"].centavos
+        assert int(segunda["inss"].centavos[i]) == calcular_inss(integral).centavos
+        assert int(segunda["valor_irrf"].centavos[i]) == irrf["valor_irrf"].centavos
+        assert int(segunda["valor_fgts"].centavos[i]) == calcular_fgts(integral - adiantamento)["valor_fgts"].centavos
+        assert int(segunda["liquido"].centavos[i]) == (integral - adiantamento - calcular_inss(integral)
+                                                       - irrf["valor_irrf"]).centavos
+
+
+def test_rescisao_lote_igual_calculo_escalar():
+    tabela = registro_tabelas.obter()
+    salarios = salarios_teste(tabela, 500, 11)
+    aleatorio = np.random.default_rng(12)
+    dias = aleatorio.integers(0, 31, salarios.size)
+    avos_decimo = aleatorio.integers(0, 13, salarios.size)
+    avos_ferias = aleatorio.integers(0, 13, salarios.size)
+    vencidas = aleatorio.integers(0, 2, salarios.size)
+    aviso = aleatorio.integers(0, 91, salarios.size)
+    saldos = aleatorio.integers(0, 5_000_000, salarios.size)
+    dependentes = aleatorio.integers(0, 4, salarios.size)
+
+    rescisao = calcular_rescisao_lote(VetorDinheiro(salarios), dias, avos_decimo, avos_ferias, vencidas, aviso,
+                                      VetorDinheiro(saldos), 0.40, dependentes)
+    for i in range(salarios.size):
+        salario = int(salarios[i])
+        saldo = dividir_arredondando(salario * int(dias[i]), 30)
+        valor_aviso = dividir_arredondando(salario * int(aviso[i]), 30)
+        decimo = Dinheiro(dividir_arredondando(salario * int(avos_decimo[i]), 12))
+        ferias = salario * int(vencidas[i]) + dividir_arredondando(salario * int(avos_ferias[i]), 12)
+        terco = dividir_arredondando(ferias, 3)
+
+        inss_saldo = calcular_inss(Dinheiro(saldo)).centavos
+        base_mes = saldo + valor_aviso - inss_saldo - int(dependentes[i]) * tabela.deducao_dependente
+        irrf_decimo = calcular_irrf(decimo, int(dependentes[i]))["valor_irrf"].centavos
+        irrf = max(tabela.calcular_irrf(base_mes), 0) + irrf_decimo
+        inss = inss_saldo + calcular_inss(decimo).centavos
+        fgts = calcular_fgts(Dinheiro(saldo + valor_aviso) + decimo)["valor_fgts"]
+        bruto = saldo + valor_aviso + decimo.centavos + ferias + terco
+
+        assert int(rescisao["inss"].centavos[i]) == inss
+        assert int(rescisao["valor_irrf"].centavos[i]) == irrf
+        assert int(rescisao["valor_fgts"].centavos[i]) == fgts.centavos
+        assert int(rescisao["multa_fgts"].centavos[i]) == (Dinheiro(saldos[i]) + fgts).multiplicar(0.40).centavos
+        assert int(rescisao["liquido"].centavos[i]) == bruto - inss - irrf
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
@@ -0,0 +1,54 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# test_dinheiro.py
+import random
+
+import pytest
+
+from src.dinheiro import Dinheiro
+
+# Valores em reais típicos de folha, incluindo os que não têm representação binária exata
+VALORES_REAIS = [0.0, 0.01, 0.1, 0.3, 1.1, 2.675, 1412.0, 1518.35, 2826.65, 7786.02, 12345.67, -0.1, -1.1]
+
+
+@pytest.mark.parametrize("valor", VALORES_REAIS)
+def test_de_reais_igual_ao_valor_em_reais(valor):
+    dinheiro = Dinheiro.de_reais(valor)
+    assert dinheiro == valor
+    assert valor == dinheiro
+    assert dinheiro <= valor and dinheiro >= valor
+    assert not (dinheiro < valor or dinheiro > valor)
+
+
+def test_igualdade_coerente_com_ordenacao():
+    aleatorio = random.Random(3)
+    for _ in range(20000):
+        dinheiro = Dinheiro(aleatorio.randint(-10 ** 6, 10 ** 6))
+        # Números próximos do valor, inclusive com frações de centavo
+        numero = dinheiro.centavos / 100 + aleatorio.choice([0, 0.001, -0.001, 0.004, 0.005, -0.005, 0.01])
+        igual = dinheiro == numero
+        assert igual == (dinheiro <= numero and dinheiro >= numero), (dinheiro, numero)
+        assert igual != (dinheiro < numero or dinheiro > numero), (dinheiro, numero)
+        assert igual == (not dinheiro != numero)
+
+
+def test_hash_coerente_com_igualdade():
+    assert Dinheiro(100) == 1 and hash(Dinheiro(100)) == hash(1)
+    assert Dinheiro(150) == 1.5 and hash(Dinheiro(150)) == hash(1.5)
+    assert Dinheiro.de_reais(1.1) == Dinheiro(110) and hash(Dinheiro.de_reais(1.1)) == hash(Dinheiro(110))
+    assert len({Dinheiro(100), Dinheiro.de_texto("1,00"), 1}) == 1
+
+
+def test_comparacao_com_tipo_desconhecido():
+    assert Dinheiro(100) != "1,00"
+    with pytest.raises(TypeError):
+        Dinheiro(100) < "1,00"
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator
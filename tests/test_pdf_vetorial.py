@@ -0,0 +1,131 @@
+"""
+============================================================
+  Payslip Generator
+  Developed by: Raphael Soares dos Santos
+  Creation Date: February 10, 2025
+============================================================
+"""
+
+# test_pdf_vetorial.py
+import copy
+import re
+import zlib
+
+import pytest
+from PIL import Image
+
+from src.pdf_vetorial import EscritorPdfHolerites, EscritorPdfImagens
+from src.renderizador import DadosHolerite, carregar_layout, garantir_aplicacao
+
+
+def ler_pdf(caminho):
+    """
+    Lê de volta um PDF gravado pelo EscritorPdf, conferindo a estrutura que um leitor de PDF usa:
+    startxref, tabela de referências (cada posição deve cair no início do objeto), trailer,
+    árvore de páginas e o comprimento/compressão de cada fluxo.
+    :return: (objetos {número: conteúdo}, lista com o dicionário de cada página na ordem)
+    """
+    with open(caminho, "rb") as arquivo:
+        pdf = arquivo.read()
+    assert pdf.startswith(b"%PDF-1.4\n")
+    assert pdf.rstrip().endswith(b"%%EOF")
+
+    inicio_xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\s*$", pdf).group(1))
+    assert pdf[inicio_xref:].startswith(b"xref\n")
+    linhas = pdf[inicio_xref:].split(b"\n")
+    primeiro, total = map(int, linhas[1].split())
+    assert primeiro == 0
+    entradas = linhas[2:2 + total]
+    assert entradas[0] == b"0000000000 65535 f "
+    assert all(len(entrada) + 1 == 20 for entrada in entradas)  # Cada entrada ocupa 20 bytes com o \n
+
+    trailer = pdf[pdf.index(b"trailer", inicio_xref):]
+    assert int(re.search(rb"/Size (\d+)", trailer).group(1)) == total
+    raiz = int(re.search(rb"/Root (\d+) 0 R", trailer).group(1))
+
+    objetos = {}
+    for numero, entrada in enumerate(entradas[1:], start=1):
+        posicao, geracao, tipo = entrada.split()
+        assert (geracao, tipo) == (b"00000", b"n")
+        posicao = int(posicao)
+        cabecalho = b"%d 0 obj\n" % numero
+        assert pdf[posicao:posicao + len(cabecalho)] == cabecalho, f"xref do objeto {numero} aponta errado"
+        fim = pdf.index(b"\nendobj\n", posicao)
+        objetos[numero] = conteudo = pdf[posicao + len(cabecalho):fim]
+        if b"\nstream\n" in conteudo:
+            dicionario, fluxo = conteudo.split(b"\nstream\n", 1)
+            assert fluxo.endswith(b"\nendstream")
+            fluxo = fluxo[:-len(b"\nendstream")]
+            assert int(re.search(rb"/Length (\d+)", dicionario).group(1)) == len(fluxo)
+            zlib.decompress(fluxo)  # Todo fluxo gravado é FlateDecode
+
+    catalogo = objetos[raiz]
+    assert b"/Type /Catalog" in catalogo
+    arvore = objetos[int(re.search(rb"/Pages (\d+) 0 R", catalogo).group(1))]
+    assert b"/Type /Pages" in arvore
+    kids = [int(numero) for numero in re.findall(rb"(\d+) 0 R", arvore[arvore.index(b"/Kids"):arvore.index(b"]")])]
+    assert int(re.search(rb"/Count (\d+)", arvore).group(1)) == len(kids)
+    paginas = [objetos[numero] for numero in kids]
+    for pagina in paginas:
+        assert b"/Type /Page " in pagina
+        referencias = re.findall(rb"(\d+) 0 R", pagina)
+        assert all(int(numero) in objetos for numero in referencias)
+    return objetos, paginas
+
+
+def conteudo_pagina(objetos, pagina):
+    conteudo = objetos[int(re.search(rb"/Contents (\d+) 0 R", pagina).group(1))]
+    return zlib.decompress(conteudo.split(b"\nstream\n", 1)[1][:-len(b"\nendstream")])
+
+
+@pytest.fixture(scope="module")
+def layout(tmp_path_factory):
+    garantir_aplicacao()
+    layout = copy.copy(carregar_layout())
+    # Modelo sintético no tamanho do layout: o teste não depende das imagens de assets/templates
+    layout.caminho_template = str(tmp_path_factory.mktemp("modelo") / "modelo.png")
+    Image.new("RGBA", tuple(layout.tamanho_template), (200, 220, 255, 255)).save(layout.caminho_template)
+    return layout
+
+
+def test_lote_de_holerites_com_continuacao(layout, tmp_path):
+    caminho = str(tmp_path / "lote.pdf")
+    item = {"codigo": "001", "descricao": "ITEM", "desconto": "10,00", "vencimento": ""}
+    quantidades = [0, 3, layout.itens_por_pagina + 5, 1, 2 * layout.itens_por_pagina]
+    with EscritorPdfHolerites(caminho, layout, descarregar_a_cada=2) as escritor:
+        for indice, quantidade in enumerate(quantidades):
+            escritor.adicionar(DadosHolerite(funcionario=f"FUNCIONÁRIO {indice}", codigo=str(indice),
+                                             salario_base="2500,00", itens=[item] * quantidade))
+
+    objetos, paginas = ler_pdf(caminho)
+    assert escritor.holerites == len(quantidades)
+    assert len(paginas) == escritor.paginas == 1 + 1 + 2 + 1 + 3
+    # Modelo e fontes são gravados uma vez e compartilhados por todas as páginas
+    assert len({re.search(rb"/Modelo (\d+) 0 R", pagina).group(1) for pagina in paginas}) == 1
+    assert sum(b"/Subtype /Image" in objeto for objeto in objetos.values()) == 1
+    textos = [conteudo_pagina(objetos, pagina) for pagina in paginas]
+    assert b"(FUNCION\xc1RIO 0) Tj" in textos[0]
+    assert b"(TRANSPORTE) Tj" in textos[3]
+
+
+def test_lote_de_imagens(tmp_path):
+    caminho = str(tmp_path / "imagens.pdf")
+    with EscritorPdfImagens(caminho) as escritor:
+        for tamanho in ((300, 200), (200, 300), (300, 200)):
+            escritor.adicionar_imagem(Image.new("RGB", tamanho, (255, 0, 0)))
+
+    objetos, paginas = ler_pdf(caminho)
+    assert len(paginas) == escritor.paginas == 3
+    caixas = [tuple(map(float, re.search(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", pagina).groups()))
+              for pagina in paginas]
+    assert caixas[0][0] > caixas[0][1] and caixas[1][0] < caixas[1][1]  # Paisagem e retrato
+
+
+def test_pdf_vazio(tmp_path):
+    caminho = str(tmp_path / "vazio.pdf")
+    EscritorPdfImagens(caminho).fechar()
+    _, paginas = ler_pdf(caminho)
+    assert paginas == []
+
+
+# Developed by Raphael Soares dos Santos - Payslip Generator